@@ -8,7 +8,6 @@ Run from project root:
 
 import os
 import sys
-from datetime import date, timedelta
 
 import streamlit as st
 import plotly.graph_objects as go
@@ -17,19 +16,148 @@ import plotly.graph_objects as go
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
 
 from opendev_api import OpenDevData
+from opendev_api.warmup import MADS_CHART_DAYS, landing_calls, warm_up
 
 
 # --- Config ---
 DATA_FOLDER = os.environ.get("OPENDEV_DATA_FOLDER", "./data")
 DB_FILENAME = os.environ.get("OPENDEV_DB_FILENAME", "odd.duckdb")
+# Directory of versioned <version>.duckdb snapshots; when set, new snapshots are picked up without a restart.
+SNAPSHOT_DIR = os.environ.get("OPENDEV_SNAPSHOT_DIR")
+SNAPSHOT_POLL_SECONDS = float(os.environ.get("OPENDEV_SNAPSHOT_POLL_SECONDS", "60"))
+# Ecosystems (most developers first) whose pages are prefetched at startup and before a snapshot swap.
+WARM_TOP_N = int(os.environ.get("OPENDEV_WARM_TOP_N", "20"))
+
+
+VIEWS = ["Overview", "Repos", "Developers", "Geography"]
+# (developers_in_ecosystem flag, refresh function of the derived table behind it)
+OPTIONAL_DEVELOPER_COLUMNS = (
+    ("include_tenure", "refresh_latest_tenures"),
+    ("include_percentile", "refresh_points_percentiles"),
+)
 
 
 @st.cache_resource
 def get_client():
-    path = os.path.join(DATA_FOLDER, DB_FILENAME)
-    if not os.path.isfile(path):
-        return None
-    return OpenDevData(DATA_FOLDER, DB_FILENAME)
+    if SNAPSHOT_DIR:
+        try:
+            client = OpenDevData.from_snapshots(SNAPSHOT_DIR)
+        except FileNotFoundError:
+            return None
+        client.on_data_version_change(_on_data_version_change)
+        client.start_snapshot_watcher(
+            interval=SNAPSHOT_POLL_SECONDS,
+            warm=_warm_next_snapshot if WARM_TOP_N else None,
+        )
+    else:
+        path = os.path.join(DATA_FOLDER, DB_FILENAME)
+        if not os.path.isfile(path):
+            return None
+        client = OpenDevData(DATA_FOLDER, DB_FILENAME)
+    if WARM_TOP_N:
+        prefetched_results()[client.data_version] = _prefetch(client.conn)
+    return client
+
+
+# Key under which the snapshot watcher's warm-up waits until the swap reveals its version.
+_NEXT_VERSION = None
+_MISSING = object()
+
+
+@st.cache_resource
+def prefetched_results() -> dict:
+    """data version -> {call key: result} from warm_up, consumed by _cached_call."""
+    return {}
+
+
+def _call_key(method: str, args: tuple, kwargs: dict) -> tuple:
+    return (method, args, tuple(kwargs.items()))
+
+
+def _prefetch(conn) -> dict:
+    """Run the landing calls of the WARM_TOP_N ecosystems in parallel and key their results like _cached_call."""
+    report = warm_up(conn, top_n=WARM_TOP_N, keep_results=True)
+    return {_call_key(method, args, kwargs): result for method, args, kwargs, result in report["results"]}
+
+
+def _warm_next_snapshot(conn) -> None:
+    """Snapshot watcher hook: prefetch on the new snapshot before it is swapped in."""
+    prefetched_results()[_NEXT_VERSION] = _prefetch(conn)
+
+
+def _on_data_version_change(old: str | None, new: str) -> None:
+    # Results for the old version can never be requested again; free them right away.
+    _cached_call.clear()
+    results = prefetched_results()
+    results.pop(old, None)
+    if _NEXT_VERSION in results:
+        results[new] = results.pop(_NEXT_VERSION)
+
+
+def data_version() -> str:
+    """Version of the data being served; part of every cache key so a snapshot swap invalidates results."""
+    return get_client().data_version
+
+
+@st.cache_data(show_spinner=False, max_entries=2000)
+def _cached_call(method: str, version: str, args: tuple, kwargs: dict):
+    # A result warm_up already fetched for this version is used once, to fill the cache entry.
+    prefetched = prefetched_results().get(version, {}).pop(_call_key(method, args, kwargs), _MISSING)
+    if prefetched is not _MISSING:
+        return prefetched
+    return getattr(get_client(), method)(*args, **kwargs)
+
+
+def query(method: str, *args, **kwargs):
+    """Call an OpenDevData method, cached on (method, arguments, data version)."""
+    return _cached_call(method, data_version(), args, kwargs)
+
+
+def landing_query(method: str, ecosystem_id: int, **overrides):
+    """query() with the warm-up's arguments for method (warmup.LANDING_CALLS), overridden by the page's widgets.
+
+    Overrides replace values in place, so a page at its default settings asks
+    for exactly the cache entry warm_page_cache filled.
+    """
+    calls = landing_calls(ecosystem_id, query("latest_mads_day"))
+    _, args, kwargs = next(c for c in calls if c[0] == method)
+    return query(method, *args, **{**kwargs, **overrides})
+
+
+@st.cache_resource(show_spinner="Prefetching popular ecosystems...")
+def warm_page_cache(version: str) -> None:
+    """Fill _cached_call with the landing calls of the WARM_TOP_N ecosystems, once per data version.
+
+    The results come from the parallel warm_up run by get_client or the
+    snapshot watcher; only calls it could not answer are queried here.
+    """
+    last_day = _cached_call("latest_mads_day", version, (), {})
+    for ecosystem_id in get_client().top_ecosystems_by_devs(WARM_TOP_N):
+        for method, args, kwargs in landing_calls(ecosystem_id, last_day):
+            try:
+                # Same fallback as the page, so the entry filled is the one the page asks for.
+                without_missing_columns(lambda kw: _cached_call(method, version, args, kw), kwargs)
+            except RuntimeError:
+                # A derived table the page cannot do without is not built; it shows the error when viewed.
+                pass
+
+
+def without_missing_columns(call, kwargs: dict):
+    """call(kwargs), retried with the OPTIONAL_DEVELOPER_COLUMNS flags whose derived table is not built set to False.
+
+    Only the column backed by the missing table is dropped; the other is kept.
+    """
+    kwargs = dict(kwargs)
+    while True:
+        try:
+            return call(kwargs)
+        except RuntimeError as e:
+            flag = next(
+                (f for f, builder in OPTIONAL_DEVELOPER_COLUMNS if builder in str(e) and kwargs.get(f, True)), None
+            )
+            if flag is None:
+                raise
+            kwargs[flag] = False
 
 
 def main():
@@ -39,20 +167,23 @@ def main():
 
     client = get_client()
     if client is None:
+        location = SNAPSHOT_DIR or os.path.join(DATA_FOLDER, DB_FILENAME)
         st.error(
-            f"Database not found at `{os.path.join(DATA_FOLDER, DB_FILENAME)}`. "
-            "Set OPENDEV_DATA_FOLDER and OPENDEV_DB_FILENAME if needed."
+            f"Database not found at `{location}`. "
+            "Set OPENDEV_SNAPSHOT_DIR, or OPENDEV_DATA_FOLDER and OPENDEV_DB_FILENAME, if needed."
         )
         return
+    if WARM_TOP_N:
+        warm_page_cache(data_version())
 
     # Sidebar: ecosystem selection
     with st.sidebar:
         st.header("Ecosystem")
         search = st.text_input("Search ecosystems", placeholder="e.g. Bitcoin, Ethereum")
         if search:
-            results = client.search_ecosystems(search.strip(), limit=20)
+            results = query("search_ecosystems", search.strip(), limit=20)
         else:
-            results = client.list_ecosystems(limit=50, include_repo_count=True)
+            results = query("list_ecosystems", limit=50, include_repo_count=True)
 
         if not results:
             st.info("No ecosystems found.")
@@ -70,21 +201,21 @@ def main():
         st.info("Select an ecosystem from the sidebar to view overview, repos, and developers.")
         return
 
-    # Main: tabs
-    tab_overview, tab_repos, tab_developers = st.tabs(["Overview", "Repos", "Developers"])
-
-    with tab_overview:
-        render_overview(client, ecosystem_id)
+    # Main: only the selected view is computed (st.tabs would run all three every rerun)
+    view = st.segmented_control("View", VIEWS, default=VIEWS[0], key="view") or VIEWS[0]
 
-    with tab_repos:
-        render_repos(client, ecosystem_id)
-
-    with tab_developers:
-        render_developers(client, ecosystem_id)
+    if view == "Overview":
+        render_overview(ecosystem_id)
+    elif view == "Repos":
+        render_repos(ecosystem_id)
+    elif view == "Developers":
+        render_developers(ecosystem_id)
+    else:
+        render_geography(ecosystem_id)
 
 
-def render_overview(client: OpenDevData, ecosystem_id: int):
-    eco = client.get_ecosystem(ecosystem_id, include_latest_mads=True)
+def render_overview(ecosystem_id: int):
+    eco = landing_query("get_ecosystem", ecosystem_id)
     if not eco:
         st.warning("Ecosystem not found.")
         return
@@ -114,7 +245,7 @@ def render_overview(client: OpenDevData, ecosystem_id: int):
         c4.metric("Full-time devs", m.get("full_time_devs"))
 
     # Hierarchy
-    hier = client.ecosystem_hierarchy(ecosystem_id)
+    hier = landing_query("ecosystem_hierarchy", ecosystem_id)
     if hier.get("parents") or hier.get("children"):
         st.subheader("Hierarchy")
         pcol, ccol = st.columns(2)
@@ -134,12 +265,8 @@ def render_overview(client: OpenDevData, ecosystem_id: int):
                 st.write("—")
 
     # MADs time series chart
-    st.subheader("Activity over time (last 90 days)")
-    end = date.today()
-    start = end - timedelta(days=90)
-    mads = client.ecosystem_mads_time_series(
-        ecosystem_id, start_date=start, end_date=end, limit=90
-    )
+    st.subheader(f"Activity over time (last {MADS_CHART_DAYS} days)")
+    mads = landing_query("ecosystem_mads_time_series", ecosystem_id)
     if mads:
         mads_sorted = sorted(mads, key=lambda x: x["day"])
         fig = go.Figure()
@@ -173,12 +300,17 @@ def render_overview(client: OpenDevData, ecosystem_id: int):
         st.info("No time series data for this range.")
 
 
-def render_repos(client: OpenDevData, ecosystem_id: int):
+@st.fragment
+def render_repos(ecosystem_id: int):
     st.subheader("Repos in ecosystem")
     recursive = st.checkbox("Include recursive (child ecosystem) repos", value=True)
-    repos = client.repos_in_ecosystem(
-        ecosystem_id, recursive=recursive, sort_by="num_stars", limit=100
-    )
+    sort_label = st.radio("Sort by", ["Stars", "Activity (28 days)"], horizontal=True)
+    sort_by = "num_stars" if sort_label == "Stars" else "activity"
+    try:
+        repos = landing_query("repos_in_ecosystem", ecosystem_id, recursive=recursive, sort_by=sort_by)
+    except RuntimeError as e:
+        st.info(str(e))
+        return
     if not repos:
         st.info("No repos found.")
         return
@@ -189,13 +321,16 @@ def render_repos(client: OpenDevData, ecosystem_id: int):
             "Link": r.get("link"),
             "Stars": r.get("num_stars"),
             "Forks": r.get("num_forks"),
+            **({"Commits (28d)": r.get("commits_28d"), "Active devs (28d)": r.get("active_devs_28d")}
+               if sort_by == "activity" else {}),
         }
         for r in repos
     ]
     st.dataframe(rows, use_container_width=True, hide_index=True)
 
 
-def render_developers(client: OpenDevData, ecosystem_id: int):
+@st.fragment
+def render_developers(ecosystem_id: int):
     st.subheader("Developers in ecosystem")
     rank_filter = st.selectbox(
         "Contribution rank",
@@ -203,11 +338,9 @@ def render_developers(client: OpenDevData, ecosystem_id: int):
         index=0,
     )
     rank = None if rank_filter == "All" else rank_filter
-    devs = client.developers_in_ecosystem(
-        ecosystem_id,
-        contribution_rank=rank,
-        include_user_info=True,
-        limit=200,
+    devs = without_missing_columns(
+        lambda overrides: landing_query("developers_in_ecosystem", ecosystem_id, **overrides),
+        {"contribution_rank": rank},
     )
     if not devs:
         st.info("No developers found.")
@@ -220,36 +353,86 @@ def render_developers(client: OpenDevData, ecosystem_id: int):
             "Name": r.get("name"),
             "Rank": r.get("contribution_rank"),
             "Points": r.get("points"),
+            "Percentile": None if r.get("points_percentile") is None else round(r["points_percentile"], 1),
+            "Tenure (days)": r.get("tenure_days"),
         }
         for r in devs
     ]
     st.dataframe(rows, use_container_width=True, hide_index=True)
 
-    # Developer detail: select one
+    render_developer_profile(ecosystem_id, devs)
+
+
+@st.fragment
+def render_developer_profile(ecosystem_id: int, devs: list[dict]):
+    # Developer detail: select one (reruns only this panel, not the developer list)
     st.subheader("Developer profile")
     dev_options = [f"{r.get('login') or r.get('canonical_developer_id')} (id: {r.get('canonical_developer_id')})" for r in devs]
     dev_ids = [r["canonical_developer_id"] for r in devs]
     selected_idx = st.selectbox("Select developer to view profile", range(len(dev_options)), format_func=lambda i: dev_options[i])
     if selected_idx is not None:
         dev_id = dev_ids[selected_idx]
-        profile = client.get_developer_profile(dev_id, include_location=True)
+        # Profile, locations, activity, tenure and rank in one round trip
+        profile = query("developer_profile_bundle", dev_id, ecosystem_id, activity_limit=15)
         if profile:
-            st.json({k: v for k, v in profile.items() if k != "locations" and v is not None})
+            sections = ("locations", "activity", "latest_tenure", "current_rank")
+            st.json({k: v for k, v in profile.items() if k not in sections and v is not None})
             if profile.get("locations"):
                 st.write("**Locations**")
                 st.json(profile["locations"])
-            # Activity in this ecosystem
-            activity = client.developer_activity_in_ecosystem(
-                ecosystem_id, dev_id, limit=30
-            )
-            if activity:
+            rank = profile.get("current_rank")
+            tenure = profile.get("latest_tenure")
+            activity = profile.get("activity") or {}
+            if rank or tenure or activity.get("days_active"):
+                c1, c2, c3, c4 = st.columns(4)
+                c1.metric("Rank", (rank or {}).get("contribution_rank") or "—")
+                c2.metric("Points", (rank or {}).get("points"))
+                c3.metric("Tenure (days)", (tenure or {}).get("tenure_days"))
+                c4.metric("Commits (all time)", activity.get("num_commits"))
+            if activity.get("recent"):
                 st.write("**Recent activity (commits per day)**")
-                act_sorted = sorted(activity, key=lambda x: x["day"], reverse=True)
-                st.dataframe(act_sorted[:15], use_container_width=True, hide_index=True)
-            tenure = client.developer_tenure_in_ecosystem(ecosystem_id, dev_id)
-            if tenure:
-                st.write("**Tenure**")
-                st.dataframe(tenure[:10], use_container_width=True, hide_index=True)
+                st.dataframe(activity["recent"], use_container_width=True, hide_index=True)
+
+
+@st.fragment
+def render_geography(ecosystem_id: int):
+    st.subheader("Where current developers are")
+    try:
+        grid = query("ecosystem_developer_grid", ecosystem_id)
+        countries = query("ecosystem_developer_countries", ecosystem_id, limit=50)
+    except RuntimeError as e:
+        st.info(str(e))
+        return
+    if not countries:
+        st.info("No current developers found.")
+        return
+    if grid:
+        fig = go.Figure(
+            go.Scattergeo(
+                lat=[r["lat"] for r in grid],
+                lon=[r["lng"] for r in grid],
+                text=[f"{r['developers']} developers" for r in grid],
+                marker=dict(
+                    size=[r["developers"] for r in grid],
+                    sizemode="area",
+                    sizeref=max(r["developers"] for r in grid) / 900,
+                    sizemin=2,
+                ),
+            )
+        )
+        fig.update_layout(height=450, margin=dict(l=0, r=0, t=0, b=0))
+        st.plotly_chart(fig, use_container_width=True)
+    rows = [
+        {
+            "Country": r.get("country") or "Unknown",
+            "Developers": r.get("developers"),
+            "Full-time": r.get("full_time_devs"),
+            "Part-time": r.get("part_time_devs"),
+            "One-time": r.get("one_time_devs"),
+        }
+        for r in countries
+    ]
+    st.dataframe(rows, use_container_width=True, hide_index=True)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,417 @@
+"""
+Benchmark every read API function in opendev_api.ecosystems and opendev_api.developers.
+
+Builds (or reuses) a synthetic database, times each function ``--repeat`` times
+and records p50/p95 wall time, rows returned and rows scanned (from DuckDB's
+profiler). Results are written as JSON; pass ``--compare`` with an earlier
+result file to flag regressions between commits. Cases listed in
+``NO_SLOWER_THAN`` must not be slower than their baseline case (beyond a
+noise tolerance); the script exits non-zero when one is.
+
+Run from project root:
+  python benchmarks/bench_api.py --developers 50000 --output bench.json
+  python benchmarks/bench_api.py --db /tmp/synthetic.duckdb --compare bench.json
+"""
+
+import argparse
+import inspect
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import timedelta
+
+import duckdb
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from opendev_api import (
+    churn,
+    cohorts,
+    developer_index,
+    developers,
+    ecosystem_stats,
+    ecosystems,
+    geo,
+    organizations,
+    points_percentiles,
+    rank_diff,
+    rank_histograms,
+    repo_activity,
+    synthetic,
+    tenures,
+    trending,
+)
+
+
+class _ProfiledConnection:
+    """Connection proxy that sums DuckDB's rows-scanned counter over every query."""
+
+    def __init__(self, conn):
+        self._conn = conn
+        self._pending = False
+        self.rows_scanned = 0
+
+    def _harvest(self) -> None:
+        if self._pending:
+            info = json.loads(self._conn.get_profiling_information(format="json"))
+            self.rows_scanned += int(info.get("cumulative_rows_scanned", 0))
+            self._pending = False
+
+    def execute(self, *args, **kwargs):
+        self._harvest()
+        result = self._conn.execute(*args, **kwargs)
+        self._pending = True
+        return result
+
+    def finish(self) -> int:
+        self._harvest()
+        return self.rows_scanned
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+
+def _pick_targets(conn) -> dict:
+    """Choose large/median/small ecosystems, a busy developer in the largest one and the organization with most repos."""
+    sizes = conn.execute("""
+        SELECT ecosystem_id, count(*) AS n
+        FROM eco_developer_contribution_ranks
+        WHERE day = (SELECT max(day) FROM eco_developer_contribution_ranks)
+        GROUP BY 1 ORDER BY n DESC, ecosystem_id
+    """).fetchall()
+    if not sizes:
+        raise SystemExit("Database has no contribution ranks to benchmark against")
+    large = sizes[0][0]
+    day = conn.execute("SELECT max(day) FROM eco_developer_contribution_ranks").fetchone()[0]
+    dev = conn.execute("""
+        SELECT canonical_developer_id FROM eco_developer_contribution_ranks
+        WHERE ecosystem_id = ? AND day = ? ORDER BY points DESC, canonical_developer_id LIMIT 1
+    """, [large, day]).fetchone()[0]
+    login = conn.execute("SELECT login FROM user_info WHERE canonical_developer_id = ?", [dev]).fetchone()[0]
+    org = conn.execute("""
+        SELECT organization_id FROM repos WHERE organization_id IS NOT NULL
+        GROUP BY 1 ORDER BY count(*) DESC, organization_id LIMIT 1
+    """).fetchone()
+    return {
+        "large": large,
+        "median": sizes[len(sizes) // 2][0],
+        "small": sizes[-1][0],
+        "day": day,
+        "dev": dev,
+        "login": login or "",
+        "org": org[0] if org else None,
+    }
+
+
+# "module.function[variant]" -> callable(conn, targets); cases run against the largest ecosystem
+# unless the name says otherwise.
+CASES = {
+    "ecosystems.list_ecosystems": lambda c, t: ecosystems.list_ecosystems(c, limit=50),
+    "ecosystems.list_ecosystems[repo_count]": lambda c, t: ecosystems.list_ecosystems(
+        c, include_repo_count=True, limit=50
+    ),
+    "ecosystems.list_ecosystems[sort=all_devs]": lambda c, t: ecosystems.list_ecosystems(
+        c, include_stats=True, sort_by="all_devs", limit=50
+    ),
+    "ecosystems.get_ecosystem": lambda c, t: ecosystems.get_ecosystem(c, t["large"], include_latest_mads=True),
+    "ecosystems.ecosystem_hierarchy": lambda c, t: ecosystems.ecosystem_hierarchy(c, t["large"]),
+    "ecosystems.repos_in_ecosystem": lambda c, t: ecosystems.repos_in_ecosystem(c, t["large"], limit=100),
+    "ecosystems.ecosystem_mads_time_series": lambda c, t: ecosystems.ecosystem_mads_time_series(
+        c, t["large"], start_date=t["day"] - timedelta(days=90), end_date=t["day"], limit=90
+    ),
+    "ecosystems.ecosystem_rank_distribution_time_series": lambda c, t: (
+        ecosystems.ecosystem_rank_distribution_time_series(
+            c, t["large"], start_date=t["day"] - timedelta(days=90), end_date=t["day"], limit=90
+        )
+    ),
+    "ecosystems.search_ecosystems": lambda c, t: ecosystems.search_ecosystems(c, "system 1", limit=20),
+    "ecosystems.repos_in_ecosystem[activity]": lambda c, t: ecosystems.repos_in_ecosystem(
+        c, t["large"], sort_by="activity", limit=100
+    ),
+    "ecosystems.top_repos_in_ecosystem": lambda c, t: ecosystems.top_repos_in_ecosystem(c, t["large"]),
+    "ecosystems.top_repos_in_ecosystem[activity]": lambda c, t: ecosystems.top_repos_in_ecosystem(
+        c, t["large"], sort_by="activity"
+    ),
+    "developers.developers_in_ecosystem": lambda c, t: developers.developers_in_ecosystem(
+        c, t["large"], limit=200
+    ),
+    "developers.developers_in_ecosystem[small]": lambda c, t: developers.developers_in_ecosystem(
+        c, t["small"], limit=200
+    ),
+    "developers.developers_in_ecosystem[day,rank]": lambda c, t: developers.developers_in_ecosystem(
+        c, t["large"], day=t["day"], contribution_rank="full_time", limit=200
+    ),
+    # Runs on its own cursor, so rows_scanned is not attributed to this case.
+    "developers.iter_developers_in_ecosystem": lambda c, t: [
+        r for batch in developers.iter_developers_in_ecosystem(c, t["large"]) for r in batch
+    ],
+    "developers.get_developer_profile": lambda c, t: developers.get_developer_profile(
+        c, t["dev"], include_location=True
+    ),
+    "developers.developer_profile_bundle": lambda c, t: developers.developer_profile_bundle(
+        c, t["dev"], t["large"]
+    ),
+    # The calls the dashboard's profile panel made before the bundle (see NO_SLOWER_THAN).
+    "developers.developer_profile_bundle[separate]": lambda c, t: (
+        developers.get_developer_profile(c, t["dev"], include_location=True),
+        developers.developer_activity_in_ecosystem(c, t["large"], t["dev"], limit=30),
+        developers.developer_tenure_in_ecosystem(c, t["large"], t["dev"]),
+    ),
+    "developers.developer_activity_in_ecosystem": lambda c, t: developers.developer_activity_in_ecosystem(
+        c, t["large"], t["dev"], limit=30
+    ),
+    "developers.developer_tenure_in_ecosystem": lambda c, t: developers.developer_tenure_in_ecosystem(
+        c, t["large"], t["dev"]
+    ),
+    "developers.developers_in_ecosystem[tenure]": lambda c, t: developers.developers_in_ecosystem(
+        c, t["large"], include_tenure=True, limit=200
+    ),
+    "developers.developers_in_ecosystem[percentile]": lambda c, t: developers.developers_in_ecosystem(
+        c, t["large"], include_percentile=True, limit=200
+    ),
+    "developers.get_developer_profile[percentile]": lambda c, t: developers.get_developer_profile(
+        c, t["dev"], ecosystem_id=t["large"]
+    ),
+    "points_percentiles.points_percentile_curve": lambda c, t: points_percentiles.points_percentile_curve(
+        c, t["large"]
+    ),
+    "rank_diff.contribution_rank_diff": lambda c, t: rank_diff.contribution_rank_diff(
+        c, t["large"], t["day"] - timedelta(days=7), t["day"]
+    ),
+    "rank_diff.iter_contribution_rank_diff": lambda c, t: [
+        r for batch in rank_diff.iter_contribution_rank_diff(c, t["large"], t["day"] - timedelta(days=7), t["day"])
+        for r in batch
+    ],
+    "tenures.latest_tenures_in_ecosystem": lambda c, t: tenures.latest_tenures_in_ecosystem(c, t["large"]),
+    "developers.get_developer_profiles": lambda c, t: developers.get_developer_profiles(
+        c, ids=list(range(1, 10_001)), include_location=True
+    ),
+    "developers.search_developers_in_ecosystem": lambda c, t: developers.search_developers_in_ecosystem(
+        c, t["large"], t["login"], day=t["day"]
+    ),
+    "developer_index.developer_ecosystems": lambda c, t: developer_index.developer_ecosystems(c, t["dev"]),
+    "churn.ecosystem_churn_time_series": lambda c, t: churn.ecosystem_churn_time_series(c, t["large"]),
+    "churn.ecosystem_repo_churn": lambda c, t: churn.ecosystem_repo_churn(c, t["large"]),
+    "churn.developer_churn_time_series": lambda c, t: churn.developer_churn_time_series(c, t["dev"]),
+    "churn.developer_churn_time_series[ecosystem]": lambda c, t: churn.developer_churn_time_series(
+        c, t["dev"], ecosystem_id=t["large"]
+    ),
+    "cohorts.cohort_retention": lambda c, t: cohorts.cohort_retention(c, t["large"]),
+    "organizations.ecosystem_organizations": lambda c, t: organizations.ecosystem_organizations(c, t["large"]),
+    "organizations.organization_ecosystems": lambda c, t: organizations.organization_ecosystems(c, t["org"]),
+    "organizations.get_organization": lambda c, t: organizations.get_organization(c, t["org"]),
+    "organizations.top_organizations": lambda c, t: organizations.top_organizations(c),
+    "trending.trending_ecosystems": lambda c, t: trending.trending_ecosystems(c),
+    "trending.trending_ecosystems[growth_up]": lambda c, t: trending.trending_ecosystems(
+        c, metric="num_commits", order_by="growth", direction="up"
+    ),
+    "geo.ecosystem_developer_countries": lambda c, t: geo.ecosystem_developer_countries(c, t["large"]),
+    "geo.ecosystem_developer_regions": lambda c, t: geo.ecosystem_developer_regions(c, t["large"]),
+    "geo.ecosystem_developer_grid": lambda c, t: geo.ecosystem_developer_grid(c, t["large"]),
+}
+
+# Derived tables the cases above read; built once after the data is generated or loaded.
+REFRESHERS = (
+    developer_index.refresh_developer_ecosystems_index,
+    tenures.refresh_latest_tenures,
+    points_percentiles.refresh_points_percentiles,
+    rank_diff.refresh_contribution_rank_days,
+    repo_activity.refresh_repo_activity_stats,
+    organizations.refresh_organization_stats,
+    ecosystem_stats.refresh_ecosystem_stats,
+    rank_histograms.refresh_rank_histograms,
+    geo.refresh_ecosystem_geo,
+    churn.refresh_commit_churn,
+    trending.refresh_trending_ecosystems,
+)
+
+
+# (case, baseline, tolerance): case's p50 must not exceed baseline's p50 times tolerance,
+# which absorbs run-to-run noise when the two tie; checked when both ran.
+NO_SLOWER_THAN = (
+    ("developers.developer_profile_bundle", "developers.developer_profile_bundle[separate]", 1.1),
+)
+
+
+def check_no_slower(results: dict) -> list[str]:
+    """Return a line for every NO_SLOWER_THAN pair whose case is slower than its baseline allows."""
+    lines = []
+    for case, baseline, tolerance in NO_SLOWER_THAN:
+        if (
+            case in results
+            and baseline in results
+            and results[case]["p50_ms"] > results[baseline]["p50_ms"] * tolerance
+        ):
+            lines.append(
+                f"SLOWER  {case} p50 {results[case]['p50_ms']:.3f} ms > "
+                f"{baseline} p50 {results[baseline]['p50_ms']:.3f} ms"
+            )
+    return lines
+
+
+def _public_functions(module) -> set[str]:
+    return {
+        f"{module.__name__.rsplit('.', 1)[-1]}.{name}"
+        for name, fn in inspect.getmembers(module, inspect.isfunction)
+        if not name.startswith("_") and fn.__module__ == module.__name__
+    }
+
+
+def _uncovered() -> set[str]:
+    covered = {name.split("[", 1)[0] for name in CASES}
+    return (_public_functions(ecosystems) | _public_functions(developers)) - covered
+
+
+def _row_count(result) -> int:
+    if isinstance(result, list):
+        return len(result)
+    return 0 if result is None else 1
+
+
+def run_case(conn, fn, targets: dict, repeat: int, warmup: int) -> dict:
+    for _ in range(warmup):
+        fn(conn, targets)
+    timings = []
+    rows = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(conn, targets)
+        timings.append((time.perf_counter() - start) * 1000)
+        rows = _row_count(result)
+
+    conn.execute("PRAGMA enable_profiling = 'no_output'")
+    try:
+        profiled = _ProfiledConnection(conn)
+        fn(profiled, targets)
+        rows_scanned = profiled.finish()
+    finally:
+        conn.execute("PRAGMA disable_profiling")
+
+    quantiles = statistics.quantiles(timings, n=20, method="inclusive") if len(timings) > 1 else timings * 19
+    return {
+        "p50_ms": round(statistics.median(timings), 3),
+        "p95_ms": round(quantiles[18], 3),
+        "mean_ms": round(statistics.fmean(timings), 3),
+        "rows_returned": rows,
+        "rows_scanned": rows_scanned,
+        "repeat": repeat,
+    }
+
+
+def _git_commit() -> str | None:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.stdout.strip() or None
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> list[str]:
+    """Return human-readable lines for cases whose p50 grew by more than threshold (ratio)."""
+    lines = []
+    for name, res in current["results"].items():
+        base = baseline.get("results", {}).get(name)
+        if not base or not base["p50_ms"]:
+            continue
+        ratio = res["p50_ms"] / base["p50_ms"]
+        marker = "REGRESSION" if ratio > threshold else "ok"
+        lines.append(
+            f"{marker:>10}  {name:<50} p50 {base['p50_ms']:>9.3f} -> {res['p50_ms']:>9.3f} ms  (x{ratio:.2f})"
+        )
+    return lines
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--db", help="DuckDB file to use; generated there if it does not exist (default: in-memory)")
+    parser.add_argument("--ecosystems", type=int, default=200)
+    parser.add_argument("--developers", type=int, default=20_000)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--skew", type=float, default=1.1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--warmup", type=int, default=2)
+    parser.add_argument("--only", help="Run only cases whose name contains this substring")
+    parser.add_argument("--output", help="Write results JSON here")
+    parser.add_argument("--compare", help="Baseline results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=1.25, help="p50 ratio that counts as a regression")
+    args = parser.parse_args(argv)
+
+    generate = args.db is None or not os.path.exists(args.db)
+    conn = duckdb.connect(args.db or ":memory:")
+    scale = None
+    if generate:
+        start = time.perf_counter()
+        counts = synthetic.generate_synthetic_data(
+            conn,
+            num_ecosystems=args.ecosystems,
+            num_developers=args.developers,
+            num_days=args.days,
+            skew=args.skew,
+            seed=args.seed,
+        )
+        scale = {
+            "ecosystems": args.ecosystems, "developers": args.developers, "days": args.days,
+            "skew": args.skew, "seed": args.seed, "row_counts": counts,
+        }
+        print(f"Generated synthetic data in {time.perf_counter() - start:.1f}s: {counts}", file=sys.stderr)
+
+    missing = _uncovered()
+    if missing:
+        print(f"warning: no benchmark case for {', '.join(sorted(missing))}", file=sys.stderr)
+
+    for refresh in REFRESHERS:
+        start = time.perf_counter()
+        refresh(conn)
+        print(f"{refresh.__name__} took {time.perf_counter() - start:.1f}s", file=sys.stderr)
+
+    targets = _pick_targets(conn)
+    results = {}
+    for name, fn in CASES.items():
+        if args.only and args.only not in name:
+            continue
+        results[name] = run_case(conn, fn, targets, args.repeat, args.warmup)
+        r = results[name]
+        print(
+            f"{name:<50} p50 {r['p50_ms']:>9.3f} ms  p95 {r['p95_ms']:>9.3f} ms  "
+            f"rows {r['rows_returned']:>6}  scanned {r['rows_scanned']:>10}"
+        )
+    conn.close()
+    slower = check_no_slower(results)
+    if slower:
+        print("\n".join(slower))
+
+    report = {
+        "meta": {
+            "git_commit": _git_commit(),
+            "duckdb_version": duckdb.__version__,
+            "python_version": platform.python_version(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "db": args.db,
+            "scale": scale,
+            "targets": {k: str(v) for k, v in targets.items()},
+        },
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        lines = compare(report, baseline, args.threshold)
+        print("\n".join(lines))
+        if any(line.lstrip().startswith("REGRESSION") for line in lines):
+            return 1
+    return 1 if slower else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
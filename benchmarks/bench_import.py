@@ -0,0 +1,137 @@
+"""
+Benchmark the startup cost of ``import opendev_api``: wall time and resident memory.
+
+Each sample runs the import in a fresh interpreter and reports the time spent
+in the import statement, the RSS growth it caused and which heavy optional
+modules (pandas, numpy, requests, tqdm, pyarrow) ended up loaded. Results are
+written as JSON; pass ``--compare`` with an earlier result file to flag
+regressions between commits.
+
+Run from project root:
+  python benchmarks/bench_import.py --output import.json
+  python benchmarks/bench_import.py --compare import.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+HEAVY_MODULES = ("pandas", "numpy", "requests", "tqdm", "pyarrow")
+
+# Runs in the child interpreter; prints one JSON line.
+_PROBE = """
+import json, sys, time
+
+def rss_kb():
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * {page_kb}
+    except OSError:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak // 1024 if sys.platform == "darwin" else peak
+
+before = rss_kb()
+start = time.perf_counter()
+import {module}
+elapsed = (time.perf_counter() - start) * 1000
+print(json.dumps({{
+    "import_ms": elapsed,
+    "rss_delta_kb": rss_kb() - before,
+    "heavy_modules": sorted(m for m in {heavy!r} if m in sys.modules),
+}}))
+"""
+
+
+def _page_kb() -> int:
+    try:
+        return os.sysconf("SC_PAGE_SIZE") // 1024
+    except (AttributeError, ValueError, OSError):
+        return 4
+
+
+def sample(module: str) -> dict:
+    code = _PROBE.format(module=module, heavy=HEAVY_MODULES, page_kb=_page_kb())
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [SRC, os.environ.get("PYTHONPATH")])))
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True, env=env)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def run_module(module: str, repeat: int) -> dict:
+    samples = [sample(module) for _ in range(repeat)]
+    times = [s["import_ms"] for s in samples]
+    rss = [s["rss_delta_kb"] for s in samples]
+    return {
+        "import_p50_ms": round(statistics.median(times), 3),
+        "import_min_ms": round(min(times), 3),
+        "rss_delta_p50_mb": round(statistics.median(rss) / 1024, 2),
+        "heavy_modules": samples[-1]["heavy_modules"],
+        "repeat": repeat,
+    }
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> list[str]:
+    """Return human-readable lines for modules whose import time or RSS grew by more than threshold."""
+    lines = []
+    for name, res in current["results"].items():
+        base = baseline.get("results", {}).get(name)
+        if not base:
+            continue
+        for key in ("import_p50_ms", "rss_delta_p50_mb"):
+            if not base[key]:
+                continue
+            ratio = res[key] / base[key]
+            marker = "REGRESSION" if ratio > threshold else "ok"
+            lines.append(f"{marker:>10}  {name:<30} {key:<18} {base[key]:>9.2f} -> {res[key]:>9.2f}  (x{ratio:.2f})")
+        added = sorted(set(res["heavy_modules"]) - set(base["heavy_modules"]))
+        if added:
+            lines.append(f"{'REGRESSION':>10}  {name:<30} now imports {', '.join(added)}")
+    return lines
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", action="append", help="Module to import (repeatable; default: opendev_api)")
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--output", help="Write results JSON here")
+    parser.add_argument("--compare", help="Baseline results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=1.25, help="Ratio that counts as a regression")
+    args = parser.parse_args(argv)
+
+    results = {}
+    for module in args.module or ["opendev_api"]:
+        results[module] = r = run_module(module, args.repeat)
+        print(
+            f"{module:<30} import p50 {r['import_p50_ms']:>8.1f} ms  min {r['import_min_ms']:>8.1f} ms  "
+            f"rss +{r['rss_delta_p50_mb']:>6.1f} MB  heavy: {', '.join(r['heavy_modules']) or '-'}"
+        )
+
+    report = {
+        "meta": {
+            "python_version": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        },
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        lines = compare(report, baseline, args.threshold)
+        print("\n".join(lines))
+        if any(line.lstrip().startswith("REGRESSION") for line in lines):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
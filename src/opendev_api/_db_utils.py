@@ -1,16 +1,24 @@
 """Internal helpers for DuckDB query results."""
 
+import time
+from contextlib import contextmanager
 from typing import Any
 
+import duckdb
+
+from .instrumentation import record_query
+
 
 def fetch_all_dicts(conn, query: str, params: list[Any] | None = None) -> list[dict]:
     """Execute query and return rows as list of dicts (column name -> value)."""
+    start = time.perf_counter()
     if params is not None:
         result = conn.execute(query, params)
     else:
         result = conn.execute(query)
     cols = [d[0] for d in result.description]
     rows = result.fetchall()
+    record_query(conn, query, params, (time.perf_counter() - start) * 1000, len(rows))
     return [dict(zip(cols, row)) for row in rows]
 
 
@@ -18,3 +26,60 @@ def fetch_one_dict(conn, query: str, params: list[Any] | None = None) -> dict |
     """Execute query and return first row as dict, or None if no row."""
     rows = fetch_all_dicts(conn, query, params)
     return rows[0] if rows else None
+
+
+def run_statement(conn, query: str, params: list[Any] | None = None) -> list[tuple]:
+    """Execute a statement that may write (DDL, DML, COPY) and return its rows as tuples.
+
+    Recorded like fetch_all_dicts; a slow statement gets a plain EXPLAIN plan,
+    since EXPLAIN ANALYZE would run it a second time.
+    """
+    start = time.perf_counter()
+    if params is not None:
+        result = conn.execute(query, params)
+    else:
+        result = conn.execute(query)
+    rows = result.fetchall()
+    record_query(conn, query, params, (time.perf_counter() - start) * 1000, len(rows), analyze=False)
+    return rows
+
+
+REFRESH_STATE_TABLE = "opendev_refresh_state"
+
+
+def _ensure_refresh_state(conn) -> None:
+    run_statement(conn, f"""
+        CREATE TABLE IF NOT EXISTS {REFRESH_STATE_TABLE} (
+            name VARCHAR PRIMARY KEY,
+            watermark DATE,
+            refreshed_at TIMESTAMP
+        )
+    """)
+
+
+def get_refresh_watermark(conn, name: str):
+    """Last source day folded into a derived table (None if never refreshed)."""
+    _ensure_refresh_state(conn)
+    row = fetch_one_dict(conn, f"SELECT watermark FROM {REFRESH_STATE_TABLE} WHERE name = ?", [name])
+    return row["watermark"] if row else None
+
+
+def set_refresh_watermark(conn, name: str, watermark) -> None:
+    _ensure_refresh_state(conn)
+    run_statement(
+        conn,
+        f"INSERT OR REPLACE INTO {REFRESH_STATE_TABLE} (name, watermark, refreshed_at) "
+        "VALUES (?, ?, current_timestamp)",
+        [name, watermark],
+    )
+
+
+@contextmanager
+def derived_table_hint(table: str, builder: str):
+    """Re-raise a missing-table error with the function that builds the derived table."""
+    try:
+        yield
+    except duckdb.CatalogException as e:
+        if table not in str(e):
+            raise
+        raise RuntimeError(f"{table} has not been built; run {builder}() first") from e
@@ -0,0 +1,265 @@
+"""Prefix-sum index over eco_developer_activities for arbitrary date-range totals.
+
+Every (ecosystem, developer) pair gets a run of rows, one per active day,
+holding the running total of that developer's commits in the ecosystem. The
+commits between two days are then the difference of two prefix sums, found by
+binary search, instead of a scan over the daily rows. Rows are keyed by
+``pair << 20 | day``, with the day counted from the first day in the data.
+Every pair's keys therefore sort after the previous pair's keys. This lets
+``top_developers_by_commits`` bound the range of all of an ecosystem's
+developers with two vectorized ``searchsorted`` calls.
+
+The arrays are ``.npy`` files opened with ``mmap_mode="r"``. They are written
+chunk by chunk into memory-mapped output, so building never holds the whole
+table in memory. A build writes into a temporary sibling directory and renames
+it over the old index when complete. An ``ActivityIndex`` opened earlier keeps
+reading the old files, and a failed build leaves the old index in place.
+
+On-disk layout::
+
+    <dir>/meta.json
+    <dir>/{ecosystem_ids,eco_pair_offsets,eco_row_offsets,pair_devs,keys,cumulative_commits}.npy
+"""
+
+import json
+import os
+import shutil
+from datetime import date
+
+import numpy as np
+
+from ._db_utils import run_statement
+
+FORMAT_VERSION = 1
+META_FILENAME = "meta.json"
+DEFAULT_CHUNK_ROWS = 5_000_000
+_DAY_BITS = 20  # ~2800 years of days per pair
+_MAX_DAY = (1 << _DAY_BITS) - 1
+_ARRAYS = ("ecosystem_ids", "eco_pair_offsets", "eco_row_offsets", "pair_devs", "keys", "cumulative_commits")
+
+_DAILY = """
+    SELECT ecosystem_id, canonical_developer_id, day, sum(num_commits) AS num_commits
+    FROM eco_developer_activities
+    WHERE canonical_developer_id >= 0
+    GROUP BY ecosystem_id, canonical_developer_id, day
+"""
+
+
+def _chunks(row_counts: np.ndarray, chunk_rows: int) -> list[tuple[int, int]]:
+    """Split ecosystems [0, n) into consecutive (first, last) index ranges of about chunk_rows rows."""
+    chunks, first, rows = [], 0, 0
+    for i, n in enumerate(row_counts):
+        if rows and rows + n > chunk_rows:
+            chunks.append((first, i - 1))
+            first, rows = i, 0
+        rows += int(n)
+    if len(row_counts):
+        chunks.append((first, len(row_counts) - 1))
+    return chunks
+
+
+def build_activity_index(conn, output_dir: str, *, chunk_rows: int = DEFAULT_CHUNK_ROWS) -> dict:
+    """Write the prefix-sum index of eco_developer_activities to output_dir; returns the metadata written.
+
+    Ecosystems are read about chunk_rows daily rows at a time. output_dir is
+    replaced as a whole once the new index is complete.
+    """
+    if chunk_rows < 1:
+        raise ValueError("chunk_rows must be >= 1")
+    output_dir = os.path.abspath(output_dir)
+    # A sibling, so the final rename stays on one filesystem; left over only by a crash.
+    tmp_dir = f"{output_dir}.building-{os.getpid()}"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+    try:
+        meta = _write_index(conn, tmp_dir, chunk_rows)
+        _swap_in(tmp_dir, output_dir)
+    except BaseException:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+    return meta
+
+
+def _swap_in(tmp_dir: str, output_dir: str) -> None:
+    """Move the finished tmp_dir to output_dir, replacing any existing index."""
+    old_dir = None
+    if os.path.exists(output_dir):
+        old_dir = f"{tmp_dir}.old"
+        os.rename(output_dir, old_dir)
+    os.rename(tmp_dir, output_dir)
+    if old_dir is not None:
+        # Open readers keep their memory maps of the unlinked files.
+        shutil.rmtree(old_dir)
+
+
+def _write_index(conn, output_dir: str, chunk_rows: int) -> dict:
+    """Write every array and then meta.json of the index into the empty directory output_dir."""
+    # One transaction so the per-ecosystem counts and the chunks read the same data.
+    conn.execute("BEGIN TRANSACTION")
+    try:
+        first_day, last_day = run_statement(
+            conn,
+            "SELECT min(day), max(day) FROM eco_developer_activities WHERE canonical_developer_id >= 0"
+        )[0]
+        if first_day is None:
+            raise ValueError("eco_developer_activities is empty")
+        if (last_day - first_day).days > _MAX_DAY:
+            raise ValueError(f"eco_developer_activities spans more than {_MAX_DAY} days")
+        counts = conn.execute(f"""
+            SELECT ecosystem_id, count(DISTINCT canonical_developer_id) AS pairs, count(*) AS rows
+            FROM ({_DAILY})
+            GROUP BY ecosystem_id
+            ORDER BY ecosystem_id
+        """).fetchnumpy()
+        ecosystem_ids = np.asarray(counts["ecosystem_id"], dtype=np.int64)
+        eco_pair_offsets = np.concatenate(([0], np.cumsum(counts["pairs"]))).astype(np.int64)
+        eco_row_offsets = np.concatenate(([0], np.cumsum(counts["rows"]))).astype(np.int64)
+        num_pairs, num_rows = int(eco_pair_offsets[-1]), int(eco_row_offsets[-1])
+
+        np.save(os.path.join(output_dir, "ecosystem_ids.npy"), ecosystem_ids)
+        np.save(os.path.join(output_dir, "eco_pair_offsets.npy"), eco_pair_offsets)
+        np.save(os.path.join(output_dir, "eco_row_offsets.npy"), eco_row_offsets)
+        pair_devs = np.lib.format.open_memmap(
+            os.path.join(output_dir, "pair_devs.npy"), mode="w+", dtype=np.int32, shape=(num_pairs,)
+        )
+        keys = np.lib.format.open_memmap(
+            os.path.join(output_dir, "keys.npy"), mode="w+", dtype=np.int64, shape=(num_rows,)
+        )
+        cumulative = np.lib.format.open_memmap(
+            os.path.join(output_dir, "cumulative_commits.npy"), mode="w+", dtype=np.int64, shape=(num_rows + 1,)
+        )
+        cumulative[0] = 0
+
+        for first, last in _chunks(np.asarray(counts["rows"]), chunk_rows):
+            data = conn.execute(f"""
+                SELECT ecosystem_id, canonical_developer_id, day - ?::DATE AS day_offset, num_commits
+                FROM ({_DAILY})
+                WHERE ecosystem_id BETWEEN ? AND ?
+                ORDER BY ecosystem_id, canonical_developer_id, day
+            """, [first_day, int(ecosystem_ids[first]), int(ecosystem_ids[last])]).fetchnumpy()
+            eco = np.asarray(data["ecosystem_id"])
+            dev = np.asarray(data["canonical_developer_id"])
+            new_pair = np.ones(len(dev), dtype=bool)
+            new_pair[1:] = (eco[1:] != eco[:-1]) | (dev[1:] != dev[:-1])
+            pair_lo, row_lo = int(eco_pair_offsets[first]), int(eco_row_offsets[first])
+            pairs = pair_lo + np.cumsum(new_pair) - 1
+            pair_devs[pair_lo:pair_lo + int(new_pair.sum())] = dev[new_pair]
+            keys[row_lo:row_lo + len(dev)] = (pairs << _DAY_BITS) | np.asarray(data["day_offset"], dtype=np.int64)
+            running = np.cumsum(np.asarray(data["num_commits"], dtype=np.int64))
+            cumulative[row_lo + 1:row_lo + len(dev) + 1] = cumulative[row_lo] + running
+        for arr in (pair_devs, keys, cumulative):
+            arr.flush()
+        del pair_devs, keys, cumulative
+    finally:
+        conn.execute("ROLLBACK")
+
+    meta = {
+        "format_version": FORMAT_VERSION,
+        "first_day": first_day.isoformat(),
+        "last_day": last_day.isoformat(),
+        "ecosystems": int(len(ecosystem_ids)),
+        "developer_memberships": num_pairs,
+        "rows": num_rows,
+    }
+    with open(os.path.join(output_dir, META_FILENAME), "w") as f:
+        json.dump(meta, f, indent=2)
+    return meta
+
+
+class ActivityIndex:
+    """Memory-mapped prefix-sum index written by build_activity_index.
+
+    Date bounds are inclusive; None means the first / last day of the data.
+    """
+
+    def __init__(self, path: str):
+        meta_path = os.path.join(path, META_FILENAME)
+        if not os.path.isfile(meta_path):
+            raise FileNotFoundError(f"No {META_FILENAME} in {path}")
+        with open(meta_path) as f:
+            self.meta = json.load(f)
+        self.first_day = date.fromisoformat(self.meta["first_day"])
+        self.last_day = date.fromisoformat(self.meta["last_day"])
+        for name in _ARRAYS:
+            setattr(self, f"_{name}", np.load(os.path.join(path, f"{name}.npy"), mmap_mode="r"))
+
+    def _index(self, ecosystem_id: int) -> int | None:
+        i = int(np.searchsorted(self._ecosystem_ids, ecosystem_id))
+        if i < len(self._ecosystem_ids) and self._ecosystem_ids[i] == ecosystem_id:
+            return i
+        return None
+
+    def _bounds(self, start: date | None, end: date | None) -> tuple[int, int] | None:
+        """Day offsets of [start, end] clipped to the data, or None if the range holds no day."""
+        if start is not None and end is not None and start > end:
+            raise ValueError("start must not be after end")
+        lo = 0 if start is None else max((start - self.first_day).days, 0)
+        hi = (self.last_day - self.first_day).days
+        if end is not None:
+            hi = min((end - self.first_day).days, hi)
+        return (lo, hi) if lo <= hi else None
+
+    def _totals(self, idx: int, pairs: np.ndarray, bounds: tuple[int, int]) -> tuple[np.ndarray, np.ndarray]:
+        """Commits and active days of each pair (global pair indexes of ecosystem idx) in bounds."""
+        row_lo, row_hi = int(self._eco_row_offsets[idx]), int(self._eco_row_offsets[idx + 1])
+        keys = self._keys[row_lo:row_hi]
+        lo = row_lo + np.searchsorted(keys, (pairs << _DAY_BITS) | bounds[0], side="left")
+        hi = row_lo + np.searchsorted(keys, (pairs << _DAY_BITS) | bounds[1], side="right")
+        return self._cumulative_commits[hi] - self._cumulative_commits[lo], hi - lo
+
+    def developer_commits(
+        self,
+        ecosystem_id: int,
+        canonical_developer_id: int,
+        start: date | None = None,
+        end: date | None = None,
+    ) -> dict:
+        """Commits and active days of one developer in an ecosystem between start and end."""
+        result = {
+            "ecosystem_id": ecosystem_id,
+            "canonical_developer_id": canonical_developer_id,
+            "commits": 0,
+            "active_days": 0,
+        }
+        idx = self._index(ecosystem_id)
+        bounds = self._bounds(start, end)
+        if idx is None or bounds is None:
+            return result
+        pair_lo, pair_hi = int(self._eco_pair_offsets[idx]), int(self._eco_pair_offsets[idx + 1])
+        j = pair_lo + int(np.searchsorted(self._pair_devs[pair_lo:pair_hi], canonical_developer_id))
+        if j < pair_hi and self._pair_devs[j] == canonical_developer_id:
+            commits, days = self._totals(idx, np.array([j], dtype=np.int64), bounds)
+            result["commits"], result["active_days"] = int(commits[0]), int(days[0])
+        return result
+
+    def top_developers_by_commits(
+        self,
+        ecosystem_id: int,
+        start: date | None = None,
+        end: date | None = None,
+        *,
+        limit: int = 20,
+    ) -> list[dict]:
+        """Developers with the most commits in an ecosystem between start and end (ties by id)."""
+        idx = self._index(ecosystem_id)
+        bounds = self._bounds(start, end)
+        if idx is None or bounds is None or limit < 1:
+            return []
+        pair_lo, pair_hi = int(self._eco_pair_offsets[idx]), int(self._eco_pair_offsets[idx + 1])
+        commits, days = self._totals(idx, np.arange(pair_lo, pair_hi, dtype=np.int64), bounds)
+        devs = np.asarray(self._pair_devs[pair_lo:pair_hi])
+        candidates = np.flatnonzero(days > 0)
+        if len(candidates) > limit:
+            candidates = candidates[np.argpartition(-commits[candidates], limit - 1)[:limit]]
+            # Ties at the cut-off are broken by id, so take every tied developer before trimming.
+            tied = np.flatnonzero((days > 0) & (commits == commits[candidates].min()))
+            candidates = np.union1d(candidates, tied)
+        candidates = candidates[np.lexsort((devs[candidates], -commits[candidates]))][:limit]
+        return [
+            {
+                "canonical_developer_id": int(devs[i]),
+                "commits": int(commits[i]),
+                "active_days": int(days[i]),
+            }
+            for i in candidates
+        ]
@@ -0,0 +1,266 @@
+"""Monthly code churn (commits, lines added / deleted) from the raw ``commits`` table.
+
+``commits`` has one row per commit (repo_id, canonical_developer_id,
+committed_at, additions, deletions) and is far too large to aggregate per
+request. ``refresh_commit_churn`` reads it once, month by month on parallel
+cursors, into ``repo_developer_monthly_churn`` (one row per repo, developer
+and month). Each month is written in its own transaction and recorded in
+``commit_churn_progress``, so an interrupted refresh resumes where it stopped;
+later refreshes only redo months from the newest completed one onwards.
+
+The serving tables are then rebuilt from that rollup without touching
+``commits`` again:
+
+- ``eco_monthly_churn``: per ecosystem (recursive repos) and month;
+- ``repo_monthly_churn``: per repo and month, for per-repo breakdowns;
+- ``developer_monthly_churn``: per developer and month.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+
+from ._db_utils import derived_table_hint, fetch_all_dicts, run_statement
+
+BASE_TABLE = "repo_developer_monthly_churn"
+PROGRESS_TABLE = "commit_churn_progress"
+ECO_TABLE = "eco_monthly_churn"
+REPO_TABLE = "repo_monthly_churn"
+DEVELOPER_TABLE = "developer_monthly_churn"
+
+
+def _create_tables(conn) -> None:
+    run_statement(conn, f"""
+        CREATE TABLE IF NOT EXISTS {BASE_TABLE} (
+            repo_id INTEGER,
+            canonical_developer_id INTEGER,
+            month DATE,
+            commits BIGINT,
+            additions BIGINT,
+            deletions BIGINT
+        )
+    """)
+    run_statement(
+        conn,
+        f"CREATE INDEX IF NOT EXISTS {BASE_TABLE}_dev_idx ON {BASE_TABLE} (canonical_developer_id)"
+    )
+    run_statement(conn, f"""
+        CREATE TABLE IF NOT EXISTS {PROGRESS_TABLE} (
+            month DATE PRIMARY KEY,
+            rows UBIGINT,
+            completed_at TIMESTAMP
+        )
+    """)
+
+
+def _process_month(conn, month: date) -> int:
+    cursor = conn.cursor()
+    try:
+        cursor.execute("BEGIN TRANSACTION")
+        try:
+            run_statement(cursor, f"DELETE FROM {BASE_TABLE} WHERE month = ?", [month])
+            # A time range (not date_trunc = ?) lets zone maps skip row groups of other months.
+            rows = run_statement(cursor, f"""
+                INSERT INTO {BASE_TABLE}
+                SELECT repo_id, canonical_developer_id, $month, count(*), sum(additions), sum(deletions)
+                FROM commits
+                WHERE committed_at >= $month AND committed_at < $month + INTERVAL 1 MONTH
+                GROUP BY repo_id, canonical_developer_id
+            """, {"month": month})[0][0]
+            run_statement(
+                cursor,
+                f"INSERT OR REPLACE INTO {PROGRESS_TABLE} VALUES (?, ?, current_timestamp)", [month, rows]
+            )
+            cursor.execute("COMMIT")
+        except Exception:
+            cursor.execute("ROLLBACK")
+            raise
+        return rows
+    finally:
+        cursor.close()
+
+
+def _rebuild_serving_tables(conn) -> None:
+    run_statement(conn, f"""
+        CREATE OR REPLACE TABLE {REPO_TABLE} AS
+        SELECT repo_id, month,
+               CAST(sum(commits) AS BIGINT) AS commits,
+               CAST(sum(additions) AS BIGINT) AS additions,
+               CAST(sum(deletions) AS BIGINT) AS deletions,
+               count(*) AS developers
+        FROM {BASE_TABLE}
+        GROUP BY repo_id, month
+        ORDER BY repo_id, month
+    """)
+    run_statement(conn, f"""
+        CREATE OR REPLACE TABLE {DEVELOPER_TABLE} AS
+        SELECT canonical_developer_id, month,
+               CAST(sum(commits) AS BIGINT) AS commits,
+               CAST(sum(additions) AS BIGINT) AS additions,
+               CAST(sum(deletions) AS BIGINT) AS deletions,
+               count(*) AS repos
+        FROM {BASE_TABLE}
+        GROUP BY canonical_developer_id, month
+        ORDER BY canonical_developer_id, month
+    """)
+    run_statement(conn, f"""
+        CREATE OR REPLACE TABLE {ECO_TABLE} AS
+        WITH eco_repos AS (
+            SELECT DISTINCT ecosystem_id, repo_id FROM ecosystems_repos_recursive
+        )
+        SELECT er.ecosystem_id, b.month,
+               CAST(sum(b.commits) AS BIGINT) AS commits,
+               CAST(sum(b.additions) AS BIGINT) AS additions,
+               CAST(sum(b.deletions) AS BIGINT) AS deletions,
+               count(DISTINCT b.canonical_developer_id) AS developers,
+               count(DISTINCT b.repo_id) AS repos
+        FROM {BASE_TABLE} b
+        JOIN eco_repos er ON er.repo_id = b.repo_id
+        GROUP BY er.ecosystem_id, b.month
+        ORDER BY er.ecosystem_id, b.month
+    """)
+
+
+def refresh_commit_churn(conn, *, max_workers: int = 4, full: bool = False) -> dict:
+    """Aggregate commits into monthly rollups (resumable) and rebuild the churn serving tables.
+
+    Months already recorded in commit_churn_progress are skipped, except the
+    newest one, which may have received commits since. full=True redoes every month.
+    """
+    if max_workers < 1:
+        raise ValueError("max_workers must be >= 1")
+    _create_tables(conn)
+    if full:
+        run_statement(conn, f"DELETE FROM {PROGRESS_TABLE}")
+    first, last = run_statement(
+        conn,
+        "SELECT date_trunc('month', min(committed_at))::DATE, date_trunc('month', max(committed_at))::DATE FROM commits"
+    )[0]
+    if first is None:
+        return {"months": 0, "skipped": 0, "rows": 0, "through": None}
+    done = {r[0] for r in run_statement(conn, f"SELECT month FROM {PROGRESS_TABLE}")}
+    newest_done = max(done) if done else None
+    months = [
+        r[0] for r in run_statement(
+            conn,
+            "SELECT unnest(generate_series(?::DATE, ?::DATE, INTERVAL 1 MONTH))::DATE", [first, last]
+        )
+    ]
+    todo = [m for m in months if m not in done or (newest_done is not None and m >= newest_done)]
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        rows = sum(pool.map(lambda m: _process_month(conn, m), todo))
+    conn.execute("BEGIN TRANSACTION")
+    try:
+        _rebuild_serving_tables(conn)
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+    return {"months": len(todo), "skipped": len(months) - len(todo), "rows": rows, "through": last}
+
+
+def _month_range(where: str, params: list, start_month: date | None, end_month: date | None) -> str:
+    if start_month is not None:
+        where += " AND month >= date_trunc('month', ?::DATE)"
+        params.append(start_month)
+    if end_month is not None:
+        where += " AND month <= ?"
+        params.append(end_month)
+    return where
+
+
+def ecosystem_churn_time_series(
+    conn,
+    ecosystem_id: int,
+    *,
+    start_month: date | None = None,
+    end_month: date | None = None,
+) -> list[dict]:
+    """Monthly commits, lines added / deleted, active developers and repos for an ecosystem."""
+    params: list = [ecosystem_id]
+    where = _month_range("ecosystem_id = ?", params, start_month, end_month)
+    query = f"""
+        SELECT month, commits, additions, deletions, developers, repos
+        FROM {ECO_TABLE}
+        WHERE {where}
+        ORDER BY month
+    """
+    with derived_table_hint(ECO_TABLE, "refresh_commit_churn"):
+        return fetch_all_dicts(conn, query, params)
+
+
+def ecosystem_repo_churn(
+    conn,
+    ecosystem_id: int,
+    *,
+    start_month: date | None = None,
+    end_month: date | None = None,
+    limit: int = 20,
+) -> list[dict]:
+    """Per-repo churn totals within an ecosystem over a month range, most lines changed first."""
+    params: list = [ecosystem_id]
+    where = _month_range(
+        "repo_id IN (SELECT repo_id FROM ecosystems_repos_recursive WHERE ecosystem_id = ?)",
+        params, start_month, end_month,
+    )
+    params.append(limit)
+    query = f"""
+        WITH totals AS (
+            SELECT repo_id,
+                   CAST(sum(commits) AS BIGINT) AS commits,
+                   CAST(sum(additions) AS BIGINT) AS additions,
+                   CAST(sum(deletions) AS BIGINT) AS deletions
+            FROM {REPO_TABLE}
+            WHERE {where}
+            GROUP BY repo_id
+            ORDER BY sum(additions) + sum(deletions) DESC, repo_id
+            LIMIT ?
+        )
+        SELECT t.repo_id, r.name, r.link, t.commits, t.additions, t.deletions
+        FROM totals t
+        LEFT JOIN repos r ON r.id = t.repo_id
+        ORDER BY t.additions + t.deletions DESC, t.repo_id
+    """
+    with derived_table_hint(REPO_TABLE, "refresh_commit_churn"):
+        return fetch_all_dicts(conn, query, params)
+
+
+def developer_churn_time_series(
+    conn,
+    canonical_developer_id: int,
+    *,
+    ecosystem_id: int | None = None,
+    start_month: date | None = None,
+    end_month: date | None = None,
+) -> list[dict]:
+    """Monthly commits and lines added / deleted by a developer, optionally within one ecosystem."""
+    params: list = [canonical_developer_id]
+    if ecosystem_id is None:
+        where = _month_range("canonical_developer_id = ?", params, start_month, end_month)
+        table = DEVELOPER_TABLE
+        query = f"""
+            SELECT month, commits, additions, deletions, repos
+            FROM {DEVELOPER_TABLE}
+            WHERE {where}
+            ORDER BY month
+        """
+    else:
+        params.append(ecosystem_id)
+        where = _month_range(
+            "b.canonical_developer_id = ? AND b.repo_id IN "
+            "(SELECT repo_id FROM ecosystems_repos_recursive WHERE ecosystem_id = ?)",
+            params, start_month, end_month,
+        )
+        table = BASE_TABLE
+        query = f"""
+            SELECT month,
+                   CAST(sum(commits) AS BIGINT) AS commits,
+                   CAST(sum(additions) AS BIGINT) AS additions,
+                   CAST(sum(deletions) AS BIGINT) AS deletions,
+                   count(*) AS repos
+            FROM {BASE_TABLE} b
+            WHERE {where}
+            GROUP BY month
+            ORDER BY month
+        """
+    with derived_table_hint(table, "refresh_commit_churn"):
+        return fetch_all_dicts(conn, query, params)
@@ -1,33 +1,235 @@
 import duckdb
+import threading
+from collections.abc import Callable, Iterator
 from datetime import date
-from .get_user_info import create_user_info_table
+from typing import TYPE_CHECKING
 from . import ecosystems as _ecosystems
 from . import developers as _developers
+from . import partitioned as _partitioned
+from . import instrumentation as _instrumentation
+from . import developer_index as _developer_index
+from . import repo_activity as _repo_activity
+from . import ecosystem_stats as _ecosystem_stats
+from . import rank_histograms as _rank_histograms
+from . import geo as _geo
+from . import export as _export
+from . import snapshots as _snapshots
+from . import warmup as _warmup
+from . import churn as _churn
+from . import organizations as _organizations
+from . import tenures as _tenures
+from . import points_percentiles as _points_percentiles
+from . import rank_diff as _rank_diff
+
+if TYPE_CHECKING:
+    from .activity_index import ActivityIndex
+    from .developer_bitmaps import DeveloperBitmaps
 
 
 class OpenDevData:
+    # Set by from_snapshots; plain file and Parquet clients never swap.
+    snapshot_dir: str | None = None
+    data_version: str | None = None
+    _watcher: "_snapshots.SnapshotWatcher | None" = None
+    _version_callbacks: tuple[Callable[[str | None, str], object], ...] = ()
+
     def __init__(self, folderpath, db_filename):
         self.folderpath = folderpath
         self.db_filename = db_filename
         self.conn = duckdb.connect(f"{folderpath}/{db_filename}")
+        self.data_version = _snapshots.file_version(f"{folderpath}/{db_filename}")
+
+    @classmethod
+    def from_parquet(cls, parquet_dir: str) -> "OpenDevData":
+        """Open a read-only client backed by an export from export_partitioned_parquet."""
+        client = cls.__new__(cls)
+        client.folderpath = parquet_dir
+        client.db_filename = None
+        client.conn = duckdb.connect(":memory:")
+        try:
+            _partitioned.attach_parquet_views(client.conn, parquet_dir)
+        except Exception:
+            client.close()
+            raise
+        client.data_version = _snapshots.file_version(
+            f"{parquet_dir}/{_partitioned.MANIFEST_FILENAME}"
+        )
+        return client
+
+    @classmethod
+    def from_snapshots(
+        cls,
+        snapshot_dir: str,
+        *,
+        version: str | None = None,
+        watch_interval: float | None = None,
+    ) -> "OpenDevData":
+        """Open a read-only client on a snapshot directory (newest version unless given).
+
+        With watch_interval, a background thread switches to newer snapshots as they appear.
+        """
+        version = version or _snapshots.latest_snapshot(snapshot_dir)
+        if version is None:
+            raise FileNotFoundError(f"No *{_snapshots.SNAPSHOT_SUFFIX} snapshots in {snapshot_dir}")
+        client = cls.__new__(cls)
+        client.folderpath = snapshot_dir
+        client.db_filename = version + _snapshots.SNAPSHOT_SUFFIX
+        client.snapshot_dir = snapshot_dir
+        client.conn = _snapshots.open_snapshot(snapshot_dir, version)
+        client.data_version = version
+        client._swap_lock = threading.Lock()
+        if watch_interval is not None:
+            client.start_snapshot_watcher(interval=watch_interval)
+        return client
+
+    def swap_to_snapshot(
+        self,
+        version: str | None = None,
+        *,
+        warm: Callable[[duckdb.DuckDBPyConnection], object] | None = _snapshots.warm_connection,
+    ) -> bool:
+        """Open and warm a snapshot (newest by default), then switch new calls to it.
+
+        Calls already running finish on the previous connection, which is closed
+        as soon as the last of them returns (right away if none is running).
+        Registered on_data_version_change callbacks run after the switch.
+        Returns False if version is already being served.
+        """
+        if self.snapshot_dir is None:
+            raise RuntimeError("Client was not opened with from_snapshots")
+        with self._swap_lock:
+            version = version or _snapshots.latest_snapshot(self.snapshot_dir)
+            if version is None or version == self.data_version:
+                return False
+            new_conn = _snapshots.open_snapshot(self.snapshot_dir, version)
+            try:
+                if warm is not None:
+                    warm(new_conn)
+            except Exception:
+                new_conn.close()
+                raise
+            old_version, old_conn = self.data_version, self.conn
+            self.conn = new_conn
+            self.db_filename = version + _snapshots.SNAPSHOT_SUFFIX
+            self.data_version = version
+            # In-flight calls hold leases on the old connection; the last one to finish closes it.
+            _snapshots.retire(old_conn)
+        for callback in self._version_callbacks:
+            callback(old_version, version)
+        return True
+
+    def on_data_version_change(self, callback: Callable[[str | None, str], object]) -> None:
+        """Register callback(old_version, new_version), called after every snapshot swap or refresh."""
+        self._version_callbacks = (*self._version_callbacks, callback)
+
+    def _data_changed(self) -> None:
+        """Bump data_version after a refresh wrote through this client, so version-keyed caches miss."""
+        old = self.data_version
+        base, _, count = (old or "").partition("+refresh")
+        self.data_version = f"{base}+refresh{int(count or 0) + 1}"
+        for callback in self._version_callbacks:
+            callback(old, self.data_version)
+
+    def publish_snapshot(self, snapshot_dir: str, version: str, *, allow_missing: tuple[str, ...] = ()) -> str:
+        """Publish this client's database file as snapshot version once every derived table is built."""
+        with self._lease() as conn:
+            return _snapshots.publish_snapshot(conn, snapshot_dir, version, allow_missing=allow_missing)
+
+    def start_snapshot_watcher(
+        self,
+        *,
+        interval: float = 30.0,
+        warm: Callable[[duckdb.DuckDBPyConnection], object] | None = _snapshots.warm_connection,
+    ) -> "_snapshots.SnapshotWatcher":
+        """Poll the snapshot directory in a daemon thread and swap to newer versions (warmed with warm)."""
+        if self.snapshot_dir is None:
+            raise RuntimeError("Client was not opened with from_snapshots")
+        if self._watcher is None:
+            self._watcher = _snapshots.SnapshotWatcher(
+                self.snapshot_dir,
+                lambda: self.data_version,
+                lambda version: self.swap_to_snapshot(version, warm=warm),
+                interval=interval,
+            )
+            self._watcher.start()
+        return self._watcher
+
+    def stop_snapshot_watcher(self) -> None:
+        if self._watcher is not None:
+            self._watcher.stop()
+            self._watcher = None
 
     def close(self):
+        self.stop_snapshot_watcher()
         if self.conn is not None:
             self.conn.close()
             self.conn = None
 
-    def _ensure_conn(self) -> None:
-        if self.conn is None:
-            raise RuntimeError("Connection is closed")
+    def _lease(self):
+        """Context manager yielding the current connection, which a snapshot swap will not close until it exits."""
+        return _snapshots.leased(lambda: self.conn)
+
+    def query_stats(self) -> dict:
+        """Per-API-function query timings recorded so far (process-wide)."""
+        return _instrumentation.query_stats()
+
+    def reset_query_stats(self) -> None:
+        _instrumentation.reset_query_stats()
+
+    def warm_up(
+        self,
+        *,
+        top_n: int = 20,
+        ecosystem_ids: list[int] | None = None,
+        max_workers: int = 4,
+        keep_results: bool = False,
+    ) -> dict:
+        """Prefetch the landing-page queries of the top_n (or given) ecosystems; returns timings."""
+        with self._lease() as conn:
+            return _warmup.warm_up(
+                conn,
+                top_n=top_n,
+                ecosystem_ids=ecosystem_ids,
+                max_workers=max_workers,
+                keep_results=keep_results,
+            )
+
+    def top_ecosystems_by_devs(self, limit: int = 20) -> list[int]:
+        """Ecosystem ids with the most developers on their latest day (the ones warm_up prefetches)."""
+        with self._lease() as conn:
+            return _warmup.top_ecosystems_by_devs(conn, limit)
+
+    def latest_mads_day(self) -> date | None:
+        """Newest eco_mads day; warmup.landing_calls ends the dashboard's chart window there."""
+        with self._lease() as conn:
+            return _warmup.latest_mads_day(conn)
 
     def create_user_info_table(self, github_token: str) -> None:
-        self._ensure_conn()
-        try:
-            create_user_info_table(self.conn, github_token)
-        except Exception as e:
-            raise RuntimeError(
-                f"Failed to create user_info table: {e}"
-            ) from e
+        with self._lease() as conn:
+            # Ingestion pulls in requests, tqdm and pandas; import it only when used.
+            from .get_user_info import create_user_info_table
+
+            try:
+                create_user_info_table(conn, github_token)
+            except Exception as e:
+                raise RuntimeError(
+                    f"Failed to create user_info table: {e}"
+                ) from e
+
+    def export_partitioned_parquet(
+        self,
+        output_dir: str,
+        *,
+        num_buckets: int = _partitioned.DEFAULT_NUM_BUCKETS,
+        include_other_tables: bool = True,
+    ) -> dict:
+        with self._lease() as conn:
+            return _partitioned.export_partitioned_parquet(
+                conn,
+                output_dir,
+                num_buckets=num_buckets,
+                include_other_tables=include_other_tables,
+            )
 
     # --- Ecosystems ---
     def list_ecosystems(
@@ -37,27 +239,42 @@ class OpenDevData:
         is_crypto: bool | None = None,
         is_chain: bool | None = None,
         include_repo_count: bool = False,
+        include_stats: bool = False,
+        sort_by: str = "name",
         limit: int = 50,
         offset: int = 0,
     ) -> list[dict]:
-        self._ensure_conn()
-        return _ecosystems.list_ecosystems(
-            self.conn,
-            name_contains=name_contains,
-            is_crypto=is_crypto,
-            is_chain=is_chain,
-            include_repo_count=include_repo_count,
-            limit=limit,
-            offset=offset,
-        )
+        with self._lease() as conn:
+            return _ecosystems.list_ecosystems(
+                conn,
+                name_contains=name_contains,
+                is_crypto=is_crypto,
+                is_chain=is_chain,
+                include_repo_count=include_repo_count,
+                include_stats=include_stats,
+                sort_by=sort_by,
+                limit=limit,
+                offset=offset,
+            )
+
+    def refresh_ecosystem_stats(self) -> dict:
+        with self._lease() as conn:
+            result = _ecosystem_stats.refresh_ecosystem_stats(conn)
+            self._data_changed()
+            return result
+
+    def ecosystem_stats_freshness(self) -> dict:
+        """When ecosystem_stats was last rebuilt and whether eco_mads has newer days."""
+        with self._lease() as conn:
+            return _ecosystem_stats.ecosystem_stats_freshness(conn)
 
     def get_ecosystem(self, ecosystem_id: int, *, include_latest_mads: bool = False) -> dict | None:
-        self._ensure_conn()
-        return _ecosystems.get_ecosystem(self.conn, ecosystem_id, include_latest_mads=include_latest_mads)
+        with self._lease() as conn:
+            return _ecosystems.get_ecosystem(conn, ecosystem_id, include_latest_mads=include_latest_mads)
 
     def ecosystem_hierarchy(self, ecosystem_id: int) -> dict:
-        self._ensure_conn()
-        return _ecosystems.ecosystem_hierarchy(self.conn, ecosystem_id)
+        with self._lease() as conn:
+            return _ecosystems.ecosystem_hierarchy(conn, ecosystem_id)
 
     def repos_in_ecosystem(
         self,
@@ -68,15 +285,15 @@ class OpenDevData:
         limit: int = 50,
         offset: int = 0,
     ) -> list[dict]:
-        self._ensure_conn()
-        return _ecosystems.repos_in_ecosystem(
-            self.conn,
-            ecosystem_id,
-            recursive=recursive,
-            sort_by=sort_by,
-            limit=limit,
-            offset=offset,
-        )
+        with self._lease() as conn:
+            return _ecosystems.repos_in_ecosystem(
+                conn,
+                ecosystem_id,
+                recursive=recursive,
+                sort_by=sort_by,
+                limit=limit,
+                offset=offset,
+            )
 
     def ecosystem_mads_time_series(
         self,
@@ -86,33 +303,115 @@ class OpenDevData:
         end_date: date | None = None,
         limit: int = 365,
     ) -> list[dict]:
-        self._ensure_conn()
-        return _ecosystems.ecosystem_mads_time_series(
-            self.conn,
-            ecosystem_id,
-            start_date=start_date,
-            end_date=end_date,
-            limit=limit,
-        )
+        with self._lease() as conn:
+            return _ecosystems.ecosystem_mads_time_series(
+                conn,
+                ecosystem_id,
+                start_date=start_date,
+                end_date=end_date,
+                limit=limit,
+            )
+
+    def ecosystem_rank_distribution_time_series(
+        self,
+        ecosystem_id: int,
+        *,
+        start_date: date | None = None,
+        end_date: date | None = None,
+        limit: int = 365,
+    ) -> list[dict]:
+        with self._lease() as conn:
+            return _ecosystems.ecosystem_rank_distribution_time_series(
+                conn,
+                ecosystem_id,
+                start_date=start_date,
+                end_date=end_date,
+                limit=limit,
+            )
+
+    def refresh_rank_histograms(self, *, chunk_days: int = 31, max_workers: int = 4) -> dict:
+        with self._lease() as conn:
+            result = _rank_histograms.refresh_rank_histograms(
+                conn,
+                chunk_days=chunk_days,
+                max_workers=max_workers,
+            )
+            self._data_changed()
+            return result
 
     def search_ecosystems(self, name_query: str, *, limit: int = 30) -> list[dict]:
-        self._ensure_conn()
-        return _ecosystems.search_ecosystems(self.conn, name_query, limit=limit)
+        with self._lease() as conn:
+            return _ecosystems.search_ecosystems(conn, name_query, limit=limit)
 
     def top_repos_in_ecosystem(
         self,
         ecosystem_id: int,
         *,
         recursive: bool = True,
+        sort_by: str = "num_stars",
         limit: int = 20,
     ) -> list[dict]:
-        self._ensure_conn()
-        return _ecosystems.top_repos_in_ecosystem(
-            self.conn,
-            ecosystem_id,
-            recursive=recursive,
-            limit=limit,
-        )
+        with self._lease() as conn:
+            return _ecosystems.top_repos_in_ecosystem(
+                conn,
+                ecosystem_id,
+                recursive=recursive,
+                sort_by=sort_by,
+                limit=limit,
+            )
+
+    def refresh_repo_activity_stats(self) -> dict:
+        with self._lease() as conn:
+            result = _repo_activity.refresh_repo_activity_stats(conn)
+            self._data_changed()
+            return result
+
+    # --- Organizations ---
+    def refresh_organization_stats(self) -> dict:
+        with self._lease() as conn:
+            result = _organizations.refresh_organization_stats(conn)
+            self._data_changed()
+            return result
+
+    def ecosystem_organizations(
+        self,
+        ecosystem_id: int,
+        *,
+        sort_by: str = "active_devs_90d",
+        first_party_only: bool = False,
+        limit: int = 20,
+    ) -> list[dict]:
+        with self._lease() as conn:
+            return _organizations.ecosystem_organizations(
+                conn,
+                ecosystem_id,
+                sort_by=sort_by,
+                first_party_only=first_party_only,
+                limit=limit,
+            )
+
+    def organization_ecosystems(
+        self,
+        organization_id: int,
+        *,
+        sort_by: str = "repos",
+        limit: int = 100,
+    ) -> list[dict]:
+        with self._lease() as conn:
+            return _organizations.organization_ecosystems(
+                conn,
+                organization_id,
+                sort_by=sort_by,
+                limit=limit,
+            )
+
+    def get_organization(self, organization_id: int) -> dict | None:
+        with self._lease() as conn:
+            return _organizations.get_organization(conn, organization_id)
+
+    def top_organizations(self, *, sort_by: str = "active_devs_90d", limit: int = 20) -> list[dict]:
+        with self._lease() as conn:
+            return _organizations.top_organizations(conn, sort_by=sort_by, limit=limit)
 
     # --- Developers ---
     def developers_in_ecosystem(
@@ -122,32 +421,110 @@ class OpenDevData:
         day: date | None = None,
         contribution_rank: str | None = None,
         include_user_info: bool = True,
+        include_tenure: bool = False,
+        include_percentile: bool = False,
         limit: int = 50,
         offset: int = 0,
     ) -> list[dict]:
-        self._ensure_conn()
-        return _developers.developers_in_ecosystem(
-            self.conn,
-            ecosystem_id,
-            day=day,
-            contribution_rank=contribution_rank,
-            include_user_info=include_user_info,
-            limit=limit,
-            offset=offset,
-        )
+        with self._lease() as conn:
+            return _developers.developers_in_ecosystem(
+                conn,
+                ecosystem_id,
+                day=day,
+                contribution_rank=contribution_rank,
+                include_user_info=include_user_info,
+                include_tenure=include_tenure,
+                include_percentile=include_percentile,
+                limit=limit,
+                offset=offset,
+            )
+
+    def iter_developers_in_ecosystem(
+        self,
+        ecosystem_id: int,
+        *,
+        day: date | None = None,
+        contribution_rank: str | None = None,
+        include_user_info: bool = True,
+        batch_size: int = 10_000,
+    ) -> Iterator[list[dict]]:
+        with self._lease() as conn:
+            yield from _developers.iter_developers_in_ecosystem(
+                conn,
+                ecosystem_id,
+                day=day,
+                contribution_rank=contribution_rank,
+                include_user_info=include_user_info,
+                batch_size=batch_size,
+            )
+
+    def export_developers_in_ecosystem(
+        self,
+        ecosystem_id: int,
+        path: str,
+        *,
+        format: str | None = None,
+        day: date | None = None,
+        contribution_rank: str | None = None,
+        include_user_info: bool = True,
+    ) -> dict:
+        with self._lease() as conn:
+            return _export.export_developers_in_ecosystem(
+                conn,
+                ecosystem_id,
+                path,
+                format=format,
+                day=day,
+                contribution_rank=contribution_rank,
+                include_user_info=include_user_info,
+            )
 
     def get_developer_profile(
         self,
         canonical_developer_id: int,
         *,
         include_location: bool = False,
+        ecosystem_id: int | None = None,
     ) -> dict | None:
-        self._ensure_conn()
-        return _developers.get_developer_profile(
-            self.conn,
-            canonical_developer_id,
-            include_location=include_location,
-        )
+        with self._lease() as conn:
+            return _developers.get_developer_profile(
+                conn,
+                canonical_developer_id,
+                include_location=include_location,
+                ecosystem_id=ecosystem_id,
+            )
+
+    def get_developer_profiles(
+        self,
+        *,
+        ids: list[int] | None = None,
+        logins: list[str] | None = None,
+        github_node_ids: list[str] | None = None,
+        include_location: bool = False,
+    ) -> list[dict]:
+        with self._lease() as conn:
+            return _developers.get_developer_profiles(
+                conn,
+                ids=ids,
+                logins=logins,
+                github_node_ids=github_node_ids,
+                include_location=include_location,
+            )
+
+    def developer_profile_bundle(
+        self,
+        canonical_developer_id: int,
+        ecosystem_id: int | None = None,
+        *,
+        activity_limit: int = 30,
+    ) -> dict | None:
+        with self._lease() as conn:
+            return _developers.developer_profile_bundle(
+                conn,
+                canonical_developer_id,
+                ecosystem_id,
+                activity_limit=activity_limit,
+            )
 
     def developer_activity_in_ecosystem(
         self,
@@ -158,27 +535,27 @@ class OpenDevData:
         end_date: date | None = None,
         limit: int = 365,
     ) -> list[dict]:
-        self._ensure_conn()
-        return _developers.developer_activity_in_ecosystem(
-            self.conn,
-            ecosystem_id,
-            canonical_developer_id,
-            start_date=start_date,
-            end_date=end_date,
-            limit=limit,
-        )
+        with self._lease() as conn:
+            return _developers.developer_activity_in_ecosystem(
+                conn,
+                ecosystem_id,
+                canonical_developer_id,
+                start_date=start_date,
+                end_date=end_date,
+                limit=limit,
+            )
 
     def developer_tenure_in_ecosystem(
         self,
         ecosystem_id: int,
         canonical_developer_id: int,
     ) -> list[dict]:
-        self._ensure_conn()
-        return _developers.developer_tenure_in_ecosystem(
-            self.conn,
-            ecosystem_id,
-            canonical_developer_id,
-        )
+        with self._lease() as conn:
+            return _developers.developer_tenure_in_ecosystem(
+                conn,
+                ecosystem_id,
+                canonical_developer_id,
+            )
 
     def search_developers_in_ecosystem(
         self,
@@ -189,12 +566,309 @@ class OpenDevData:
         limit: int = 30,
         offset: int = 0,
     ) -> list[dict]:
-        self._ensure_conn()
-        return _developers.search_developers_in_ecosystem(
-            self.conn,
-            ecosystem_id,
-            query_text,
-            day=day,
-            limit=limit,
-            offset=offset,
-        )
+        with self._lease() as conn:
+            return _developers.search_developers_in_ecosystem(
+                conn,
+                ecosystem_id,
+                query_text,
+                day=day,
+                limit=limit,
+                offset=offset,
+            )
+
+    # --- Latest tenures ---
+    def refresh_latest_tenures(self) -> dict:
+        with self._lease() as conn:
+            result = _tenures.refresh_latest_tenures(conn)
+            self._data_changed()
+            return result
+
+    def latest_tenures_in_ecosystem(
+        self,
+        ecosystem_id: int,
+        *,
+        canonical_developer_ids: list[int] | None = None,
+    ) -> list[dict]:
+        with self._lease() as conn:
+            return _tenures.latest_tenures_in_ecosystem(
+                conn,
+                ecosystem_id,
+                canonical_developer_ids=canonical_developer_ids,
+            )
+
+    # --- Points percentiles ---
+    def refresh_points_percentiles(self) -> dict:
+        with self._lease() as conn:
+            result = _points_percentiles.refresh_points_percentiles(conn)
+            self._data_changed()
+            return result
+
+    def points_percentile_curve(self, ecosystem_id: int, *, day: date | None = None) -> dict | None:
+        with self._lease() as conn:
+            return _points_percentiles.points_percentile_curve(conn, ecosystem_id, day=day)
+
+    def points_percentile(self, ecosystem_id: int, points: int, *, day: date | None = None) -> float | None:
+        with self._lease() as conn:
+            return _points_percentiles.points_percentile(conn, ecosystem_id, points, day=day)
+
+    # --- Rank diff ---
+    def refresh_contribution_rank_days(self) -> dict:
+        with self._lease() as conn:
+            result = _rank_diff.refresh_contribution_rank_days(conn)
+            self._data_changed()
+            return result
+
+    def contribution_rank_diff(
+        self,
+        ecosystem_id: int,
+        day_a: date,
+        day_b: date,
+        *,
+        categories: tuple[str, ...] | list[str] | None = None,
+        include_user_info: bool = True,
+        limit: int = 100,
+    ) -> dict:
+        with self._lease() as conn:
+            return _rank_diff.contribution_rank_diff(
+                conn,
+                ecosystem_id,
+                day_a,
+                day_b,
+                categories=categories,
+                include_user_info=include_user_info,
+                limit=limit,
+            )
+
+    def iter_contribution_rank_diff(
+        self,
+        ecosystem_id: int,
+        day_a: date,
+        day_b: date,
+        *,
+        categories: tuple[str, ...] | list[str] | None = None,
+        include_user_info: bool = True,
+        batch_size: int = 10_000,
+    ) -> Iterator[list[dict]]:
+        with self._lease() as conn:
+            yield from _rank_diff.iter_contribution_rank_diff(
+                conn,
+                ecosystem_id,
+                day_a,
+                day_b,
+                categories=categories,
+                include_user_info=include_user_info,
+                batch_size=batch_size,
+            )
+
+    # --- Developer index ---
+    def refresh_developer_ecosystems_index(self) -> dict:
+        with self._lease() as conn:
+            result = _developer_index.refresh_developer_ecosystems_index(conn)
+            self._data_changed()
+            return result
+
+    def developer_ecosystems(
+        self,
+        canonical_developer_id: int,
+        *,
+        limit: int | None = None,
+    ) -> list[dict]:
+        with self._lease() as conn:
+            return _developer_index.developer_ecosystems(
+                conn,
+                canonical_developer_id,
+                limit=limit,
+            )
+
+    # --- Churn ---
+    def refresh_commit_churn(self, *, max_workers: int = 4, full: bool = False) -> dict:
+        with self._lease() as conn:
+            result = _churn.refresh_commit_churn(conn, max_workers=max_workers, full=full)
+            self._data_changed()
+            return result
+
+    def ecosystem_churn_time_series(
+        self,
+        ecosystem_id: int,
+        *,
+        start_month: date | None = None,
+        end_month: date | None = None,
+    ) -> list[dict]:
+        with self._lease() as conn:
+            return _churn.ecosystem_churn_time_series(
+                conn,
+                ecosystem_id,
+                start_month=start_month,
+                end_month=end_month,
+            )
+
+    def ecosystem_repo_churn(
+        self,
+        ecosystem_id: int,
+        *,
+        start_month: date | None = None,
+        end_month: date | None = None,
+        limit: int = 20,
+    ) -> list[dict]:
+        with self._lease() as conn:
+            return _churn.ecosystem_repo_churn(
+                conn,
+                ecosystem_id,
+                start_month=start_month,
+                end_month=end_month,
+                limit=limit,
+            )
+
+    def developer_churn_time_series(
+        self,
+        canonical_developer_id: int,
+        *,
+        ecosystem_id: int | None = None,
+        start_month: date | None = None,
+        end_month: date | None = None,
+    ) -> list[dict]:
+        with self._lease() as conn:
+            return _churn.developer_churn_time_series(
+                conn,
+                canonical_developer_id,
+                ecosystem_id=ecosystem_id,
+                start_month=start_month,
+                end_month=end_month,
+            )
+
+    # --- Cohorts ---
+    def cohort_retention(
+        self,
+        ecosystem_id: int,
+        *,
+        start_month: date | None = None,
+        end_month: date | None = None,
+        max_offset: int = 24,
+    ) -> dict:
+        with self._lease() as conn:
+            from . import cohorts as _cohorts  # numpy; imported on first use
+
+            return _cohorts.cohort_retention(
+                conn,
+                ecosystem_id,
+                start_month=start_month,
+                end_month=end_month,
+                max_offset=max_offset,
+                data_version=self.data_version,
+            )
+
+    # --- Trending ---
+    def refresh_trending_ecosystems(
+        self,
+        *,
+        metrics: tuple[str, ...] | None = None,
+        windows: tuple[int, ...] | None = None,
+        history_days: int = 365,
+    ) -> dict:
+        with self._lease() as conn:
+            from . import trending as _trending  # numpy; imported on first use
+
+            result = _trending.refresh_trending_ecosystems(
+                conn,
+                metrics=metrics or _trending.TREND_METRICS,
+                windows=windows or _trending.DEFAULT_WINDOWS,
+                history_days=history_days,
+            )
+            self._data_changed()
+            return result
+
+    def trending_ecosystems(
+        self,
+        *,
+        window: int = 28,
+        metric: str = "all_devs",
+        limit: int = 20,
+        order_by: str = "z_score",
+        direction: str | None = None,
+        min_current: int = 0,
+    ) -> list[dict]:
+        with self._lease() as conn:
+            from . import trending as _trending  # numpy; imported on first use
+
+            return _trending.trending_ecosystems(
+                conn,
+                window=window,
+                metric=metric,
+                limit=limit,
+                order_by=order_by,
+                direction=direction,
+                min_current=min_current,
+            )
+
+    # --- Geography ---
+    def refresh_ecosystem_geo(self, *, cell_degrees: float = 1.0) -> dict:
+        with self._lease() as conn:
+            result = _geo.refresh_ecosystem_geo(conn, cell_degrees=cell_degrees)
+            self._data_changed()
+            return result
+
+    def ecosystem_developer_countries(self, ecosystem_id: int, *, limit: int | None = None) -> list[dict]:
+        with self._lease() as conn:
+            return _geo.ecosystem_developer_countries(conn, ecosystem_id, limit=limit)
+
+    def ecosystem_developer_regions(
+        self,
+        ecosystem_id: int,
+        *,
+        country: str | None = None,
+        limit: int | None = None,
+    ) -> list[dict]:
+        with self._lease() as conn:
+            return _geo.ecosystem_developer_regions(
+                conn,
+                ecosystem_id,
+                country=country,
+                limit=limit,
+            )
+
+    def ecosystem_developer_grid(self, ecosystem_id: int) -> list[dict]:
+        with self._lease() as conn:
+            return _geo.ecosystem_developer_grid(conn, ecosystem_id)
+
+    # --- Developer bitmaps ---
+    def build_developer_bitmaps(
+        self,
+        output_dir: str,
+        *,
+        windows: tuple[int, ...] | None = None,
+        as_of: date | None = None,
+    ) -> dict:
+        with self._lease() as conn:
+            from . import developer_bitmaps as _developer_bitmaps  # numpy; imported on first use
+
+            return _developer_bitmaps.build_developer_bitmaps(
+                conn,
+                output_dir,
+                windows=windows,
+                as_of=as_of,
+            )
+
+    @staticmethod
+    def open_developer_bitmaps(path: str, *, window: int = 90) -> "DeveloperBitmaps":
+        """Memory-map a bitmap store for ecosystem overlap / similarity queries (no connection needed)."""
+        from . import developer_bitmaps as _developer_bitmaps  # numpy; imported on first use
+
+        return _developer_bitmaps.DeveloperBitmaps(path, window=window)
+
+    # --- Activity index ---
+    def build_activity_index(self, output_dir: str, *, chunk_rows: int | None = None) -> dict:
+        with self._lease() as conn:
+            from . import activity_index as _activity_index  # numpy; imported on first use
+
+            return _activity_index.build_activity_index(
+                conn,
+                output_dir,
+                chunk_rows=chunk_rows or _activity_index.DEFAULT_CHUNK_ROWS,
+            )
+
+    @staticmethod
+    def open_activity_index(path: str) -> "ActivityIndex":
+        """Memory-map a prefix-sum index for date-range commit totals (no connection needed)."""
+        from . import activity_index as _activity_index  # numpy; imported on first use
+
+        return _activity_index.ActivityIndex(path)
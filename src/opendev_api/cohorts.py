@@ -0,0 +1,140 @@
+"""Monthly developer cohorts and retention for an ecosystem.
+
+A developer's cohort is the first month they were active in the ecosystem;
+they count as retained K months later if they have any activity in month
+cohort + K. DuckDB reduces ``eco_developer_activities`` to distinct
+(developer, month) pairs and the whole cohort x offset matrix is then built
+with a few NumPy passes (``np.unique``, ``np.minimum.at``, ``np.bincount``)
+instead of a self-join per cohort.
+
+Results are cached per (data_version, ecosystem, arguments); callers pass the
+client's ``data_version`` so a new snapshot never serves stale matrices. Every
+call gets its own copy of the cached lists, so callers may modify them.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from datetime import date
+
+import numpy as np
+
+from .instrumentation import record_query
+from .partitioned import ecosystem_rows
+
+CACHE_SIZE = 64
+
+_cache: OrderedDict = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def _month_index(d: date) -> int:
+    return d.year * 12 + d.month - 1
+
+
+def _month_date(index: int) -> date:
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _copy(result: dict) -> dict:
+    # Dates and numbers are immutable; only the (nested) lists need copying.
+    return {
+        **result,
+        "cohorts": list(result["cohorts"]),
+        "sizes": list(result["sizes"]),
+        "active": [list(row) for row in result["active"]],
+        "retention": [list(row) for row in result["retention"]],
+    }
+
+
+def _compute(
+    conn,
+    ecosystem_id: int,
+    start_month: date | None,
+    end_month: date | None,
+    max_offset: int,
+) -> dict:
+    query = f"""
+        SELECT DISTINCT canonical_developer_id, CAST(year(day) * 12 + month(day) - 1 AS INTEGER) AS m
+        FROM {ecosystem_rows(conn, "eco_developer_activities")}
+    """
+    start = time.perf_counter()
+    data = conn.execute(query, [ecosystem_id]).fetchnumpy()
+    devs = np.asarray(data["canonical_developer_id"])
+    months = np.asarray(data["m"], dtype=np.int64)
+    record_query(conn, query, [ecosystem_id], (time.perf_counter() - start) * 1000, len(months))
+    empty = {"ecosystem_id": ecosystem_id, "cohorts": [], "sizes": [], "active": [], "retention": []}
+    if not len(months):
+        return empty
+
+    _, dev_idx = np.unique(devs, return_inverse=True)
+    first = np.full(dev_idx.max() + 1, np.iinfo(np.int64).max, dtype=np.int64)
+    np.minimum.at(first, dev_idx, months)
+    cohort = first[dev_idx]
+    offset = months - cohort
+
+    lo = cohort.min() if start_month is None else max(cohort.min(), _month_index(start_month))
+    hi = cohort.max() if end_month is None else min(cohort.max(), _month_index(end_month))
+    if lo > hi:
+        return empty
+    keep = (cohort >= lo) & (cohort <= hi) & (offset <= max_offset)
+    width = max_offset + 1
+    n = hi - lo + 1
+    active = np.bincount(
+        (cohort[keep] - lo) * width + offset[keep], minlength=n * width
+    ).reshape(n, width)
+    sizes = active[:, 0]
+
+    # Cells after the last month with data are unknown, not zero retention.
+    last = months.max()
+    observed = (np.arange(lo, hi + 1)[:, None] + np.arange(width)[None, :]) <= last
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rates = np.where(observed & (sizes[:, None] > 0), active / sizes[:, None], np.nan)
+    return {
+        "ecosystem_id": ecosystem_id,
+        "cohorts": [_month_date(m) for m in range(lo, hi + 1)],
+        "sizes": sizes.tolist(),
+        "active": np.where(observed, active, -1).tolist(),
+        "retention": [[None if np.isnan(v) else round(float(v), 6) for v in row] for row in rates],
+    }
+
+
+def cohort_retention(
+    conn,
+    ecosystem_id: int,
+    *,
+    start_month: date | None = None,
+    end_month: date | None = None,
+    max_offset: int = 24,
+    data_version: str | None = None,
+) -> dict:
+    """Cohort retention matrix for an ecosystem.
+
+    Returns ``cohorts`` (first-active months between start_month and end_month),
+    their ``sizes``, and per cohort and offset 0..max_offset the ``active``
+    developer counts (-1 when the month is past the data) and ``retention``
+    fractions (None when unknown). Cached per data_version when one is given;
+    the returned dict is a fresh copy either way.
+    """
+    if max_offset < 0:
+        raise ValueError("max_offset must be >= 0")
+    if data_version is None:
+        return _compute(conn, ecosystem_id, start_month, end_month, max_offset)
+    key = (data_version, ecosystem_id, start_month, end_month, max_offset)
+    with _cache_lock:
+        if key in _cache:
+            _cache.move_to_end(key)
+            return _copy(_cache[key])
+    result = _compute(conn, ecosystem_id, start_month, end_month, max_offset)
+    with _cache_lock:
+        _cache[key] = result
+        while len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
+    return _copy(result)
+
+
+def clear_cache(data_version: str | None = None) -> None:
+    """Drop cached matrices (only those of data_version when given)."""
+    with _cache_lock:
+        for key in [k for k in _cache if data_version is None or k[0] == data_version]:
+            del _cache[key]
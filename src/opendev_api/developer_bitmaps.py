@@ -0,0 +1,278 @@
+"""Compressed per-ecosystem developer-set bitmaps for overlap and similarity queries.
+
+For each activity window (e.g. developers active in the last 90 days) every
+ecosystem's set of ``canonical_developer_id`` values is stored roaring-style:
+ids are split by their high 16 bits into containers, and each container is
+either a sorted ``uint16`` array (up to 4096 ids) or a 65536-bit bitmap.
+All containers of a window live in a handful of ``.npy`` files that are opened
+with ``mmap_mode="r"``, so loading a store is instant and only touched pages
+are read.
+
+Containers are ordered by (high bits, ecosystem): all containers sharing a key
+are contiguous, which lets ``top_similar`` intersect one ecosystem against
+every other ecosystem with a few vectorized NumPy operations per key instead
+of one self-join per pair.
+
+On-disk layout::
+
+    <dir>/meta.json
+    <dir>/window_<N>d/{ecosystem_ids,cardinalities,eco_offsets,eco_containers,
+                       container_keys,container_ecos,container_cards,container_kinds,
+                       container_offsets,array_data,bitmap_data}.npy
+"""
+
+import json
+import os
+from datetime import date, timedelta
+
+import numpy as np
+
+from ._db_utils import run_statement
+
+FORMAT_VERSION = 1
+META_FILENAME = "meta.json"
+DEFAULT_WINDOWS = (28, 90, 365)
+ARRAY_CONTAINER_MAX = 4096
+_ARRAY, _BITMAP = 0, 1
+_WORDS = 1024  # 65536 bits per bitmap container
+
+
+def _window_dir(path: str, window: int) -> str:
+    return os.path.join(path, f"window_{window}d")
+
+
+def _encode(eco: np.ndarray, dev: np.ndarray) -> dict[str, np.ndarray]:
+    """Build the container arrays from (ecosystem, developer) pairs sorted by ecosystem, developer."""
+    ecosystem_ids, eco_idx = np.unique(eco, return_inverse=True)
+    cardinalities = np.bincount(eco_idx, minlength=len(ecosystem_ids)).astype(np.int64)
+    dev = dev.astype(np.uint32)
+    keys = (dev >> 16).astype(np.uint16)
+    lows = (dev & 0xFFFF).astype(np.uint16)
+
+    # One container per distinct (key, ecosystem); stable sort keeps developer order inside each.
+    order = np.lexsort((eco_idx, keys))
+    keys, eco_idx, lows = keys[order], eco_idx[order], lows[order]
+    if len(keys):
+        boundary = np.flatnonzero((np.diff(keys) != 0) | (np.diff(eco_idx) != 0)) + 1
+        starts = np.concatenate(([0], boundary))
+    else:
+        starts = np.zeros(0, dtype=np.int64)
+    ends = np.concatenate((starts[1:], [len(keys)])).astype(np.int64)
+    cards = (ends - starts).astype(np.uint32)
+    kinds = np.where(cards > ARRAY_CONTAINER_MAX, _BITMAP, _ARRAY).astype(np.uint8)
+
+    is_array_row = np.repeat(kinds == _ARRAY, cards)
+    array_data = lows[is_array_row]
+    offsets = np.zeros(len(starts), dtype=np.int64)
+    array_cards = np.where(kinds == _ARRAY, cards, 0).astype(np.int64)
+    offsets[kinds == _ARRAY] = (np.cumsum(array_cards) - array_cards)[kinds == _ARRAY]
+
+    bitmap_ids = np.flatnonzero(kinds == _BITMAP)
+    bitmap_data = np.zeros((len(bitmap_ids), _WORDS), dtype=np.uint64)
+    for row, c in enumerate(bitmap_ids):
+        values = lows[starts[c]:ends[c]].astype(np.uint64)
+        np.bitwise_or.at(bitmap_data[row], (values >> np.uint64(6)).astype(np.int64), np.uint64(1) << (values & np.uint64(63)))
+        offsets[c] = row
+
+    container_ecos = eco_idx[starts].astype(np.int32) if len(starts) else np.zeros(0, dtype=np.int32)
+    eco_containers = np.lexsort((keys[starts] if len(starts) else np.zeros(0), container_ecos)).astype(np.int64)
+    eco_offsets = np.concatenate(([0], np.cumsum(np.bincount(container_ecos, minlength=len(ecosystem_ids))))).astype(np.int64)
+    return {
+        "ecosystem_ids": ecosystem_ids.astype(np.int64),
+        "cardinalities": cardinalities,
+        "eco_offsets": eco_offsets,
+        "eco_containers": eco_containers,
+        "container_keys": keys[starts] if len(starts) else np.zeros(0, dtype=np.uint16),
+        "container_ecos": container_ecos,
+        "container_cards": cards,
+        "container_kinds": kinds,
+        "container_offsets": offsets,
+        "array_data": array_data,
+        "bitmap_data": bitmap_data,
+    }
+
+
+def build_developer_bitmaps(
+    conn,
+    output_dir: str,
+    *,
+    windows: tuple[int, ...] | None = None,
+    as_of: date | None = None,
+) -> dict:
+    """Write one bitmap store per window (developers active in the last N days up to as_of).
+
+    windows defaults to DEFAULT_WINDOWS and as_of to the latest day in
+    eco_developer_activities. Returns the metadata written.
+    """
+    if windows is None:
+        windows = DEFAULT_WINDOWS
+    if not windows or any(w < 1 for w in windows):
+        raise ValueError("windows must be positive day counts")
+    if as_of is None:
+        as_of = run_statement(conn, "SELECT max(day) FROM eco_developer_activities")[0][0]
+        if as_of is None:
+            raise ValueError("eco_developer_activities is empty")
+    os.makedirs(output_dir, exist_ok=True)
+    meta = {"format_version": FORMAT_VERSION, "as_of": as_of.isoformat(), "windows": {}}
+    for window in sorted(set(windows)):
+        data = conn.execute("""
+            SELECT DISTINCT ecosystem_id, canonical_developer_id
+            FROM eco_developer_activities
+            WHERE day > ? AND day <= ? AND canonical_developer_id >= 0
+            ORDER BY ecosystem_id, canonical_developer_id
+        """, [as_of - timedelta(days=window), as_of]).fetchnumpy()
+        arrays = _encode(np.asarray(data["ecosystem_id"]), np.asarray(data["canonical_developer_id"]))
+        wdir = _window_dir(output_dir, window)
+        os.makedirs(wdir, exist_ok=True)
+        for name, arr in arrays.items():
+            np.save(os.path.join(wdir, f"{name}.npy"), arr)
+        meta["windows"][str(window)] = {
+            "ecosystems": int(len(arrays["ecosystem_ids"])),
+            "containers": int(len(arrays["container_keys"])),
+            "bitmap_containers": int(len(arrays["bitmap_data"])),
+            "developer_memberships": int(arrays["cardinalities"].sum()),
+        }
+    with open(os.path.join(output_dir, META_FILENAME), "w") as f:
+        json.dump(meta, f, indent=2)
+    return meta
+
+
+class DeveloperBitmaps:
+    """Memory-mapped developer sets for one window of a store written by build_developer_bitmaps."""
+
+    def __init__(self, path: str, window: int = 90):
+        meta_path = os.path.join(path, META_FILENAME)
+        if not os.path.isfile(meta_path):
+            raise FileNotFoundError(f"No {META_FILENAME} in {path}")
+        with open(meta_path) as f:
+            self.meta = json.load(f)
+        if str(window) not in self.meta["windows"]:
+            raise ValueError(f"Window {window} not built; available: {', '.join(self.meta['windows'])}")
+        self.window = window
+        self.as_of = date.fromisoformat(self.meta["as_of"])
+        wdir = _window_dir(path, window)
+        for name in (
+            "ecosystem_ids", "cardinalities", "eco_offsets", "eco_containers", "container_keys",
+            "container_ecos", "container_cards", "container_kinds", "container_offsets",
+            "array_data", "bitmap_data",
+        ):
+            setattr(self, f"_{name}", np.load(os.path.join(wdir, f"{name}.npy"), mmap_mode="r"))
+        # Containers are sorted by key: [key_starts[i], key_starts[i + 1]) share key unique_keys[i].
+        self._unique_keys, self._key_starts = np.unique(self._container_keys, return_index=True)
+        self._key_starts = np.append(self._key_starts, len(self._container_keys))
+
+    def _index(self, ecosystem_id: int) -> int | None:
+        i = int(np.searchsorted(self._ecosystem_ids, ecosystem_id))
+        if i < len(self._ecosystem_ids) and self._ecosystem_ids[i] == ecosystem_id:
+            return i
+        return None
+
+    def _containers(self, idx: int) -> np.ndarray:
+        return self._eco_containers[self._eco_offsets[idx]:self._eco_offsets[idx + 1]]
+
+    def _dense(self, c: int) -> np.ndarray:
+        """Container c as a 65536-entry boolean mask."""
+        if self._container_kinds[c] == _BITMAP:
+            words = np.ascontiguousarray(self._bitmap_data[self._container_offsets[c]])
+            return np.unpackbits(words.view(np.uint8), bitorder="little").astype(bool)
+        mask = np.zeros(1 << 16, dtype=bool)
+        start = self._container_offsets[c]
+        mask[self._array_data[start:start + self._container_cards[c]]] = True
+        return mask
+
+    def ecosystems(self) -> list[int]:
+        """Ecosystem ids with at least one active developer in the window."""
+        return [int(e) for e in self._ecosystem_ids]
+
+    def cardinality(self, ecosystem_id: int) -> int:
+        idx = self._index(ecosystem_id)
+        return 0 if idx is None else int(self._cardinalities[idx])
+
+    def developers(self, ecosystem_id: int) -> np.ndarray:
+        """Sorted developer ids of an ecosystem (decoded from its containers)."""
+        idx = self._index(ecosystem_id)
+        if idx is None:
+            return np.zeros(0, dtype=np.uint32)
+        parts = []
+        for c in self._containers(idx):
+            high = np.uint32(self._container_keys[c]) << np.uint32(16)
+            parts.append(high | np.flatnonzero(self._dense(c)).astype(np.uint32))
+        return np.concatenate(parts) if parts else np.zeros(0, dtype=np.uint32)
+
+    def _intersection_all(self, idx: int) -> np.ndarray:
+        """Intersection size of ecosystem idx with every ecosystem (vectorized per container key)."""
+        inter = np.zeros(len(self._ecosystem_ids), dtype=np.int64)
+        for c in self._containers(idx):
+            dense = self._dense(c)
+            k = int(np.searchsorted(self._unique_keys, self._container_keys[c]))
+            lo, hi = int(self._key_starts[k]), int(self._key_starts[k + 1])
+            kinds = np.asarray(self._container_kinds[lo:hi])
+            ecos = np.asarray(self._container_ecos[lo:hi])
+            offsets = np.asarray(self._container_offsets[lo:hi])
+
+            arr = np.flatnonzero(kinds == _ARRAY)
+            if len(arr):
+                cards = np.asarray(self._container_cards[lo:hi])[arr].astype(np.int64)
+                data_lo = int(offsets[arr[0]])
+                data_hi = int(offsets[arr[-1]] + cards[-1])
+                hits = dense[self._array_data[data_lo:data_hi]]
+                counts = np.add.reduceat(hits.astype(np.int64), offsets[arr] - data_lo)
+                np.add.at(inter, ecos[arr], counts)
+
+            bmp = np.flatnonzero(kinds == _BITMAP)
+            if len(bmp):
+                words = np.packbits(dense, bitorder="little").view(np.uint64)
+                rows = self._bitmap_data[offsets[bmp]]
+                np.add.at(inter, ecos[bmp], np.bitwise_count(rows & words).sum(axis=1).astype(np.int64))
+        return inter
+
+    def overlap(self, ecosystem_a: int, ecosystem_b: int) -> dict:
+        """Shared developers, set sizes and Jaccard similarity for two ecosystems."""
+        a, b = self._index(ecosystem_a), self._index(ecosystem_b)
+        size_a = 0 if a is None else int(self._cardinalities[a])
+        size_b = 0 if b is None else int(self._cardinalities[b])
+        shared = 0
+        if a is not None and b is not None:
+            b_containers = self._containers(b)
+            b_keys = self._container_keys[b_containers]
+            for c in self._containers(a):
+                j = int(np.searchsorted(b_keys, self._container_keys[c]))
+                if j < len(b_keys) and b_keys[j] == self._container_keys[c]:
+                    shared += int(np.count_nonzero(self._dense(c) & self._dense(int(b_containers[j]))))
+        union = size_a + size_b - shared
+        return {
+            "ecosystem_a": ecosystem_a,
+            "ecosystem_b": ecosystem_b,
+            "window_days": self.window,
+            "developers_a": size_a,
+            "developers_b": size_b,
+            "shared_developers": shared,
+            "jaccard": shared / union if union else 0.0,
+        }
+
+    def jaccard(self, ecosystem_a: int, ecosystem_b: int) -> float:
+        return self.overlap(ecosystem_a, ecosystem_b)["jaccard"]
+
+    def top_similar(self, ecosystem_id: int, *, k: int = 10, min_shared: int = 1) -> list[dict]:
+        """The k ecosystems with the highest Jaccard similarity to ecosystem_id."""
+        idx = self._index(ecosystem_id)
+        if idx is None:
+            return []
+        inter = self._intersection_all(idx)
+        union = self._cardinalities + self._cardinalities[idx] - inter
+        jaccard = np.where(union > 0, inter / np.maximum(union, 1), 0.0)
+        jaccard[idx] = -1.0
+        jaccard[inter < min_shared] = -1.0
+        candidates = np.flatnonzero(jaccard >= 0)
+        if len(candidates) > k:
+            candidates = candidates[np.argpartition(-jaccard[candidates], k - 1)[:k]]
+        candidates = candidates[np.lexsort((self._ecosystem_ids[candidates], -jaccard[candidates]))]
+        return [
+            {
+                "ecosystem_id": int(self._ecosystem_ids[i]),
+                "shared_developers": int(inter[i]),
+                "developers": int(self._cardinalities[i]),
+                "jaccard": float(jaccard[i]),
+            }
+            for i in candidates
+        ]
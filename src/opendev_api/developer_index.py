@@ -0,0 +1,141 @@
+"""Developer-keyed index of ecosystem membership (cross-ecosystem footprint).
+
+The eco developer tables are clustered by ``ecosystem_id``, so "which
+ecosystems does developer X work in" would scan all of them.
+``developer_ecosystems_index`` stores one row per (developer, ecosystem) with
+first/last active day, active days, total commits and the current contribution
+rank, i.e. the rank on the ecosystem's newest rank day (NULL for developers
+who are not ranked that day). ``refresh_developer_ecosystems_index`` folds in
+only the source days newer than the stored watermarks, so it can run after
+every data load.
+"""
+
+from ._db_utils import (
+    derived_table_hint,
+    fetch_all_dicts,
+    get_refresh_watermark,
+    run_statement,
+    set_refresh_watermark,
+)
+
+INDEX_TABLE = "developer_ecosystems_index"
+_ACTIVITY_WATERMARK = f"{INDEX_TABLE}.activities"
+_RANK_WATERMARK = f"{INDEX_TABLE}.contribution_ranks"
+
+
+def _create_index_table(conn) -> None:
+    run_statement(conn, f"""
+        CREATE TABLE IF NOT EXISTS {INDEX_TABLE} (
+            canonical_developer_id INTEGER,
+            ecosystem_id INTEGER,
+            first_active_day DATE,
+            last_active_day DATE,
+            active_days BIGINT,
+            total_commits HUGEINT,
+            rank_day DATE,
+            contribution_rank VARCHAR,
+            points UTINYINT,
+            PRIMARY KEY (canonical_developer_id, ecosystem_id)
+        )
+    """)
+    # Older builds also indexed canonical_developer_id, the primary key's leading
+    # column; lookups plan the same without it, so drop it rather than maintain it on upserts.
+    run_statement(conn, f"DROP INDEX IF EXISTS {INDEX_TABLE}_dev_idx")
+
+
+def refresh_developer_ecosystems_index(conn) -> dict:
+    """Build or incrementally update developer_ecosystems_index; returns rows folded in.
+
+    Activity and rank rows with a day after the stored watermark are aggregated
+    per (developer, ecosystem) and upserted; the first run processes everything.
+    Ranks older than their ecosystem's newest rank day are then cleared, so a
+    developer who dropped out of the ranks has no current rank.
+    """
+    _create_index_table(conn)
+    old_activity = get_refresh_watermark(conn, _ACTIVITY_WATERMARK)
+    old_rank = get_refresh_watermark(conn, _RANK_WATERMARK)
+    new_activity = run_statement(conn, "SELECT max(day) FROM eco_developer_activities")[0][0]
+    new_rank = run_statement(conn, "SELECT max(day) FROM eco_developer_contribution_ranks")[0][0]
+
+    conn.execute("BEGIN TRANSACTION")
+    try:
+        activity_rows = 0
+        if new_activity is not None and (old_activity is None or new_activity > old_activity):
+            activity_rows = run_statement(conn, f"""
+                INSERT INTO {INDEX_TABLE}
+                    (canonical_developer_id, ecosystem_id, first_active_day, last_active_day,
+                     active_days, total_commits)
+                SELECT canonical_developer_id, ecosystem_id, min(day), max(day), count(*), sum(num_commits)
+                FROM eco_developer_activities
+                WHERE day > coalesce(?::DATE, DATE '0001-01-01') AND day <= ?
+                GROUP BY canonical_developer_id, ecosystem_id
+                ORDER BY canonical_developer_id, ecosystem_id
+                ON CONFLICT (canonical_developer_id, ecosystem_id) DO UPDATE SET
+                    first_active_day = least(coalesce(first_active_day, excluded.first_active_day), excluded.first_active_day),
+                    last_active_day = greatest(coalesce(last_active_day, excluded.last_active_day), excluded.last_active_day),
+                    active_days = coalesce(active_days, 0) + excluded.active_days,
+                    total_commits = coalesce(total_commits, 0) + excluded.total_commits
+            """, [old_activity, new_activity])[0][0]
+            set_refresh_watermark(conn, _ACTIVITY_WATERMARK, new_activity)
+
+        rank_rows = cleared_rank_rows = 0
+        if new_rank is not None and (old_rank is None or new_rank > old_rank):
+            rank_rows = run_statement(conn, f"""
+                INSERT INTO {INDEX_TABLE}
+                    (canonical_developer_id, ecosystem_id, rank_day, contribution_rank, points)
+                SELECT canonical_developer_id, ecosystem_id,
+                       max(day), arg_max(contribution_rank, day), arg_max(points, day)
+                FROM eco_developer_contribution_ranks
+                WHERE day > coalesce(?::DATE, DATE '0001-01-01') AND day <= ?
+                GROUP BY canonical_developer_id, ecosystem_id
+                ORDER BY canonical_developer_id, ecosystem_id
+                ON CONFLICT (canonical_developer_id, ecosystem_id) DO UPDATE SET
+                    rank_day = excluded.rank_day,
+                    contribution_rank = excluded.contribution_rank,
+                    points = excluded.points
+            """, [old_rank, new_rank])[0][0]
+            # Only ecosystems with new rank days can have gone stale.
+            cleared_rank_rows = run_statement(conn, f"""
+                UPDATE {INDEX_TABLE} SET rank_day = NULL, contribution_rank = NULL, points = NULL
+                FROM (
+                    SELECT ecosystem_id, max(day) AS latest
+                    FROM eco_developer_contribution_ranks
+                    WHERE day > coalesce(?::DATE, DATE '0001-01-01') AND day <= ?
+                    GROUP BY ecosystem_id
+                ) l
+                WHERE {INDEX_TABLE}.ecosystem_id = l.ecosystem_id AND {INDEX_TABLE}.rank_day < l.latest
+            """, [old_rank, new_rank])[0][0]
+            set_refresh_watermark(conn, _RANK_WATERMARK, new_rank)
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+    return {
+        "activity_rows": activity_rows,
+        "rank_rows": rank_rows,
+        "cleared_rank_rows": cleared_rank_rows,
+        "activities_watermark": new_activity,
+        "contribution_ranks_watermark": new_rank,
+    }
+
+
+def developer_ecosystems(conn, canonical_developer_id: int, *, limit: int | None = None) -> list[dict]:
+    """Ecosystems a developer has been active or ranked in, most commits first."""
+    params: list = [canonical_developer_id]
+    limit_sql = ""
+    if limit is not None:
+        limit_sql = "LIMIT ?"
+        params.append(limit)
+    query = f"""
+        SELECT d.ecosystem_id, e.name AS ecosystem_name,
+               d.first_active_day, d.last_active_day, d.active_days,
+               coalesce(d.total_commits, 0) AS total_commits,
+               d.rank_day, d.contribution_rank, d.points
+        FROM {INDEX_TABLE} d
+        LEFT JOIN ecosystems e ON e.id = d.ecosystem_id
+        WHERE d.canonical_developer_id = ?
+        ORDER BY total_commits DESC, d.last_active_day DESC NULLS LAST, d.ecosystem_id
+        {limit_sql}
+    """
+    with derived_table_hint(INDEX_TABLE, "refresh_developer_ecosystems_index"):
+        return fetch_all_dicts(conn, query, params)
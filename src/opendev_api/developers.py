@@ -1,9 +1,18 @@
 """Developer read API for dashboard: list in ecosystem, profile, activity, tenure, search."""
 
+import time
+from collections.abc import Iterator
 from datetime import date
 from typing import Any
 
-from ._db_utils import fetch_all_dicts, fetch_one_dict
+import duckdb
+
+from ._db_utils import derived_table_hint, fetch_all_dicts, fetch_one_dict
+from .developer_index import INDEX_TABLE
+from .instrumentation import record_query
+from .partitioned import ecosystem_rows
+from .points_percentiles import PERCENTILE_TABLE, percentile_expr
+from .tenures import LATEST_TENURE_TABLE
 
 
 def developers_in_ecosystem(
@@ -13,26 +22,40 @@ def developers_in_ecosystem(
     day: date | None = None,
     contribution_rank: str | None = None,
     include_user_info: bool = True,
+    include_tenure: bool = False,
+    include_percentile: bool = False,
     limit: int = 50,
     offset: int = 0,
 ) -> list[dict]:
-    """List developers in an ecosystem from contribution_ranks; optionally join user_info."""
-    params: list[Any] = [ecosystem_id]
-    where = "ecr.ecosystem_id = ?"
-    if day is not None:
-        where += " AND ecr.day = ?"
-        params.append(day)
-    if contribution_rank is not None:
-        where += " AND ecr.contribution_rank = ?"
-        params.append(contribution_rank)
+    """List developers in an ecosystem from contribution_ranks; optionally join user_info.
+
+    include_tenure adds each developer's latest ``tenure_days`` and
+    ``tenure_category`` from eco_developer_latest_tenures (see refresh_latest_tenures).
+    That table only holds the newest tenure, so include_tenure raises ValueError
+    together with an explicit day. include_percentile adds ``points_percentile``, the share (0-100) of the
+    ecosystem's developers ranked that day with at most as many points, from
+    eco_points_percentiles (see refresh_points_percentiles).
+    """
+    if include_tenure and day is not None:
+        raise ValueError("include_tenure returns the latest tenure and cannot be combined with day")
+    ranks = ecosystem_rows(conn, "eco_developer_contribution_ranks")
+    extra_cols = extra_joins = ""
+    if include_tenure:
+        extra_cols += ", t.tenure_days, t.category AS tenure_category"
+        extra_joins += (
+            f"LEFT JOIN {LATEST_TENURE_TABLE} t "
+            "ON t.ecosystem_id = ecr.ecosystem_id AND t.canonical_developer_id = ecr.canonical_developer_id\n"
+        )
+    if include_percentile:
+        extra_cols += f", {percentile_expr('pp', 'ecr.points')} AS points_percentile"
+        extra_joins += f"LEFT JOIN {PERCENTILE_TABLE} pp ON pp.ecosystem_id = ecr.ecosystem_id AND pp.day = ecr.day\n"
 
     # Use latest day per ecosystem if day not specified
     if day is None:
-        sub = """
+        sub = f"""
             SELECT ecosystem_id, canonical_developer_id, day, points, points_28d, points_56d, contribution_rank
-            FROM eco_developer_contribution_ranks ecr
-            WHERE ecr.ecosystem_id = ?
-            AND ecr.day = (SELECT max(day) FROM eco_developer_contribution_ranks WHERE ecosystem_id = ?)
+            FROM {ranks} ecr
+            WHERE ecr.day = (SELECT max(day) FROM {ranks})
         """
         if contribution_rank:
             sub += " AND ecr.contribution_rank = ?"
@@ -44,23 +67,42 @@ def developers_in_ecosystem(
         if include_user_info:
             query = f"""
                 SELECT ecr.canonical_developer_id, ecr.day, ecr.points, ecr.points_28d, ecr.points_56d, ecr.contribution_rank,
-                       u.login, u.name, u.company, u.location, u.url, u.email
+                       u.login, u.name, u.company, u.location, u.url, u.email{extra_cols}
                 FROM ({sub}) ecr
                 LEFT JOIN user_info u ON u.canonical_developer_id = ecr.canonical_developer_id
+                {extra_joins}
+                ORDER BY ecr.points DESC NULLS LAST, ecr.canonical_developer_id
+            """
+        elif extra_cols:
+            query = f"""
+                SELECT ecr.*{extra_cols}
+                FROM ({sub}) ecr
+                {extra_joins}
+                ORDER BY ecr.points DESC NULLS LAST, ecr.canonical_developer_id
             """
         else:
             query = sub
-        return fetch_all_dicts(conn, query, params_sub)
+        with derived_table_hint(LATEST_TENURE_TABLE, "refresh_latest_tenures"), \
+                derived_table_hint(PERCENTILE_TABLE, "refresh_points_percentiles"):
+            return fetch_all_dicts(conn, query, params_sub)
     else:
+        params: list[Any] = [ecosystem_id, day]
+        where = "ecr.day = ?"
+        if contribution_rank is not None:
+            where += " AND ecr.contribution_rank = ?"
+            params.append(contribution_rank)
         query = f"""
-            SELECT ecr.canonical_developer_id, ecr.day, ecr.points, ecr.points_28d, ecr.points_56d, ecr.contribution_rank
-            FROM eco_developer_contribution_ranks ecr
+            SELECT ecr.canonical_developer_id, ecr.day, ecr.points, ecr.points_28d, ecr.points_56d, ecr.contribution_rank{extra_cols}
+            FROM {ranks} ecr
+            {extra_joins}
             WHERE {where}
             ORDER BY ecr.points DESC NULLS LAST
             LIMIT ? OFFSET ?
         """
         params.extend([limit, offset])
-        rows = fetch_all_dicts(conn, query, params)
+        with derived_table_hint(LATEST_TENURE_TABLE, "refresh_latest_tenures"), \
+                derived_table_hint(PERCENTILE_TABLE, "refresh_points_percentiles"):
+            rows = fetch_all_dicts(conn, query, params)
         if include_user_info and rows:
             ids = [r["canonical_developer_id"] for r in rows]
             placeholders = ",".join("?" * len(ids))
@@ -81,13 +123,90 @@ def developers_in_ecosystem(
         return rows
 
 
+def _ecosystem_developers_query(
+    conn,
+    ecosystem_id: int,
+    day: date | None,
+    contribution_rank: str | None,
+    include_user_info: bool,
+) -> tuple[str, list[Any]]:
+    """Unpaginated developers_in_ecosystem query (latest day when day is None), best first."""
+    ranks = ecosystem_rows(conn, "eco_developer_contribution_ranks")
+    params: list[Any] = [ecosystem_id]
+    if day is None:
+        day_sql = f"(SELECT max(day) FROM {ranks})"
+        params.append(ecosystem_id)
+    else:
+        day_sql = "?"
+        params.append(day)
+    where = f"ecr.day = {day_sql}"
+    if contribution_rank is not None:
+        where += " AND ecr.contribution_rank = ?"
+        params.append(contribution_rank)
+    user_cols = ", u.login, u.name, u.company, u.location, u.url, u.email" if include_user_info else ""
+    user_join = (
+        "LEFT JOIN user_info u ON u.canonical_developer_id = ecr.canonical_developer_id"
+        if include_user_info else ""
+    )
+    query = f"""
+        SELECT ecr.canonical_developer_id, ecr.day, ecr.points, ecr.points_28d, ecr.points_56d,
+               ecr.contribution_rank{user_cols}
+        FROM {ranks} ecr
+        {user_join}
+        WHERE {where}
+        ORDER BY ecr.points DESC NULLS LAST, ecr.canonical_developer_id
+    """
+    return query, params
+
+
+def iter_developers_in_ecosystem(
+    conn,
+    ecosystem_id: int,
+    *,
+    day: date | None = None,
+    contribution_rank: str | None = None,
+    include_user_info: bool = True,
+    batch_size: int = 10_000,
+) -> Iterator[list[dict]]:
+    """Yield every developer of an ecosystem in batches of up to batch_size dicts.
+
+    Same rows and order as developers_in_ecosystem without limit/offset. The
+    query runs on its own cursor, so conn stays usable while the generator is
+    being consumed; only one batch is held in memory at a time.
+    """
+    if batch_size < 1:
+        raise ValueError("batch_size must be >= 1")
+    query, params = _ecosystem_developers_query(conn, ecosystem_id, day, contribution_rank, include_user_info)
+    start = time.perf_counter()
+    total = 0
+    cursor = conn.cursor()
+    try:
+        result = cursor.execute(query, params)
+        cols = [d[0] for d in result.description]
+        while True:
+            rows = result.fetchmany(batch_size)
+            if not rows:
+                break
+            total += len(rows)
+            yield [dict(zip(cols, row)) for row in rows]
+    finally:
+        cursor.close()
+        record_query(conn, query, params, (time.perf_counter() - start) * 1000, total)
+
+
 def get_developer_profile(
     conn,
     canonical_developer_id: int,
     *,
     include_location: bool = False,
+    ecosystem_id: int | None = None,
 ) -> dict | None:
-    """Get developer profile from user_info; optionally include canonical_developer_locations."""
+    """Get developer profile from user_info; optionally include canonical_developer_locations.
+
+    With ecosystem_id, adds ``points_percentile``: the developer's latest
+    ranked ``day`` and ``points`` there and their ``percentile`` (0-100, see
+    developers_in_ecosystem), or None if never ranked in it.
+    """
     row = fetch_one_dict(
         conn,
         "SELECT canonical_developer_id, login, name, company, location, url, email, primary_github_user_id "
@@ -104,6 +223,229 @@ def get_developer_profile(
             [canonical_developer_id],
         )
         row["locations"] = locs
+    if ecosystem_id is not None:
+        query = f"""
+            SELECT ecr.day, ecr.points, {percentile_expr('pp', 'ecr.points')} AS percentile
+            FROM (
+                SELECT ecosystem_id, day, points
+                FROM {ecosystem_rows(conn, "eco_developer_contribution_ranks")}
+                WHERE canonical_developer_id = ?
+                ORDER BY day DESC
+                LIMIT 1
+            ) ecr
+            LEFT JOIN {PERCENTILE_TABLE} pp ON pp.ecosystem_id = ecr.ecosystem_id AND pp.day = ecr.day
+        """
+        with derived_table_hint(PERCENTILE_TABLE, "refresh_points_percentiles"):
+            row["points_percentile"] = fetch_one_dict(conn, query, [ecosystem_id, canonical_developer_id])
+    return row
+
+
+# Lookup key -> (SQL type of the input list, user_info expression it is matched against).
+# Key type and join from the unnested keys k to canonical_developers c and user_info u.
+_PROFILE_KEYS = {
+    "ids": (
+        "INTEGER",
+        "JOIN canonical_developers c ON c.id = k.key "
+        "LEFT JOIN user_info u ON u.canonical_developer_id = c.id",
+    ),
+    # Logins are only known from user_info.
+    "logins": (
+        "VARCHAR",
+        "JOIN user_info u ON lower(u.login) = lower(k.key) "
+        "JOIN canonical_developers c ON c.id = u.canonical_developer_id",
+    ),
+    "github_node_ids": (
+        "VARCHAR",
+        "JOIN canonical_developers c ON c.primary_github_user_id = k.key "
+        "LEFT JOIN user_info u ON u.canonical_developer_id = c.id",
+    ),
+}
+
+
+def get_developer_profiles(
+    conn,
+    *,
+    ids: list[int] | None = None,
+    logins: list[str] | None = None,
+    github_node_ids: list[str] | None = None,
+    include_location: bool = False,
+) -> list[dict]:
+    """Bulk get_developer_profile by canonical ids, GitHub logins (case-insensitive) or node ids.
+
+    Pass exactly one of the lists. The whole list is resolved against
+    canonical_developers (with user_info LEFT JOINed) in a single join; the
+    result has one row per input, in input order, with ``input`` (the value
+    looked up), ``found`` (False and NULL columns for unknown developers) and
+    ``has_profile`` (False for developers without a user_info row, whose
+    profile columns are NULL).
+    """
+    given = {k: v for k, v in (("ids", ids), ("logins", logins), ("github_node_ids", github_node_ids)) if v is not None}
+    if len(given) != 1:
+        raise ValueError("Pass exactly one of ids, logins or github_node_ids")
+    (kind, keys), = given.items()
+    if not keys:
+        return []
+    key_type, joins = _PROFILE_KEYS[kind]
+    loc_cte = loc_col = loc_join = ""
+    if include_location:
+        loc_cte = """,
+            locs AS (
+                SELECT canonical_developer_id,
+                       list(struct_pack(country, admin_level_1, locality, lat, lng, formatted_address)) AS locations
+                FROM canonical_developer_locations
+                WHERE canonical_developer_id IN (SELECT canonical_developer_id FROM matched)
+                GROUP BY canonical_developer_id
+            )"""
+        loc_col = ", coalesce(l.locations, []) AS locations"
+        loc_join = "LEFT JOIN locs l ON l.canonical_developer_id = m.canonical_developer_id"
+    query = f"""
+        WITH k AS (
+            SELECT * FROM unnest(?::{key_type}[]) WITH ORDINALITY AS t(key, pos)
+        ), matched AS (
+            SELECT k.pos, c.id AS canonical_developer_id, c.primary_github_user_id,
+                   u.canonical_developer_id IS NOT NULL AS has_profile,
+                   u.login, u.name, u.company, u.location, u.url, u.email
+            FROM k
+            {joins}
+            -- A login or node id shared by several developers resolves to the lowest id.
+            QUALIFY row_number() OVER (PARTITION BY k.pos ORDER BY c.id) = 1
+        ){loc_cte}
+        SELECT k.key AS input, m.pos IS NOT NULL AS found, coalesce(m.has_profile, false) AS has_profile,
+               m.canonical_developer_id, m.login, m.name, m.company, m.location, m.url, m.email,
+               m.primary_github_user_id{loc_col}
+        FROM k
+        LEFT JOIN matched m ON m.pos = k.pos
+        {loc_join}
+        ORDER BY k.pos
+    """
+    rows = fetch_all_dicts(conn, query, [list(keys)])
+    if include_location:
+        for row in rows:
+            if not row["found"]:
+                row["locations"] = None
+    return rows
+
+
+# Bundle column -> (derived table, its row for $eco/$dev, base table and the row read
+# from its ecosystem_rows ({rows}) until the derived table is built).
+_BUNDLE_SOURCES = {
+    "current_rank": (
+        INDEX_TABLE,
+        f"""
+            SELECT rank_day AS day, points, contribution_rank
+            FROM {INDEX_TABLE}
+            WHERE ecosystem_id = $eco AND canonical_developer_id = $dev AND rank_day IS NOT NULL
+        """,
+        "eco_developer_contribution_ranks",
+        # Current means ranked on the ecosystem's newest rank day, as in the index.
+        """
+            SELECT day, points, contribution_rank
+            FROM {rows}
+            WHERE canonical_developer_id = $dev AND day = (SELECT max(day) FROM {rows})
+        """,
+    ),
+    "latest_tenure": (
+        LATEST_TENURE_TABLE,
+        f"""
+            SELECT day, tenure_days, category
+            FROM {LATEST_TENURE_TABLE}
+            WHERE ecosystem_id = $eco AND canonical_developer_id = $dev
+        """,
+        "eco_developer_tenures",
+        """
+            SELECT day, tenure_days, category
+            FROM {rows}
+            WHERE canonical_developer_id = $dev
+            ORDER BY day DESC
+            LIMIT 1
+        """,
+    ),
+}
+
+
+def _bundle_query(conn, ecosystem: bool, base: set[str]) -> str:
+    recent_cte = eco_cols = eco_joins = ""
+    if ecosystem:
+        # The newest days with the developer's all-time totals attached by window
+        # functions, so totals and recent rows come from one read of the same rows.
+        recent_cte = f"""
+            WITH recent AS (
+                SELECT day, num_commits,
+                       count(*) OVER () AS days_active, sum(num_commits) OVER () AS num_commits_total,
+                       min(day) OVER () AS first_day, max(day) OVER () AS last_day
+                FROM {ecosystem_rows(conn, "eco_developer_activities", "$eco")}
+                WHERE canonical_developer_id = $dev
+                ORDER BY day DESC
+                LIMIT $activity_limit
+            )"""
+        eco_cols = """,
+               struct_pack(
+                   days_active := coalesce(a.days_active, 0),
+                   num_commits := coalesce(a.num_commits, 0)::BIGINT,
+                   first_day := a.first_day,
+                   last_day := a.last_day,
+                   recent := coalesce(a.recent, [])
+               ) AS activity,
+               CASE WHEN r.day IS NOT NULL THEN struct_pack(r.day, r.points, r.contribution_rank) END AS current_rank,
+               CASE WHEN t.day IS NOT NULL THEN struct_pack(t.day, t.tenure_days, t.category) END AS latest_tenure"""
+        rank_sql, tenure_sql = (
+            fallback.format(rows=ecosystem_rows(conn, base_table, "$eco")) if column in base else derived
+            for column, (_, derived, base_table, fallback) in _BUNDLE_SOURCES.items()
+        )
+        eco_joins = f"""
+            CROSS JOIN (
+                SELECT any_value(days_active) AS days_active, any_value(num_commits_total) AS num_commits,
+                       any_value(first_day) AS first_day, any_value(last_day) AS last_day,
+                       list(struct_pack(day, num_commits) ORDER BY day DESC) AS recent
+                FROM recent
+            ) a
+            LEFT JOIN ({rank_sql}) r ON true
+            LEFT JOIN ({tenure_sql}) t ON true"""
+    return f"""{recent_cte}
+        SELECT u.canonical_developer_id, u.login, u.name, u.company, u.location, u.url, u.email,
+               u.primary_github_user_id, coalesce(l.locations, []) AS locations{eco_cols}
+        FROM user_info u
+        CROSS JOIN (
+            SELECT list(struct_pack(country, admin_level_1, locality, lat, lng, formatted_address)) AS locations
+            FROM canonical_developer_locations
+            WHERE canonical_developer_id = $dev
+        ) l{eco_joins}
+        WHERE u.canonical_developer_id = $dev
+    """
+
+
+def developer_profile_bundle(
+    conn,
+    canonical_developer_id: int,
+    ecosystem_id: int | None = None,
+    *,
+    activity_limit: int = 30,
+) -> dict | None:
+    """Profile, locations and (with ecosystem_id) activity, latest tenure and rank in one query.
+
+    Returns the user_info row plus ``locations``; when ``ecosystem_id`` is given also
+    ``activity`` (days_active, num_commits, first_day, last_day and the newest
+    ``activity_limit`` daily rows as ``recent``, all from one read of eco_developer_activities),
+    ``latest_tenure`` and ``current_rank`` (None when the developer is not ranked on the
+    ecosystem's newest rank day). Rank and tenure are key lookups in
+    developer_ecosystems_index and eco_developer_latest_tenures (as of their last
+    refresh); until those are built they are read from the base tables, which is slower.
+    """
+    params: dict[str, Any] = {"dev": canonical_developer_id}
+    if ecosystem_id is not None:
+        params.update(eco=ecosystem_id, activity_limit=activity_limit)
+    base: set[str] = set()
+    while True:
+        try:
+            row = fetch_one_dict(conn, _bundle_query(conn, ecosystem_id is not None, base), params)
+            break
+        except duckdb.CatalogException as e:
+            missing = {c for c, (table, *_) in _BUNDLE_SOURCES.items() if table in str(e)} - base
+            if ecosystem_id is None or not missing:
+                raise
+            base |= missing
+    if row is not None and ecosystem_id is not None:
+        row["ecosystem_id"] = ecosystem_id
     return row
 
 
@@ -117,7 +459,7 @@ def developer_activity_in_ecosystem(
     limit: int = 365,
 ) -> list[dict]:
     """Daily activity (num_commits) for a developer in an ecosystem over a day range."""
-    where = "ecosystem_id = ? AND canonical_developer_id = ?"
+    where = "canonical_developer_id = ?"
     params: list[Any] = [ecosystem_id, canonical_developer_id]
     if start_date is not None:
         where += " AND day >= ?"
@@ -128,7 +470,7 @@ def developer_activity_in_ecosystem(
     params.append(limit)
     query = f"""
         SELECT day, num_commits
-        FROM eco_developer_activities
+        FROM {ecosystem_rows(conn, "eco_developer_activities")}
         WHERE {where}
         ORDER BY day DESC
         LIMIT ?
@@ -142,10 +484,10 @@ def developer_tenure_in_ecosystem(
     canonical_developer_id: int,
 ) -> list[dict]:
     """Tenure records for a developer in an ecosystem (tenure_days, category, day)."""
-    query = """
+    query = f"""
         SELECT day, tenure_days, category
-        FROM eco_developer_tenures
-        WHERE ecosystem_id = ? AND canonical_developer_id = ?
+        FROM {ecosystem_rows(conn, "eco_developer_tenures")}
+        WHERE canonical_developer_id = ?
         ORDER BY day DESC
         LIMIT 100
     """
@@ -171,10 +513,9 @@ def search_developers_in_ecosystem(
     query = f"""
         SELECT DISTINCT ecr.canonical_developer_id, ecr.day, ecr.points, ecr.contribution_rank,
                u.login, u.name
-        FROM eco_developer_contribution_ranks ecr
+        FROM {ecosystem_rows(conn, "eco_developer_contribution_ranks")} ecr
         JOIN user_info u ON u.canonical_developer_id = ecr.canonical_developer_id
-        WHERE ecr.ecosystem_id = ?
-          AND (u.login ILIKE ? OR u.name ILIKE ?)
+        WHERE (u.login ILIKE ? OR u.name ILIKE ?)
           {day_filter}
         ORDER BY ecr.points DESC NULLS LAST
         LIMIT ? OFFSET ?
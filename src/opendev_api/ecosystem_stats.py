@@ -0,0 +1,89 @@
+"""Materialized per-ecosystem statistics for list_ecosystems.
+
+``ecosystem_stats`` holds one row per ecosystem: direct and recursive repo
+counts, child ecosystem count and the latest ``eco_mads`` metrics. Listing
+ecosystems then reads it with a plain join instead of aggregating
+``ecosystems_repos`` for every request, and can sort by any of its columns.
+
+The table is a snapshot, rebuilt in full by ``refresh_ecosystem_stats``: the
+repo and hierarchy tables carry no day or change marker to refresh from
+incrementally, so counts lag until the next refresh.
+``ecosystem_stats_freshness`` reports when that was and whether ``eco_mads``
+has moved on since.
+"""
+
+from ._db_utils import derived_table_hint, fetch_one_dict, run_statement
+
+STATS_TABLE = "ecosystem_stats"
+
+# Columns list_ecosystems can sort by (descending); all come from STATS_TABLE.
+STATS_COLUMNS = (
+    "direct_repo_count",
+    "recursive_repo_count",
+    "child_count",
+    "all_devs",
+    "exclusive_devs",
+    "multichain_devs",
+    "num_commits",
+    "full_time_devs",
+    "part_time_devs",
+    "one_time_devs",
+)
+
+
+def refresh_ecosystem_stats(conn) -> dict:
+    """Rebuild ecosystem_stats from the repo, hierarchy and eco_mads tables; returns the row count."""
+    run_statement(conn, f"""
+        CREATE OR REPLACE TABLE {STATS_TABLE} AS
+        WITH direct AS (
+            SELECT ecosystem_id, count(*) AS n FROM ecosystems_repos GROUP BY ecosystem_id
+        ), rec AS (
+            SELECT ecosystem_id, count(DISTINCT repo_id) AS n FROM ecosystems_repos_recursive GROUP BY ecosystem_id
+        ), children AS (
+            SELECT parent_id AS ecosystem_id, count(*) AS n FROM ecosystems_child_ecosystems GROUP BY parent_id
+        ), mads AS (
+            SELECT ecosystem_id,
+                   arg_max(struct_pack(day, all_devs, exclusive_devs, multichain_devs, num_commits,
+                                       full_time_devs, part_time_devs, one_time_devs), day) AS m
+            FROM eco_mads GROUP BY ecosystem_id
+        )
+        SELECT e.id AS ecosystem_id,
+               coalesce(direct.n, 0) AS direct_repo_count,
+               coalesce(rec.n, 0) AS recursive_repo_count,
+               coalesce(children.n, 0) AS child_count,
+               mads.m.day AS mads_day,
+               mads.m.all_devs AS all_devs,
+               mads.m.exclusive_devs AS exclusive_devs,
+               mads.m.multichain_devs AS multichain_devs,
+               mads.m.num_commits AS num_commits,
+               mads.m.full_time_devs AS full_time_devs,
+               mads.m.part_time_devs AS part_time_devs,
+               mads.m.one_time_devs AS one_time_devs,
+               CAST(current_timestamp AS TIMESTAMP) AS refreshed_at
+        FROM ecosystems e
+        LEFT JOIN direct ON direct.ecosystem_id = e.id
+        LEFT JOIN rec ON rec.ecosystem_id = e.id
+        LEFT JOIN children ON children.ecosystem_id = e.id
+        LEFT JOIN mads ON mads.ecosystem_id = e.id
+        ORDER BY e.id
+    """)
+    return {"ecosystems": run_statement(conn, f"SELECT count(*) FROM {STATS_TABLE}")[0][0]}
+
+
+def ecosystem_stats_freshness(conn) -> dict:
+    """When ecosystem_stats was built, its newest MADs day and the newest day in eco_mads.
+
+    ``mads_behind`` is True when eco_mads has days the table does not include yet.
+    Repo and child counts are as of ``refreshed_at``; changes to the repo tables
+    since then cannot be detected and also need refresh_ecosystem_stats().
+    """
+    with derived_table_hint(STATS_TABLE, "refresh_ecosystem_stats"):
+        row = fetch_one_dict(conn, f"""
+            SELECT CAST(max(refreshed_at) AS TIMESTAMP) AS refreshed_at,
+                   max(mads_day) AS mads_day,
+                   (SELECT max(day) FROM eco_mads) AS latest_mads_day
+            FROM {STATS_TABLE}
+        """)
+    latest = row["latest_mads_day"]
+    row["mads_behind"] = latest is not None and (row["mads_day"] is None or row["mads_day"] < latest)
+    return row
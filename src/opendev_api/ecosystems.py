@@ -3,7 +3,42 @@
 from datetime import date
 from typing import Any
 
-from ._db_utils import fetch_all_dicts, fetch_one_dict
+import duckdb
+
+from ._db_utils import derived_table_hint, fetch_all_dicts, fetch_one_dict
+from .ecosystem_stats import STATS_COLUMNS as _STATS_COLUMNS, STATS_TABLE as _ECOSYSTEM_STATS_TABLE
+from .partitioned import ecosystem_rows
+from .rank_histograms import HISTOGRAM_TABLE as _RANK_HISTOGRAM_TABLE, POINTS_BUCKETS as _POINTS_BUCKETS
+from .repo_activity import STATS_TABLE as _REPO_ACTIVITY_TABLE, WINDOWS as _ACTIVITY_WINDOWS
+
+# sort_by values served from repo_activity_stats; "activity" is the 28-day window.
+_ACTIVITY_SORTS = {"activity": "commits_28d"} | {f"activity_{w}d": f"commits_{w}d" for w in _ACTIVITY_WINDOWS}
+
+
+def _repo_query(table: str, columns: str, sort_by: str) -> str:
+    """Repos in an ecosystem ordered by stars, name or precomputed activity."""
+    if sort_by in _ACTIVITY_SORTS:
+        col = _ACTIVITY_SORTS[sort_by]
+        activity_cols = "".join(
+            f", coalesce(ra.commits_{w}d, 0) AS commits_{w}d, coalesce(ra.active_devs_{w}d, 0) AS active_devs_{w}d"
+            for w in _ACTIVITY_WINDOWS
+        )
+        return f"""
+            SELECT {columns}{activity_cols}
+            FROM {table} er
+            JOIN repos r ON r.id = er.repo_id
+            LEFT JOIN {_REPO_ACTIVITY_TABLE} ra ON ra.repo_id = er.repo_id
+            WHERE er.ecosystem_id = ?
+            ORDER BY ra.{col} DESC NULLS LAST, r.num_stars DESC NULLS LAST, r.id
+        """
+    order = "r.num_stars DESC NULLS LAST" if sort_by == "num_stars" else "r.name"
+    return f"""
+        SELECT {columns}
+        FROM {table} er
+        JOIN repos r ON r.id = er.repo_id
+        WHERE er.ecosystem_id = ?
+        ORDER BY {order}
+    """
 
 
 def list_ecosystems(
@@ -13,10 +48,21 @@ def list_ecosystems(
     is_crypto: bool | None = None,
     is_chain: bool | None = None,
     include_repo_count: bool = False,
+    include_stats: bool = False,
+    sort_by: str = "name",
     limit: int = 50,
     offset: int = 0,
 ) -> list[dict]:
-    """List ecosystems with optional filters and pagination."""
+    """List ecosystems with optional filters and pagination.
+
+    Repo counts and stats come from the materialized ecosystem_stats table
+    (see refresh_ecosystem_stats), so they are as of its last refresh; check
+    ecosystem_stats_freshness(). ``include_stats`` adds all of its columns;
+    ``sort_by`` is "name" or any stats column (largest first). Without the
+    table, include_repo_count falls back to counting ecosystems_repos.
+    """
+    if sort_by != "name" and sort_by not in _STATS_COLUMNS:
+        raise ValueError(f"sort_by must be 'name' or one of {', '.join(_STATS_COLUMNS)}")
     where_parts = []
     params: list[Any] = []
     if name_contains is not None:
@@ -29,11 +75,37 @@ def list_ecosystems(
         where_parts.append("e.is_chain = ?")
         params.append(1 if is_chain else 0)
     where_sql = " AND ".join(where_parts) if where_parts else "1=1"
+    params.extend([limit, offset])
+    base_cols = """e.id, e.name, e.launch_date, e.derived_launch_date,
+                   e.is_crypto, e.is_category, e.is_chain, e.is_multichain"""
 
-    if include_repo_count:
+    if include_repo_count or include_stats or sort_by != "name":
+        stats_cols = ""
+        if include_repo_count:
+            stats_cols += ", coalesce(s.direct_repo_count, 0) AS repo_count"
+        if include_stats:
+            stats_cols += ", s.mads_day, " + ", ".join(f"s.{c}" for c in _STATS_COLUMNS)
+        order = "e.name" if sort_by == "name" else f"s.{sort_by} DESC NULLS LAST, e.name"
         query = f"""
-            SELECT e.id, e.name, e.launch_date, e.derived_launch_date,
-                   e.is_crypto, e.is_category, e.is_chain, e.is_multichain,
+            SELECT {base_cols}{stats_cols}
+            FROM ecosystems e
+            LEFT JOIN {_ECOSYSTEM_STATS_TABLE} s ON s.ecosystem_id = e.id
+            WHERE {where_sql}
+            ORDER BY {order}
+            LIMIT ? OFFSET ?
+        """
+        try:
+            return fetch_all_dicts(conn, query, params)
+        except duckdb.CatalogException as e:
+            if _ECOSYSTEM_STATS_TABLE not in str(e):
+                raise
+            if include_stats or sort_by != "name":
+                raise RuntimeError(
+                    f"{_ECOSYSTEM_STATS_TABLE} has not been built; run refresh_ecosystem_stats() first"
+                ) from e
+        # Stats not materialized yet: count direct repos at request time.
+        query = f"""
+            SELECT {base_cols},
                    count(er.repo_id) AS repo_count
             FROM ecosystems e
             LEFT JOIN ecosystems_repos er ON er.ecosystem_id = e.id
@@ -52,7 +124,6 @@ def list_ecosystems(
             ORDER BY e.name
             LIMIT ? OFFSET ?
         """
-    params.extend([limit, offset])
     return fetch_all_dicts(conn, query, params)
 
 
@@ -70,7 +141,7 @@ def get_ecosystem(conn, ecosystem_id: int, *, include_latest_mads: bool = False)
         mads = fetch_one_dict(
             conn,
             "SELECT day, all_devs, exclusive_devs, num_commits, full_time_devs, part_time_devs, one_time_devs "
-            "FROM eco_mads WHERE ecosystem_id = ? ORDER BY day DESC LIMIT 1",
+            f"FROM {ecosystem_rows(conn, 'eco_mads')} ORDER BY day DESC LIMIT 1",
             [ecosystem_id],
         )
         if mads:
@@ -112,18 +183,17 @@ def repos_in_ecosystem(
     limit: int = 50,
     offset: int = 0,
 ) -> list[dict]:
-    """List repos in an ecosystem; recursive uses ecosystems_repos_recursive."""
-    table = "ecosystems_repos_recursive" if recursive else "ecosystems_repos"
-    order = "r.num_stars DESC NULLS LAST" if sort_by == "num_stars" else "r.name"
-    query = f"""
-        SELECT r.id, r.name, r.link, r.num_stars, r.num_forks, r.num_issues
-        FROM {table} er
-        JOIN repos r ON r.id = er.repo_id
-        WHERE er.ecosystem_id = ?
-        ORDER BY {order}
-        LIMIT ? OFFSET ?
+    """List repos in an ecosystem; recursive uses ecosystems_repos_recursive.
+
+    sort_by is "num_stars", "name", or "activity" / "activity_28d" / "activity_90d" /
+    "activity_365d" (commits in that window, from repo_activity_stats; adds the
+    commits_*/active_devs_* columns).
     """
-    return fetch_all_dicts(conn, query, [ecosystem_id, limit, offset])
+    table = "ecosystems_repos_recursive" if recursive else "ecosystems_repos"
+    query = _repo_query(table, "r.id, r.name, r.link, r.num_stars, r.num_forks, r.num_issues", sort_by)
+    query += " LIMIT ? OFFSET ?"
+    with derived_table_hint(_REPO_ACTIVITY_TABLE, "refresh_repo_activity_stats"):
+        return fetch_all_dicts(conn, query, [ecosystem_id, limit, offset])
 
 
 def ecosystem_mads_time_series(
@@ -135,6 +205,36 @@ def ecosystem_mads_time_series(
     limit: int = 365,
 ) -> list[dict]:
     """Return eco_mads rows for an ecosystem over a day range (for charts)."""
+    filters = []
+    params: list[Any] = [ecosystem_id]
+    if start_date is not None:
+        filters.append("day >= ?")
+        params.append(start_date)
+    if end_date is not None:
+        filters.append("day <= ?")
+        params.append(end_date)
+    params.append(limit)
+    where = f"WHERE {' AND '.join(filters)}" if filters else ""
+    query = f"""
+        SELECT day, all_devs, exclusive_devs, multichain_devs, num_commits,
+               devs_0_1y, devs_1_2y, devs_2y_plus, one_time_devs, part_time_devs, full_time_devs
+        FROM {ecosystem_rows(conn, "eco_mads")}
+        {where}
+        ORDER BY day DESC
+        LIMIT ?
+    """
+    return fetch_all_dicts(conn, query, params)
+
+
+def ecosystem_rank_distribution_time_series(
+    conn,
+    ecosystem_id: int,
+    *,
+    start_date: date | None = None,
+    end_date: date | None = None,
+    limit: int = 365,
+) -> list[dict]:
+    """Daily rank mix and points histogram for an ecosystem (from eco_rank_histograms)."""
     where = "ecosystem_id = ?"
     params: list[Any] = [ecosystem_id]
     if start_date is not None:
@@ -144,15 +244,17 @@ def ecosystem_mads_time_series(
         where += " AND day <= ?"
         params.append(end_date)
     params.append(limit)
+    bucket_cols = ", ".join(name for name, _, _ in _POINTS_BUCKETS)
     query = f"""
-        SELECT day, all_devs, exclusive_devs, multichain_devs, num_commits,
-               devs_0_1y, devs_1_2y, devs_2y_plus, one_time_devs, part_time_devs, full_time_devs
-        FROM eco_mads
+        SELECT day, ranked_devs, full_time_devs, part_time_devs, one_time_devs, points_sum,
+               {bucket_cols}
+        FROM {_RANK_HISTOGRAM_TABLE}
         WHERE {where}
         ORDER BY day DESC
         LIMIT ?
     """
-    return fetch_all_dicts(conn, query, params)
+    with derived_table_hint(_RANK_HISTOGRAM_TABLE, "refresh_rank_histograms"):
+        return fetch_all_dicts(conn, query, params)
 
 
 def search_ecosystems(conn, name_query: str, *, limit: int = 30) -> list[dict]:
@@ -172,16 +274,11 @@ def top_repos_in_ecosystem(
     ecosystem_id: int,
     *,
     recursive: bool = True,
+    sort_by: str = "num_stars",
     limit: int = 20,
 ) -> list[dict]:
-    """Top repos in ecosystem by num_stars (or most active); limit default 20."""
+    """Top repos in ecosystem by num_stars or most active (sort_by="activity"); limit default 20."""
     table = "ecosystems_repos_recursive" if recursive else "ecosystems_repos"
-    query = f"""
-        SELECT r.id, r.name, r.link, r.num_stars, r.num_forks
-        FROM {table} er
-        JOIN repos r ON r.id = er.repo_id
-        WHERE er.ecosystem_id = ?
-        ORDER BY r.num_stars DESC NULLS LAST
-        LIMIT ?
-    """
-    return fetch_all_dicts(conn, query, [ecosystem_id, limit])
+    query = _repo_query(table, "r.id, r.name, r.link, r.num_stars, r.num_forks", sort_by) + " LIMIT ?"
+    with derived_table_hint(_REPO_ACTIVITY_TABLE, "refresh_repo_activity_stats"):
+        return fetch_all_dicts(conn, query, [ecosystem_id, limit])
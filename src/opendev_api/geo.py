@@ -0,0 +1,149 @@
+"""Precomputed geographic distribution of each ecosystem's current developers.
+
+"Current developers" are the rows of ``eco_developer_contribution_ranks`` on
+the ecosystem's latest day (the same set ``developers_in_ecosystem`` lists by
+default). ``refresh_ecosystem_geo`` joins them with
+``canonical_developer_locations`` once and stores three small tables:
+
+- ``eco_developer_geo_countries``: developers per (ecosystem, country), split by
+  contribution rank; developers without a location are counted under a NULL
+  country;
+- ``eco_developer_geo_regions``: the same per (ecosystem, country, admin_level_1);
+- ``eco_developer_geo_grid``: developers per lat/lng cell (``cell_degrees`` wide),
+  for heatmaps.
+
+A world map of an ecosystem then reads a few hundred rows instead of joining
+every location row per request.
+"""
+
+from ._db_utils import derived_table_hint, fetch_all_dicts, run_statement
+
+COUNTRIES_TABLE = "eco_developer_geo_countries"
+REGIONS_TABLE = "eco_developer_geo_regions"
+GRID_TABLE = "eco_developer_geo_grid"
+
+_RANK_COUNTS = """
+    count(*) AS developers,
+    count(*) FILTER (WHERE contribution_rank = 'full_time') AS full_time_devs,
+    count(*) FILTER (WHERE contribution_rank = 'part_time') AS part_time_devs,
+    count(*) FILTER (WHERE contribution_rank = 'one_time') AS one_time_devs
+"""
+
+
+def refresh_ecosystem_geo(conn, *, cell_degrees: float = 1.0) -> dict:
+    """Rebuild the country, region and grid aggregates; returns row counts per table."""
+    if not 0 < cell_degrees <= 90:
+        raise ValueError("cell_degrees must be in (0, 90]")
+    conn.execute("BEGIN TRANSACTION")
+    try:
+        run_statement(conn, """
+            CREATE OR REPLACE TEMP TABLE _geo_current AS
+            WITH latest AS (
+                SELECT ecosystem_id, max(day) AS day FROM eco_developer_contribution_ranks GROUP BY ecosystem_id
+            ), loc AS (
+                SELECT DISTINCT ON (canonical_developer_id)
+                       canonical_developer_id, country, admin_level_1, lat, lng
+                FROM canonical_developer_locations
+                ORDER BY canonical_developer_id, country NULLS LAST
+            )
+            SELECT ecr.ecosystem_id, ecr.day, ecr.contribution_rank,
+                   loc.country, loc.admin_level_1, loc.lat, loc.lng
+            FROM eco_developer_contribution_ranks ecr
+            JOIN latest USING (ecosystem_id, day)
+            LEFT JOIN loc USING (canonical_developer_id)
+        """)
+        run_statement(conn, f"""
+            CREATE OR REPLACE TABLE {COUNTRIES_TABLE} AS
+            SELECT ecosystem_id, any_value(day) AS day, country, {_RANK_COUNTS}
+            FROM _geo_current
+            GROUP BY ecosystem_id, country
+            ORDER BY ecosystem_id, developers DESC, country
+        """)
+        run_statement(conn, f"""
+            CREATE OR REPLACE TABLE {REGIONS_TABLE} AS
+            SELECT ecosystem_id, any_value(day) AS day, country, admin_level_1, {_RANK_COUNTS}
+            FROM _geo_current
+            WHERE country IS NOT NULL
+            GROUP BY ecosystem_id, country, admin_level_1
+            ORDER BY ecosystem_id, developers DESC, country, admin_level_1
+        """)
+        run_statement(conn, f"""
+            CREATE OR REPLACE TABLE {GRID_TABLE} AS
+            SELECT ecosystem_id, any_value(day) AS day,
+                   $cell AS cell_degrees,
+                   (floor(lat / $cell) + 0.5) * $cell AS lat,
+                   (floor(lng / $cell) + 0.5) * $cell AS lng,
+                   count(*) AS developers
+            FROM _geo_current
+            WHERE lat IS NOT NULL AND lng IS NOT NULL
+            GROUP BY ecosystem_id, floor(lat / $cell), floor(lng / $cell)
+            ORDER BY ecosystem_id, lat, lng
+        """, {"cell": float(cell_degrees)})
+        run_statement(conn, "DROP TABLE _geo_current")
+        counts = {
+            table: run_statement(conn, f"SELECT count(*) FROM {table}")[0][0]
+            for table in (COUNTRIES_TABLE, REGIONS_TABLE, GRID_TABLE)
+        }
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+    return counts
+
+
+def ecosystem_developer_countries(conn, ecosystem_id: int, *, limit: int | None = None) -> list[dict]:
+    """Current developers per country (NULL country = no known location), largest first."""
+    params: list = [ecosystem_id]
+    limit_sql = ""
+    if limit is not None:
+        limit_sql = "LIMIT ?"
+        params.append(limit)
+    query = f"""
+        SELECT country, developers, full_time_devs, part_time_devs, one_time_devs, day
+        FROM {COUNTRIES_TABLE}
+        WHERE ecosystem_id = ?
+        ORDER BY developers DESC, country NULLS LAST
+        {limit_sql}
+    """
+    with derived_table_hint(COUNTRIES_TABLE, "refresh_ecosystem_geo"):
+        return fetch_all_dicts(conn, query, params)
+
+
+def ecosystem_developer_regions(
+    conn,
+    ecosystem_id: int,
+    *,
+    country: str | None = None,
+    limit: int | None = None,
+) -> list[dict]:
+    """Current developers per admin_level_1 region, optionally within one country."""
+    params: list = [ecosystem_id]
+    where = "ecosystem_id = ?"
+    if country is not None:
+        where += " AND country = ?"
+        params.append(country)
+    limit_sql = ""
+    if limit is not None:
+        limit_sql = "LIMIT ?"
+        params.append(limit)
+    query = f"""
+        SELECT country, admin_level_1, developers, full_time_devs, part_time_devs, one_time_devs, day
+        FROM {REGIONS_TABLE}
+        WHERE {where}
+        ORDER BY developers DESC, country, admin_level_1 NULLS LAST
+        {limit_sql}
+    """
+    with derived_table_hint(REGIONS_TABLE, "refresh_ecosystem_geo"):
+        return fetch_all_dicts(conn, query, params)
+
+
+def ecosystem_developer_grid(conn, ecosystem_id: int) -> list[dict]:
+    """Developer counts per lat/lng grid cell (cell centers), for heatmaps."""
+    query = f"""
+        SELECT lat, lng, developers, cell_degrees, day
+        FROM {GRID_TABLE}
+        WHERE ecosystem_id = ?
+        ORDER BY lat, lng
+    """
+    with derived_table_hint(GRID_TABLE, "refresh_ecosystem_geo"):
+        return fetch_all_dicts(conn, query, [ecosystem_id])
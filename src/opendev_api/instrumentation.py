@@ -0,0 +1,236 @@
+"""Query instrumentation for every statement run through ``_db_utils``.
+
+Each query produces a ``QueryEvent`` (wall time, rows returned, calling API
+function) that is passed to the registered sinks. A sink is any callable taking
+a ``QueryEvent``; ``LoggingSink`` and ``HistogramSink`` cover the common cases.
+When a slow-query threshold is set, statements at or above it are flagged as
+slow and their plan is attached to the event: reads are re-run with
+``EXPLAIN ANALYZE``, writes (DDL, DML, COPY) only get a plain ``EXPLAIN``.
+``explain_sample_rate`` lowers the share of slow statements that are explained.
+
+A process-wide ``HistogramSink`` is registered by default; ``query_stats()`` (and
+``OpenDevData.query_stats()``) return its snapshot. Removing it with
+``remove_query_sink(default_histogram)`` while no other sink is registered
+turns instrumentation off: queries are then not attributed or timed further.
+"""
+
+import logging
+import random
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable
+
+_PACKAGE = __name__.rsplit(".", 1)[0]
+# Modules that only forward queries; the caller reported is the first frame outside them.
+_PASSTHROUGH_MODULES = frozenset(
+    {f"{_PACKAGE}._db_utils", f"{_PACKAGE}.client", __name__}
+)
+
+# Upper bounds (ms) of the latency buckets kept by HistogramSink; the last bucket is open-ended.
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+@dataclass(frozen=True)
+class QueryEvent:
+    query: str
+    params: Any
+    elapsed_ms: float
+    rows: int
+    caller: str | None
+    timestamp: float
+    slow: bool = False
+    explain: str | None = None
+
+
+class LoggingSink:
+    """Log every query at ``level`` and slow queries (with their plan) at ``slow_level``."""
+
+    def __init__(
+        self,
+        logger: logging.Logger | None = None,
+        *,
+        level: int = logging.DEBUG,
+        slow_level: int = logging.WARNING,
+    ):
+        self.logger = logger or logging.getLogger(_PACKAGE)
+        self.level = level
+        self.slow_level = slow_level
+
+    def __call__(self, event: QueryEvent) -> None:
+        level = self.slow_level if event.slow else self.level
+        if not self.logger.isEnabledFor(level):
+            return
+        msg = "%s: %.1f ms, %d rows%s"
+        args = [event.caller or "<unknown>", event.elapsed_ms, event.rows, " (slow)" if event.slow else ""]
+        if event.explain:
+            msg += "\n%s"
+            args.append(event.explain)
+        self.logger.log(level, msg, *args)
+
+
+class HistogramSink:
+    """In-memory per-caller latency histogram; thread-safe."""
+
+    def __init__(self, buckets_ms: tuple[float, ...] = LATENCY_BUCKETS_MS):
+        self.buckets_ms = tuple(buckets_ms)
+        self._lock = threading.Lock()
+        self._stats: dict[str, dict] = {}
+
+    def __call__(self, event: QueryEvent) -> None:
+        key = event.caller or "<unknown>"
+        idx = len(self.buckets_ms)
+        for i, bound in enumerate(self.buckets_ms):
+            if event.elapsed_ms <= bound:
+                idx = i
+                break
+        with self._lock:
+            s = self._stats.get(key)
+            if s is None:
+                s = self._stats[key] = {
+                    "count": 0,
+                    "slow_count": 0,
+                    "total_ms": 0.0,
+                    "max_ms": 0.0,
+                    "rows": 0,
+                    "buckets": [0] * (len(self.buckets_ms) + 1),
+                }
+            s["count"] += 1
+            s["slow_count"] += int(event.slow)
+            s["total_ms"] += event.elapsed_ms
+            s["max_ms"] = max(s["max_ms"], event.elapsed_ms)
+            s["rows"] += event.rows
+            s["buckets"][idx] += 1
+
+    def _quantile(self, buckets: list[int], count: int, q: float) -> float | None:
+        """Upper bound of the bucket holding quantile q (None if it is the open bucket)."""
+        target = q * count
+        seen = 0
+        for i, n in enumerate(buckets):
+            seen += n
+            if seen >= target:
+                return self.buckets_ms[i] if i < len(self.buckets_ms) else None
+        return None
+
+    def snapshot(self) -> dict:
+        """Per-caller stats: count, mean/max ms, p50/p95 bucket bounds, rows and bucket counts."""
+        with self._lock:
+            stats = {k: {**v, "buckets": list(v["buckets"])} for k, v in self._stats.items()}
+        out = {}
+        for key, s in sorted(stats.items()):
+            out[key] = {
+                "count": s["count"],
+                "slow_count": s["slow_count"],
+                "total_ms": round(s["total_ms"], 3),
+                "mean_ms": round(s["total_ms"] / s["count"], 3),
+                "max_ms": round(s["max_ms"], 3),
+                "p50_ms_le": self._quantile(s["buckets"], s["count"], 0.5),
+                "p95_ms_le": self._quantile(s["buckets"], s["count"], 0.95),
+                "rows": s["rows"],
+                "buckets_ms": dict(zip([*map(str, self.buckets_ms), "inf"], s["buckets"])),
+            }
+        return out
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+
+default_histogram = HistogramSink()
+_sinks: tuple[Callable[[QueryEvent], None], ...] = (default_histogram,)
+_sinks_lock = threading.Lock()
+_slow_query_ms: float | None = None
+_explain_sample_rate = 1.0
+
+
+def add_query_sink(sink: Callable[[QueryEvent], None]) -> None:
+    """Register a sink called with a QueryEvent after every query."""
+    global _sinks
+    with _sinks_lock:
+        if sink not in _sinks:
+            _sinks = (*_sinks, sink)
+
+
+def remove_query_sink(sink: Callable[[QueryEvent], None]) -> None:
+    global _sinks
+    with _sinks_lock:
+        _sinks = tuple(s for s in _sinks if s != sink)
+
+
+def set_slow_query_threshold(threshold_ms: float | None, *, explain_sample_rate: float = 1.0) -> None:
+    """Flag queries taking at least threshold_ms as slow (None disables).
+
+    Slow reads are re-run with EXPLAIN ANALYZE to attach their plan; the re-run
+    executes the query a second time on the caller's connection before the call
+    returns. If that doubling is too costly, explain_sample_rate < 1 explains
+    only that fraction of slow queries (0 keeps the flag without a plan).
+    """
+    global _slow_query_ms, _explain_sample_rate
+    if threshold_ms is not None and threshold_ms < 0:
+        raise ValueError("threshold_ms must be >= 0")
+    if not 0.0 <= explain_sample_rate <= 1.0:
+        raise ValueError("explain_sample_rate must be between 0 and 1")
+    _slow_query_ms = threshold_ms
+    _explain_sample_rate = explain_sample_rate
+
+
+def query_stats() -> dict:
+    """Snapshot of the process-wide query histogram, keyed by calling API function."""
+    return default_histogram.snapshot()
+
+
+def reset_query_stats() -> None:
+    default_histogram.reset()
+
+
+def _caller() -> str | None:
+    """Name of the first frame outside the forwarding modules (usually two frames up)."""
+    frame = sys._getframe(2)
+    while frame is not None:
+        module = frame.f_globals.get("__name__", "")
+        if module not in _PASSTHROUGH_MODULES:
+            return f"{module.rsplit('.', 1)[-1]}.{frame.f_code.co_name}"
+        frame = frame.f_back
+    return None
+
+
+def _explain(conn, query: str, params, analyze: bool) -> str | None:
+    prefix = "EXPLAIN ANALYZE" if analyze else "EXPLAIN"
+    try:
+        if params is not None:
+            rows = conn.execute(f"{prefix} {query}", params).fetchall()
+        else:
+            rows = conn.execute(f"{prefix} {query}").fetchall()
+    except Exception as e:
+        return f"{prefix} failed: {e}"
+    return "\n".join(str(r[-1]) for r in rows)
+
+
+def record_query(conn, query: str, params, elapsed_ms: float, rows: int, *, analyze: bool = True) -> None:
+    """Emit a QueryEvent to the registered sinks; called by _db_utils after each query.
+
+    analyze=False is for statements with side effects: their plan comes from a
+    plain EXPLAIN so they are never executed twice.
+    """
+    sinks = _sinks
+    if not sinks:
+        return
+    threshold = _slow_query_ms
+    slow = threshold is not None and elapsed_ms >= threshold
+    explain = slow and _explain_sample_rate > 0 and (_explain_sample_rate >= 1 or random.random() < _explain_sample_rate)
+    event = QueryEvent(
+        query=query,
+        params=params,
+        elapsed_ms=elapsed_ms,
+        rows=rows,
+        caller=_caller(),
+        timestamp=time.time(),
+        slow=slow,
+        explain=_explain(conn, query, params, analyze) if explain else None,
+    )
+    for sink in sinks:
+        try:
+            sink(event)
+        except Exception:
+            logging.getLogger(_PACKAGE).exception("Query sink %r failed", sink)
@@ -0,0 +1,206 @@
+"""Organization rollups: which orgs dominate an ecosystem, and an org's footprint across ecosystems.
+
+Repos belong to organizations through ``repos.organization_id``;
+``ecosystems_organizations`` marks the orgs tied to an ecosystem
+(``is_first_party``). ``refresh_organization_stats`` precomputes two compact
+tables so leaderboards never join the activity tables per request:
+
+- ``eco_organization_stats``: one row per (ecosystem, organization) with the
+  org's repos, stars and forks among the ecosystem's recursive repos and the
+  developers active in them over the last 28/90/365 days;
+- ``organization_stats``: the same totals per organization across all its
+  repos, plus the number of ecosystems it has repos in.
+
+Active developers come from ``repo_developer_last_active`` (kept by
+``refresh_repo_activity_stats``), so run that first.
+"""
+
+from ._db_utils import derived_table_hint, fetch_all_dicts, fetch_one_dict, run_statement
+from .repo_activity import LAST_ACTIVE_TABLE, WINDOWS
+
+ECO_ORG_TABLE = "eco_organization_stats"
+ORG_TABLE = "organization_stats"
+
+# Columns the leaderboards can sort by (largest first).
+ORG_SORT_COLUMNS = ("repos", "stars", "forks") + tuple(f"active_devs_{w}d" for w in WINDOWS)
+
+
+def _dev_cols(alias: str) -> str:
+    return ",\n".join(
+        f"count(DISTINCT {alias}.canonical_developer_id) FILTER (WHERE {alias}.last_active_day > $as_of - {w}) "
+        f"AS active_devs_{w}d"
+        for w in WINDOWS
+    )
+
+
+def _coalesced_dev_cols(alias: str) -> str:
+    return ",\n".join(f"coalesce({alias}.active_devs_{w}d, 0) AS active_devs_{w}d" for w in WINDOWS)
+
+
+def refresh_organization_stats(conn) -> dict:
+    """Rebuild eco_organization_stats and organization_stats; returns row counts and the activity day."""
+    with derived_table_hint(LAST_ACTIVE_TABLE, "refresh_repo_activity_stats"):
+        as_of = run_statement(conn, f"SELECT max(last_active_day) FROM {LAST_ACTIVE_TABLE}")[0][0]
+    conn.execute("BEGIN TRANSACTION")
+    try:
+        run_statement(conn, f"""
+            CREATE OR REPLACE TABLE {ECO_ORG_TABLE} AS
+            WITH repo_orgs AS (
+                SELECT DISTINCT er.ecosystem_id, r.organization_id, r.id AS repo_id, r.num_stars, r.num_forks
+                FROM ecosystems_repos_recursive er
+                JOIN repos r ON r.id = er.repo_id
+                WHERE r.organization_id IS NOT NULL
+            ), totals AS (
+                SELECT ecosystem_id, organization_id,
+                       count(*) AS repos,
+                       CAST(coalesce(sum(num_stars), 0) AS BIGINT) AS stars,
+                       CAST(coalesce(sum(num_forks), 0) AS BIGINT) AS forks
+                FROM repo_orgs
+                GROUP BY ecosystem_id, organization_id
+            ), devs AS (
+                SELECT ro.ecosystem_id, ro.organization_id, {_dev_cols("la")}
+                FROM {LAST_ACTIVE_TABLE} la
+                JOIN repo_orgs ro ON ro.repo_id = la.repo_id
+                WHERE la.last_active_day > $as_of - {max(WINDOWS)}
+                GROUP BY ro.ecosystem_id, ro.organization_id
+            ), linked AS (
+                SELECT ecosystem_id, organization_id, bool_or(is_first_party) AS is_first_party
+                FROM ecosystems_organizations
+                GROUP BY ecosystem_id, organization_id
+            )
+            SELECT coalesce(t.ecosystem_id, l.ecosystem_id) AS ecosystem_id,
+                   coalesce(t.organization_id, l.organization_id) AS organization_id,
+                   coalesce(l.is_first_party, false) AS is_first_party,
+                   coalesce(t.repos, 0) AS repos,
+                   coalesce(t.stars, 0) AS stars,
+                   coalesce(t.forks, 0) AS forks,
+                   {_coalesced_dev_cols("d")}
+            FROM totals t
+            LEFT JOIN devs d ON d.ecosystem_id = t.ecosystem_id AND d.organization_id = t.organization_id
+            FULL OUTER JOIN linked l ON l.ecosystem_id = t.ecosystem_id AND l.organization_id = t.organization_id
+            ORDER BY ecosystem_id, organization_id
+        """, {"as_of": as_of})
+        run_statement(conn, f"CREATE INDEX {ECO_ORG_TABLE}_org_idx ON {ECO_ORG_TABLE} (organization_id)")
+        run_statement(conn, f"""
+            CREATE OR REPLACE TABLE {ORG_TABLE} AS
+            WITH totals AS (
+                SELECT organization_id,
+                       count(*) AS repos,
+                       CAST(coalesce(sum(num_stars), 0) AS BIGINT) AS stars,
+                       CAST(coalesce(sum(num_forks), 0) AS BIGINT) AS forks
+                FROM repos
+                WHERE organization_id IS NOT NULL
+                GROUP BY organization_id
+            ), devs AS (
+                SELECT r.organization_id, {_dev_cols("la")}
+                FROM {LAST_ACTIVE_TABLE} la
+                JOIN repos r ON r.id = la.repo_id
+                WHERE la.last_active_day > $as_of - {max(WINDOWS)} AND r.organization_id IS NOT NULL
+                GROUP BY r.organization_id
+            ), ecos AS (
+                SELECT organization_id,
+                       count(*) FILTER (WHERE repos > 0) AS ecosystems,
+                       count(*) FILTER (WHERE is_first_party) AS first_party_ecosystems
+                FROM {ECO_ORG_TABLE}
+                GROUP BY organization_id
+            )
+            SELECT o.id AS organization_id,
+                   coalesce(t.repos, 0) AS repos,
+                   coalesce(t.stars, 0) AS stars,
+                   coalesce(t.forks, 0) AS forks,
+                   {_coalesced_dev_cols("d")},
+                   coalesce(e.ecosystems, 0) AS ecosystems,
+                   coalesce(e.first_party_ecosystems, 0) AS first_party_ecosystems,
+                   $as_of AS as_of_day
+            FROM organizations o
+            LEFT JOIN totals t ON t.organization_id = o.id
+            LEFT JOIN devs d ON d.organization_id = o.id
+            LEFT JOIN ecos e ON e.organization_id = o.id
+            ORDER BY o.id
+        """, {"as_of": as_of})
+        eco_orgs = run_statement(conn, f"SELECT count(*) FROM {ECO_ORG_TABLE}")[0][0]
+        orgs = run_statement(conn, f"SELECT count(*) FROM {ORG_TABLE}")[0][0]
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+    return {"ecosystem_organizations": eco_orgs, "organizations": orgs, "as_of_day": as_of}
+
+
+def _order(sort_by: str, prefix: str) -> str:
+    if sort_by not in ORG_SORT_COLUMNS:
+        raise ValueError(f"sort_by must be one of {', '.join(ORG_SORT_COLUMNS)}")
+    return f"{prefix}.{sort_by} DESC"
+
+
+def _stat_cols(alias: str) -> str:
+    return ", ".join(f"{alias}.{c}" for c in ORG_SORT_COLUMNS)
+
+
+def ecosystem_organizations(
+    conn,
+    ecosystem_id: int,
+    *,
+    sort_by: str = "active_devs_90d",
+    first_party_only: bool = False,
+    limit: int = 20,
+) -> list[dict]:
+    """Organizations in an ecosystem ranked by sort_by (repos, stars, forks or active_devs_{28,90,365}d)."""
+    where = "s.ecosystem_id = ?"
+    if first_party_only:
+        where += " AND s.is_first_party"
+    query = f"""
+        SELECT s.organization_id, o.name, o.link, s.is_first_party, {_stat_cols("s")}
+        FROM {ECO_ORG_TABLE} s
+        LEFT JOIN organizations o ON o.id = s.organization_id
+        WHERE {where}
+        ORDER BY {_order(sort_by, "s")}, s.organization_id
+        LIMIT ?
+    """
+    with derived_table_hint(ECO_ORG_TABLE, "refresh_organization_stats"):
+        return fetch_all_dicts(conn, query, [ecosystem_id, limit])
+
+
+def organization_ecosystems(
+    conn,
+    organization_id: int,
+    *,
+    sort_by: str = "repos",
+    limit: int = 100,
+) -> list[dict]:
+    """An organization's footprint: the ecosystems it has repos in (or is linked to), ranked by sort_by."""
+    query = f"""
+        SELECT s.ecosystem_id, e.name, s.is_first_party, {_stat_cols("s")}
+        FROM {ECO_ORG_TABLE} s
+        LEFT JOIN ecosystems e ON e.id = s.ecosystem_id
+        WHERE s.organization_id = ?
+        ORDER BY {_order(sort_by, "s")}, s.ecosystem_id
+        LIMIT ?
+    """
+    with derived_table_hint(ECO_ORG_TABLE, "refresh_organization_stats"):
+        return fetch_all_dicts(conn, query, [organization_id, limit])
+
+
+def get_organization(conn, organization_id: int) -> dict | None:
+    """Organization row with its totals across all repos and ecosystems."""
+    query = f"""
+        SELECT o.id, o.name, o.link, {_stat_cols("s")}, s.ecosystems, s.first_party_ecosystems, s.as_of_day
+        FROM organizations o
+        LEFT JOIN {ORG_TABLE} s ON s.organization_id = o.id
+        WHERE o.id = ?
+    """
+    with derived_table_hint(ORG_TABLE, "refresh_organization_stats"):
+        return fetch_one_dict(conn, query, [organization_id])
+
+
+def top_organizations(conn, *, sort_by: str = "active_devs_90d", limit: int = 20) -> list[dict]:
+    """Organizations across all ecosystems ranked by sort_by."""
+    query = f"""
+        SELECT s.organization_id, o.name, o.link, {_stat_cols("s")}, s.ecosystems
+        FROM {ORG_TABLE} s
+        JOIN organizations o ON o.id = s.organization_id
+        ORDER BY {_order(sort_by, "s")}, s.organization_id
+        LIMIT ?
+    """
+    with derived_table_hint(ORG_TABLE, "refresh_organization_stats"):
+        return fetch_all_dicts(conn, query, [limit])
@@ -0,0 +1,176 @@
+"""Partitioned Parquet export of the large eco tables and a Parquet-backed read path.
+
+The exporter writes ``eco_mads``, ``eco_developer_activities``,
+``eco_developer_contribution_ranks`` and ``eco_developer_tenures`` as
+hive-partitioned Parquet (``<table>/ecosystem_bucket=<n>/*.parquet``), each file
+sorted by ``(ecosystem_id, day)``. Every other table is written as a single
+Parquet file. ``attach_parquet_views`` recreates the original table names as
+views, so the ecosystem/developer APIs run unchanged against the export. The
+views glob every bucket. Each partitioned table also gets a
+``<table>_for_ecosystem(ecosystem_id)`` table macro, which filters on the bucket
+column as well and reads only that ecosystem's bucket; the per-ecosystem API
+reads go through ``ecosystem_rows``, which uses the macro on such a connection.
+"""
+
+import json
+import os
+import shutil
+import weakref
+
+from ._db_utils import run_statement
+
+PARTITIONED_TABLES = (
+    "eco_mads",
+    "eco_developer_activities",
+    "eco_developer_contribution_ranks",
+    "eco_developer_tenures",
+)
+PARTITION_COLUMN = "ecosystem_bucket"
+# <table><suffix>(ecosystem_id): table macro over a single bucket of a partitioned table.
+ECOSYSTEM_MACRO_SUFFIX = "_for_ecosystem"
+DEFAULT_NUM_BUCKETS = 64
+MANIFEST_FILENAME = "manifest.json"
+
+# Connection -> tables attach_parquet_views made partitioned views (and macros) for.
+_partitioned_conns: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+
+def _quote_path(path: str) -> str:
+    return "'" + path.replace("'", "''") + "'"
+
+
+def _list_tables(conn) -> list[str]:
+    rows = run_statement(
+        conn,
+        "SELECT table_name FROM duckdb_tables() "
+        "WHERE database_name = current_database() AND schema_name = 'main' AND NOT temporary "
+        "ORDER BY table_name"
+    )
+    return [r[0] for r in rows]
+
+
+def export_partitioned_parquet(
+    conn,
+    output_dir: str,
+    *,
+    tables: tuple[str, ...] = PARTITIONED_TABLES,
+    num_buckets: int = DEFAULT_NUM_BUCKETS,
+    include_other_tables: bool = True,
+) -> dict:
+    """Export the large eco tables to hive-partitioned Parquet and write a manifest.
+
+    Rows go to bucket ``ecosystem_id % num_buckets`` and are sorted by
+    ``(ecosystem_id, day)`` within each file. With ``include_other_tables`` every
+    remaining table is written as ``<table>.parquet`` so the export is
+    self-contained. Existing output for the exported tables is replaced.
+    Returns the manifest dict.
+    """
+    if num_buckets < 1:
+        raise ValueError("num_buckets must be >= 1")
+    existing = _list_tables(conn)
+    missing = [t for t in tables if t not in existing]
+    if missing:
+        raise ValueError(f"Tables not found: {', '.join(missing)}")
+
+    os.makedirs(output_dir, exist_ok=True)
+    for table in tables:
+        table_dir = os.path.join(output_dir, table)
+        if os.path.isdir(table_dir):
+            shutil.rmtree(table_dir)
+        run_statement(conn, f"""
+            COPY (
+                SELECT *, ecosystem_id % {int(num_buckets)} AS {PARTITION_COLUMN}
+                FROM {table}
+                ORDER BY ecosystem_id, day
+            ) TO {_quote_path(table_dir)} (FORMAT parquet, PARTITION_BY ({PARTITION_COLUMN}))
+        """)
+
+    other_tables: list[str] = []
+    if include_other_tables:
+        for table in existing:
+            if table in tables:
+                continue
+            run_statement(
+                conn,
+                f"COPY {table} TO {_quote_path(os.path.join(output_dir, f'{table}.parquet'))} (FORMAT parquet)"
+            )
+            other_tables.append(table)
+
+    manifest = {
+        "format_version": 1,
+        "partition_column": PARTITION_COLUMN,
+        "num_buckets": num_buckets,
+        "partitioned_tables": list(tables),
+        "tables": other_tables,
+    }
+    with open(os.path.join(output_dir, MANIFEST_FILENAME), "w") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def read_manifest(parquet_dir: str) -> dict:
+    """Load the manifest written by export_partitioned_parquet."""
+    path = os.path.join(parquet_dir, MANIFEST_FILENAME)
+    if not os.path.isfile(path):
+        raise FileNotFoundError(f"No {MANIFEST_FILENAME} in {parquet_dir}")
+    with open(path) as f:
+        return json.load(f)
+
+
+def attach_parquet_views(conn, parquet_dir: str) -> list[str]:
+    """Create one view per exported table so queries read the Parquet files.
+
+    Partitioned tables hide the bucket column so the views match the original
+    table schemas. For each of them a ``<table>_for_ecosystem(ecosystem_id)``
+    table macro with the same columns is created as well; it filters on
+    ``ecosystem_bucket = ecosystem_id % num_buckets`` so only that bucket's files
+    are opened, and ecosystem_rows uses it for this connection from then on.
+    Returns the names of the views created.
+    """
+    manifest = read_manifest(parquet_dir)
+    partition_column = manifest["partition_column"]
+    num_buckets = int(manifest["num_buckets"])
+    # Footers are re-read on every query otherwise; cache them for the connection.
+    conn.execute("SET parquet_metadata_cache = true")
+    created = []
+    for table in manifest["partitioned_tables"]:
+        pattern = os.path.join(parquet_dir, table, "*", "*.parquet")
+        run_statement(conn, f"""
+            CREATE OR REPLACE VIEW {table} AS
+            SELECT * EXCLUDE ({partition_column})
+            FROM read_parquet({_quote_path(pattern)}, hive_partitioning = true)
+        """)
+        # A filter on ecosystem_id alone cannot prune hive partitions; the macro
+        # adds the matching bucket constant.
+        run_statement(conn, f"""
+            CREATE OR REPLACE MACRO {table}{ECOSYSTEM_MACRO_SUFFIX}(eco) AS TABLE
+            SELECT * EXCLUDE ({partition_column})
+            FROM read_parquet({_quote_path(pattern)}, hive_partitioning = true)
+            WHERE {partition_column} = eco % {num_buckets} AND ecosystem_id = eco
+        """)
+        created.append(table)
+    for table in manifest["tables"]:
+        path = os.path.join(parquet_dir, f"{table}.parquet")
+        run_statement(conn, f"CREATE OR REPLACE VIEW {table} AS SELECT * FROM read_parquet({_quote_path(path)})")
+        created.append(table)
+    _partitioned_conns[conn] = frozenset(manifest["partitioned_tables"])
+    return created
+
+
+def ecosystem_rows(conn, table: str, ecosystem_id: str = "?") -> str:
+    """FROM item with the rows of one ecosystem in table.
+
+    ecosystem_id is the SQL for the id (a ``?`` or ``$name`` parameter) and
+    appears exactly once, so queries bind the same parameters on every
+    backend. On a connection set up by attach_parquet_views this is the
+    table's ``_for_ecosystem`` macro, which opens only that ecosystem's bucket;
+    a filter on ecosystem_id alone cannot prune hive partitions.
+    """
+    if is_bucketed(conn, table):
+        return f"{table}{ECOSYSTEM_MACRO_SUFFIX}({ecosystem_id})"
+    return f"(SELECT * FROM {table} WHERE ecosystem_id = {ecosystem_id})"
+
+
+def is_bucketed(conn, table: str) -> bool:
+    """Whether conn reads table from ecosystem buckets sorted by (ecosystem_id, day)."""
+    return conn in _partitioned_conns and table in _partitioned_conns[conn]
@@ -0,0 +1,112 @@
+"""Per-(ecosystem, day) distribution of contribution points for percentile lookups.
+
+``points`` is a UTINYINT, so a day of an ecosystem has at most 256 distinct
+values. ``eco_points_percentiles`` stores, per (ecosystem, day), the distinct
+values in ascending order and how many ranked developers score at or below
+each. This is an exact quantile sketch that is usually only a few dozen
+entries long. A developer's percentile is one list lookup on the row of their
+(ecosystem, day), so ``developers_in_ecosystem(include_percentile=True)`` and
+``get_developer_profile(ecosystem_id=...)`` never sort an ecosystem's ranks.
+
+``refresh_points_percentiles`` adds the days after the stored watermark.
+"""
+
+from bisect import bisect_right
+from datetime import date
+
+from ._db_utils import (
+    derived_table_hint,
+    fetch_one_dict,
+    get_refresh_watermark,
+    run_statement,
+    set_refresh_watermark,
+)
+
+PERCENTILE_TABLE = "eco_points_percentiles"
+_WATERMARK = f"{PERCENTILE_TABLE}.contribution_ranks"
+
+
+def percentile_expr(alias: str, points: str) -> str:
+    """SQL for the share (0-100) of developers at or below ``points`` on the PERCENTILE_TABLE row ``alias``."""
+    return f"100.0 * {alias}.at_or_below[list_position({alias}.points_values, {points})] / {alias}.developers"
+
+
+def _create_table(conn) -> None:
+    run_statement(conn, f"""
+        CREATE TABLE IF NOT EXISTS {PERCENTILE_TABLE} (
+            ecosystem_id INTEGER,
+            day DATE,
+            developers UBIGINT,
+            points_values UTINYINT[],
+            at_or_below UBIGINT[],
+            PRIMARY KEY (ecosystem_id, day)
+        )
+    """)
+
+
+def refresh_points_percentiles(conn) -> dict:
+    """Add a row per (ecosystem, day) after the watermark; returns rows written and the new watermark."""
+    _create_table(conn)
+    old = get_refresh_watermark(conn, _WATERMARK)
+    new = run_statement(conn, "SELECT max(day) FROM eco_developer_contribution_ranks")[0][0]
+    rows = 0
+    if new is None or (old is not None and new <= old):
+        return {"rows": rows, "watermark": old}
+    conn.execute("BEGIN TRANSACTION")
+    try:
+        rows = run_statement(conn, f"""
+            INSERT OR REPLACE INTO {PERCENTILE_TABLE}
+            SELECT ecosystem_id, day, sum(n),
+                   list(points ORDER BY points), list(at_or_below ORDER BY points)
+            FROM (
+                SELECT ecosystem_id, day, points, n,
+                       sum(n) OVER (PARTITION BY ecosystem_id, day ORDER BY points) AS at_or_below
+                FROM (
+                    SELECT ecosystem_id, day, points, count(*) AS n
+                    FROM eco_developer_contribution_ranks
+                    WHERE day > coalesce(?::DATE, DATE '0001-01-01') AND day <= ? AND points IS NOT NULL
+                    GROUP BY ecosystem_id, day, points
+                )
+            )
+            GROUP BY ecosystem_id, day
+            ORDER BY ecosystem_id, day
+        """, [old, new])[0][0]
+        set_refresh_watermark(conn, _WATERMARK, new)
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+    return {"rows": rows, "watermark": new}
+
+
+def points_percentile_curve(conn, ecosystem_id: int, *, day: date | None = None) -> dict | None:
+    """Points distribution of an ecosystem on day (default: its latest day), or None if absent.
+
+    Returns ``developers`` ranked that day, the distinct ``points`` values in
+    ascending order and, per value, the ``percentiles`` (0-100) of developers
+    scoring at or below it.
+    """
+    params: list = [ecosystem_id]
+    if day is None:
+        day_sql = f"(SELECT max(day) FROM {PERCENTILE_TABLE} WHERE ecosystem_id = ?)"
+        params.append(ecosystem_id)
+    else:
+        day_sql = "?"
+        params.append(day)
+    query = f"""
+        SELECT ecosystem_id, day, developers, points_values AS points,
+               list_transform(at_or_below, c -> 100.0 * c / developers) AS percentiles
+        FROM {PERCENTILE_TABLE}
+        WHERE ecosystem_id = ? AND day = {day_sql}
+    """
+    with derived_table_hint(PERCENTILE_TABLE, "refresh_points_percentiles"):
+        return fetch_one_dict(conn, query, params)
+
+
+def points_percentile(conn, ecosystem_id: int, points: int, *, day: date | None = None) -> float | None:
+    """Share (0-100) of an ecosystem's ranked developers with at most ``points`` on day (default: latest)."""
+    curve = points_percentile_curve(conn, ecosystem_id, day=day)
+    if curve is None:
+        return None
+    i = bisect_right(curve["points"], points)
+    return curve["percentiles"][i - 1] if i else 0.0
@@ -0,0 +1,244 @@
+"""Contribution-rank changes of an ecosystem's developers between two days.
+
+A diff reads two (ecosystem, day) slices of the contribution ranks. Each day is
+read by its own scan filtered on ecosystem_id and day, and both filters reach
+the table scan. The two slices are concatenated and grouped by developer, which
+merges them without a join; the group is only as large as the two slices. Each
+developer is classified into one of ``CHANGE_CATEGORIES``. ``joined`` and
+``left`` are relative to day_a, and ``promoted`` / ``demoted`` follow
+``RANK_ORDER``. ``contribution_rank_diff`` materializes the diff once for the
+counts and the first page. ``iter_contribution_rank_diff`` streams every change
+from a cursor in batches.
+
+Where the slices are read from depends on the backend:
+
+- Parquet (``OpenDevData.from_parquet``): ``eco_developer_contribution_ranks``
+  is read directly. export_partitioned_parquet already wrote it into ecosystem
+  buckets sorted by (ecosystem_id, day), so no extra table is needed.
+- DuckDB file: ``eco_developer_contribution_ranks`` carries no ordering
+  guarantee, so a slice may touch row groups of many days.
+  ``eco_contribution_rank_days`` keeps the five columns a diff needs.
+  Each ``refresh_contribution_rank_days`` run appends only the days newer
+  than its watermark, sorted by (ecosystem_id, day, developer), so a slice
+  sits in few row groups with narrow zonemaps.
+
+That copy costs about 3 bytes per source row: 97 vs 147 compressed blocks
+(+17 MiB of file) on the 8.3M-row bench database, or roughly 11 GB at 3.7B
+rows. Diffs of the five largest ecosystems took 4.1 ms p50 from the copy. They
+took 64 ms from a source table whose rows were not in day order, and 3.6 ms
+from one that happened to be. Clustering the source in place would mean
+rewriting all of it on every ingest.
+"""
+
+import time
+from collections.abc import Iterator
+from datetime import date
+from typing import Any
+
+from ._db_utils import (
+    derived_table_hint,
+    fetch_one_dict,
+    get_refresh_watermark,
+    run_statement,
+    set_refresh_watermark,
+)
+from .instrumentation import record_query
+from .partitioned import ecosystem_rows, is_bucketed
+
+RANK_DAYS_TABLE = "eco_contribution_rank_days"
+_SOURCE_TABLE = "eco_developer_contribution_ranks"
+_WATERMARK = f"{RANK_DAYS_TABLE}.contribution_ranks"
+
+CHANGE_CATEGORIES = ("joined", "left", "promoted", "demoted", "unchanged")
+DEFAULT_CATEGORIES = ("joined", "left", "promoted", "demoted")
+# Lowest to highest; any other rank (or NULL) sorts below one_time.
+RANK_ORDER = ("one_time", "part_time", "full_time")
+
+_RANK_LEVEL = "CASE {col} " + " ".join(f"WHEN '{r}' THEN {i + 1}" for i, r in enumerate(RANK_ORDER)) + " ELSE 0 END"
+_CATEGORY_ORDER = "CASE change " + " ".join(f"WHEN '{c}' THEN {i}" for i, c in enumerate(CHANGE_CATEGORIES)) + " END"
+_ORDER_BY = f"{_CATEGORY_ORDER}, abs(points_delta) DESC, {{id_col}}"
+
+_DIFF_CTE = f"""
+    WITH merged AS (
+        SELECT canonical_developer_id,
+               bool_or(NOT is_b) AS in_a,
+               bool_or(is_b) AS in_b,
+               any_value(contribution_rank) FILTER (WHERE NOT is_b) AS rank_a,
+               any_value(contribution_rank) FILTER (WHERE is_b) AS rank_b,
+               any_value(points) FILTER (WHERE NOT is_b) AS points_a,
+               any_value(points) FILTER (WHERE is_b) AS points_b
+        FROM (
+            SELECT canonical_developer_id, contribution_rank, points, false AS is_b
+            FROM {{ranks}}
+            WHERE day = $day_a
+            UNION ALL
+            SELECT canonical_developer_id, contribution_rank, points, true AS is_b
+            FROM {{ranks}}
+            WHERE day = $day_b
+        )
+        GROUP BY canonical_developer_id
+    ),
+    diff AS MATERIALIZED (
+        SELECT canonical_developer_id,
+               CASE
+                   WHEN NOT in_a THEN 'joined'
+                   WHEN NOT in_b THEN 'left'
+                   WHEN {_RANK_LEVEL.format(col="rank_b")} > {_RANK_LEVEL.format(col="rank_a")} THEN 'promoted'
+                   WHEN {_RANK_LEVEL.format(col="rank_b")} < {_RANK_LEVEL.format(col="rank_a")} THEN 'demoted'
+                   ELSE 'unchanged'
+               END AS change,
+               rank_a, rank_b, points_a, points_b,
+               coalesce(points_b::INTEGER, 0) - coalesce(points_a::INTEGER, 0) AS points_delta
+        FROM merged
+    )
+"""
+
+
+def _diff_cte(conn) -> str:
+    """_DIFF_CTE over the bucketed source on a Parquet connection, else over RANK_DAYS_TABLE."""
+    table = _SOURCE_TABLE if is_bucketed(conn, _SOURCE_TABLE) else RANK_DAYS_TABLE
+    return _DIFF_CTE.format(ranks=ecosystem_rows(conn, table, "$ecosystem_id"))
+
+
+def _create_table(conn) -> None:
+    run_statement(conn, f"""
+        CREATE TABLE IF NOT EXISTS {RANK_DAYS_TABLE} (
+            ecosystem_id INTEGER,
+            day DATE,
+            canonical_developer_id INTEGER,
+            points UTINYINT,
+            contribution_rank VARCHAR
+        )
+    """)
+
+
+def refresh_contribution_rank_days(conn) -> dict:
+    """Append the rank days after the watermark, sorted by (ecosystem_id, day); returns rows added.
+
+    A no-op on a Parquet connection, where diffs read the bucketed source directly.
+    """
+    if is_bucketed(conn, _SOURCE_TABLE):
+        return {"rows": 0, "watermark": None}
+    _create_table(conn)
+    old = get_refresh_watermark(conn, _WATERMARK)
+    new = run_statement(conn, f"SELECT max(day) FROM {_SOURCE_TABLE}")[0][0]
+    rows = 0
+    if new is None or (old is not None and new <= old):
+        return {"rows": rows, "watermark": old}
+    conn.execute("BEGIN TRANSACTION")
+    try:
+        rows = run_statement(conn, f"""
+            INSERT INTO {RANK_DAYS_TABLE} (ecosystem_id, day, canonical_developer_id, points, contribution_rank)
+            SELECT ecosystem_id, day, canonical_developer_id, points, contribution_rank
+            FROM {_SOURCE_TABLE}
+            WHERE day > coalesce(?::DATE, DATE '0001-01-01') AND day <= ?
+            ORDER BY ecosystem_id, day, canonical_developer_id
+        """, [old, new])[0][0]
+        set_refresh_watermark(conn, _WATERMARK, new)
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+    return {"rows": rows, "watermark": new}
+
+
+def _params(ecosystem_id: int, day_a: date, day_b: date) -> dict[str, Any]:
+    return {"ecosystem_id": ecosystem_id, "day_a": day_a, "day_b": day_b}
+
+
+def _changes_query(categories: tuple[str, ...] | list[str] | None, include_user_info: bool) -> str:
+    """Changes in the given categories (no WITH clause), by category, largest points move and developer id."""
+    categories = DEFAULT_CATEGORIES if categories is None else tuple(categories)
+    unknown = set(categories) - set(CHANGE_CATEGORIES)
+    if unknown:
+        raise ValueError(f"Unknown categories {sorted(unknown)}; expected some of {', '.join(CHANGE_CATEGORIES)}")
+    user_cols = ", u.login, u.name" if include_user_info else ""
+    user_join = (
+        "LEFT JOIN user_info u ON u.canonical_developer_id = diff.canonical_developer_id"
+        if include_user_info else ""
+    )
+    in_list = ", ".join(f"'{c}'" for c in categories) or "NULL"
+    return f"""
+        SELECT diff.*{user_cols}
+        FROM diff
+        {user_join}
+        WHERE change IN ({in_list})
+        ORDER BY {_ORDER_BY.format(id_col="diff.canonical_developer_id")}
+    """
+
+
+def contribution_rank_diff(
+    conn,
+    ecosystem_id: int,
+    day_a: date,
+    day_b: date,
+    *,
+    categories: tuple[str, ...] | list[str] | None = None,
+    include_user_info: bool = True,
+    limit: int = 100,
+) -> dict:
+    """Developers who joined, left, were promoted, demoted or kept their rank between day_a and day_b.
+
+    ``counts`` has every category of CHANGE_CATEGORIES. ``changes`` lists up to
+    limit developers in ``categories`` (default: all but unchanged) with
+    rank_a / rank_b, points_a / points_b and points_delta (missing side counts
+    as 0), ordered by category, largest points move and id. Both come from one
+    query over the materialized diff. On a DuckDB file this requires
+    refresh_contribution_rank_days.
+    """
+    query = f"""
+        {_diff_cte(conn)},
+        page AS ({_changes_query(categories, include_user_info)} LIMIT $limit)
+        SELECT (SELECT list(struct_pack(change := change, n := n))
+                FROM (SELECT change, count(*) AS n FROM diff GROUP BY change)) AS counts,
+               (SELECT list(page ORDER BY {_ORDER_BY.format(id_col="canonical_developer_id")}) FROM page) AS changes
+    """
+    with derived_table_hint(RANK_DAYS_TABLE, "refresh_contribution_rank_days"):
+        row = fetch_one_dict(conn, query, {**_params(ecosystem_id, day_a, day_b), "limit": limit})
+    counts = {c: 0 for c in CHANGE_CATEGORIES}
+    for c in row["counts"] or []:
+        counts[c["change"]] = c["n"]
+    return {
+        "ecosystem_id": ecosystem_id,
+        "day_a": day_a,
+        "day_b": day_b,
+        "counts": counts,
+        "changes": row["changes"] or [],
+    }
+
+
+def iter_contribution_rank_diff(
+    conn,
+    ecosystem_id: int,
+    day_a: date,
+    day_b: date,
+    *,
+    categories: tuple[str, ...] | list[str] | None = None,
+    include_user_info: bool = True,
+    batch_size: int = 10_000,
+) -> Iterator[list[dict]]:
+    """Yield every change of contribution_rank_diff (no limit) in batches of up to batch_size dicts.
+
+    Like iter_developers_in_ecosystem, the query runs on its own cursor and
+    only one batch is held in memory at a time.
+    """
+    if batch_size < 1:
+        raise ValueError("batch_size must be >= 1")
+    query = _diff_cte(conn) + _changes_query(categories, include_user_info)
+    params = _params(ecosystem_id, day_a, day_b)
+    start = time.perf_counter()
+    total = 0
+    cursor = conn.cursor()
+    try:
+        with derived_table_hint(RANK_DAYS_TABLE, "refresh_contribution_rank_days"):
+            result = cursor.execute(query, params)
+        cols = [d[0] for d in result.description]
+        while True:
+            rows = result.fetchmany(batch_size)
+            if not rows:
+                break
+            total += len(rows)
+            yield [dict(zip(cols, row)) for row in rows]
+    finally:
+        cursor.close()
+        record_query(conn, query, params, (time.perf_counter() - start) * 1000, total)
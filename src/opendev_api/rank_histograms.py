@@ -0,0 +1,100 @@
+"""Daily contribution-rank distribution per ecosystem (rank counts and points histogram).
+
+``eco_rank_histograms`` has one row per (ecosystem, day) with the number of
+full_time / part_time / one_time developers and a histogram of ``points`` in
+power-of-two buckets (``POINTS_BUCKETS``). It is as small as ``eco_mads``, so
+charting the rank mix over time never touches ``eco_developer_contribution_ranks``.
+
+``refresh_rank_histograms`` appends the days after the stored watermark,
+splitting them into day ranges that are aggregated concurrently on separate
+cursors. Rows are written with INSERT OR REPLACE, so a refresh interrupted
+midway can simply be re-run.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from ._db_utils import get_refresh_watermark, run_statement, set_refresh_watermark
+
+HISTOGRAM_TABLE = "eco_rank_histograms"
+_WATERMARK = f"{HISTOGRAM_TABLE}.contribution_ranks"
+
+# (column, lowest points, highest points) for each histogram bucket.
+POINTS_BUCKETS = (
+    ("points_0", 0, 0),
+    ("points_1", 1, 1),
+    ("points_2_3", 2, 3),
+    ("points_4_7", 4, 7),
+    ("points_8_15", 8, 15),
+    ("points_16_31", 16, 31),
+    ("points_32_63", 32, 63),
+    ("points_64_127", 64, 127),
+    ("points_128_255", 128, 255),
+)
+
+
+def _create_table(conn) -> None:
+    bucket_cols = ",\n".join(f"{name} UBIGINT" for name, _, _ in POINTS_BUCKETS)
+    run_statement(conn, f"""
+        CREATE TABLE IF NOT EXISTS {HISTOGRAM_TABLE} (
+            ecosystem_id INTEGER,
+            day DATE,
+            ranked_devs UBIGINT,
+            full_time_devs UBIGINT,
+            part_time_devs UBIGINT,
+            one_time_devs UBIGINT,
+            points_sum UBIGINT,
+            {bucket_cols},
+            PRIMARY KEY (ecosystem_id, day)
+        )
+    """)
+
+
+def _insert_range(conn, start, end) -> int:
+    bucket_aggs = ",\n".join(
+        f"count(*) FILTER (WHERE points BETWEEN {lo} AND {hi}) AS {name}" for name, lo, hi in POINTS_BUCKETS
+    )
+    cursor = conn.cursor()
+    try:
+        return run_statement(cursor, f"""
+            INSERT OR REPLACE INTO {HISTOGRAM_TABLE}
+            SELECT ecosystem_id, day,
+                   count(*) AS ranked_devs,
+                   count(*) FILTER (WHERE contribution_rank = 'full_time') AS full_time_devs,
+                   count(*) FILTER (WHERE contribution_rank = 'part_time') AS part_time_devs,
+                   count(*) FILTER (WHERE contribution_rank = 'one_time') AS one_time_devs,
+                   coalesce(sum(points), 0) AS points_sum,
+                   {bucket_aggs}
+            FROM eco_developer_contribution_ranks
+            WHERE day BETWEEN ? AND ?
+            GROUP BY ecosystem_id, day
+            ORDER BY ecosystem_id, day
+        """, [start, end])[0][0]
+    finally:
+        cursor.close()
+
+
+def refresh_rank_histograms(conn, *, chunk_days: int = 31, max_workers: int = 4) -> dict:
+    """Append histogram rows for days after the watermark; returns rows written and the new watermark."""
+    if chunk_days < 1 or max_workers < 1:
+        raise ValueError("chunk_days and max_workers must be >= 1")
+    _create_table(conn)
+    old = get_refresh_watermark(conn, _WATERMARK)
+    first, last = run_statement(
+        conn,
+        "SELECT min(day), max(day) FROM eco_developer_contribution_ranks WHERE day > coalesce(?::DATE, DATE '0001-01-01')",
+        [old],
+    )[0]
+    if last is None:
+        return {"rows": 0, "watermark": old}
+
+    ranges = []
+    start = first
+    while start <= last:
+        end = min(start + timedelta(days=chunk_days - 1), last)
+        ranges.append((start, end))
+        start = end + timedelta(days=1)
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        rows = sum(pool.map(lambda r: _insert_range(conn, *r), ranges))
+    set_refresh_watermark(conn, _WATERMARK, last)
+    return {"rows": rows, "watermark": last}
@@ -0,0 +1,118 @@
+"""Precomputed per-repo activity (commits and active developers over 28/90/365 days).
+
+Ranking repos by activity from ``repo_developer_activities`` per request would
+scan hundreds of millions of rows. ``refresh_repo_activity_stats`` keeps two
+compact rollups up to date incrementally:
+
+- ``repo_daily_commits``: commits per (repo, day) for the last 365 days;
+- ``repo_developer_last_active``: last active day per (repo, developer);
+
+and derives ``repo_activity_stats`` (one row per repo) from them without
+touching the raw activity table again. ``repos_in_ecosystem`` and
+``top_repos_in_ecosystem`` join that table for ``sort_by="activity"``.
+"""
+
+from datetime import timedelta
+
+from ._db_utils import get_refresh_watermark, run_statement, set_refresh_watermark
+
+STATS_TABLE = "repo_activity_stats"
+DAILY_TABLE = "repo_daily_commits"
+LAST_ACTIVE_TABLE = "repo_developer_last_active"
+WINDOWS = (28, 90, 365)
+_WATERMARK = f"{STATS_TABLE}.repo_developer_activities"
+
+
+def _create_tables(conn) -> None:
+    run_statement(conn, f"""
+        CREATE TABLE IF NOT EXISTS {DAILY_TABLE} (
+            repo_id INTEGER,
+            day DATE,
+            num_commits HUGEINT,
+            PRIMARY KEY (repo_id, day)
+        )
+    """)
+    run_statement(conn, f"""
+        CREATE TABLE IF NOT EXISTS {LAST_ACTIVE_TABLE} (
+            repo_id INTEGER,
+            canonical_developer_id INTEGER,
+            last_active_day DATE,
+            PRIMARY KEY (repo_id, canonical_developer_id)
+        )
+    """)
+
+
+def refresh_repo_activity_stats(conn) -> dict:
+    """Fold new repo_developer_activities days into the rollups and rebuild repo_activity_stats.
+
+    Only rows after the stored watermark are read from the raw table; the
+    stats table is then recomputed from the rollups as of the newest day.
+    """
+    _create_tables(conn)
+    old = get_refresh_watermark(conn, _WATERMARK)
+    new = run_statement(conn, "SELECT max(day) FROM repo_developer_activities")[0][0]
+    if new is None:
+        return {"repo_days": 0, "as_of_day": None, "repos": 0}
+
+    conn.execute("BEGIN TRANSACTION")
+    try:
+        repo_days = 0
+        if old is None or new > old:
+            # Days older than the widest window never contribute; skip them on the first build.
+            lower = old if old is not None else new - timedelta(days=max(WINDOWS))
+            repo_days = run_statement(conn, f"""
+                INSERT INTO {DAILY_TABLE} (repo_id, day, num_commits)
+                SELECT repo_id, day, sum(num_commits)
+                FROM repo_developer_activities
+                WHERE day > ? AND day <= ?
+                GROUP BY repo_id, day
+                ON CONFLICT (repo_id, day) DO UPDATE SET num_commits = num_commits + excluded.num_commits
+            """, [lower, new])[0][0]
+            run_statement(conn, f"""
+                INSERT INTO {LAST_ACTIVE_TABLE} (repo_id, canonical_developer_id, last_active_day)
+                SELECT repo_id, canonical_developer_id, max(day)
+                FROM repo_developer_activities
+                WHERE day > coalesce(?::DATE, DATE '0001-01-01') AND day <= ?
+                GROUP BY repo_id, canonical_developer_id
+                ON CONFLICT (repo_id, canonical_developer_id) DO UPDATE SET
+                    last_active_day = greatest(last_active_day, excluded.last_active_day)
+            """, [old, new])
+            run_statement(
+                conn,
+                f"DELETE FROM {DAILY_TABLE} WHERE day <= ?", [new - timedelta(days=max(WINDOWS))]
+            )
+            set_refresh_watermark(conn, _WATERMARK, new)
+
+        commit_cols = ",\n".join(
+            f"sum(num_commits) FILTER (WHERE day > $as_of - {w}) AS commits_{w}d" for w in WINDOWS
+        )
+        dev_cols = ",\n".join(
+            f"count(*) FILTER (WHERE last_active_day > $as_of - {w}) AS active_devs_{w}d" for w in WINDOWS
+        )
+        select_cols = ",\n".join(
+            f"coalesce(c.commits_{w}d, 0) AS commits_{w}d, coalesce(d.active_devs_{w}d, 0) AS active_devs_{w}d"
+            for w in WINDOWS
+        )
+        run_statement(conn, f"""
+            CREATE OR REPLACE TABLE {STATS_TABLE} AS
+            WITH c AS (
+                SELECT repo_id, {commit_cols}
+                FROM {DAILY_TABLE} GROUP BY repo_id
+            ), d AS (
+                SELECT repo_id, {dev_cols}
+                FROM {LAST_ACTIVE_TABLE}
+                WHERE last_active_day > $as_of - {max(WINDOWS)}
+                GROUP BY repo_id
+            )
+            SELECT coalesce(c.repo_id, d.repo_id) AS repo_id,
+                   $as_of AS as_of_day,
+                   {select_cols}
+            FROM c FULL OUTER JOIN d ON d.repo_id = c.repo_id
+            ORDER BY repo_id
+        """, {"as_of": new})
+        repos = run_statement(conn, f"SELECT count(*) FROM {STATS_TABLE}")[0][0]
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+    return {"repo_days": repo_days, "as_of_day": new, "repos": repos}
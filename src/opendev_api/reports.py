@@ -0,0 +1,240 @@
+"""Static per-ecosystem report bundles, generated on a process pool.
+
+Each bundle holds what an ecosystem's summary page shows (``REPORT_SECTIONS``:
+overview with latest MADs, hierarchy, top repos, a year of MADs and the top
+developers) and is written as ``<output_dir>/<ecosystem_id>.json`` (compact
+JSON) or ``.parquet`` (one row, one nested column per section, typed by
+``PARQUET_COLUMNS``).
+
+``generate_ecosystem_reports`` splits the ecosystems into chunks and fans them
+out to worker processes that each hold their own read-only connection, so the
+database must not be open read-write by another process while it runs. Files
+are written under a temporary name and renamed when complete; ecosystems whose
+report already exists are skipped, so an interrupted run picks up where it
+stopped.
+
+Run from the command line::
+
+    python -m opendev_api.reports data/opendev.duckdb reports/ --workers 8 --format parquet
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import duckdb
+
+from ._db_utils import run_statement
+from . import developers, ecosystems
+
+REPORT_FORMATS = ("json", "parquet")
+
+# (section, callable(conn, ecosystem_id)) included in every bundle.
+REPORT_SECTIONS = (
+    ("overview", lambda conn, eco: ecosystems.get_ecosystem(conn, eco, include_latest_mads=True)),
+    ("hierarchy", lambda conn, eco: ecosystems.ecosystem_hierarchy(conn, eco)),
+    ("top_repos", lambda conn, eco: ecosystems.top_repos_in_ecosystem(conn, eco, limit=20)),
+    ("mads", lambda conn, eco: ecosystems.ecosystem_mads_time_series(conn, eco, limit=365)),
+    ("top_developers", lambda conn, eco: developers.developers_in_ecosystem(conn, eco, limit=100)),
+)
+
+_LATEST_MADS_TYPE = (
+    "STRUCT(day DATE, all_devs UBIGINT, exclusive_devs UBIGINT, num_commits UBIGINT, "
+    "full_time_devs UBIGINT, part_time_devs UBIGINT, one_time_devs UBIGINT)"
+)
+_MADS_COUNTS = (
+    "all_devs", "exclusive_devs", "multichain_devs", "num_commits", "devs_0_1y", "devs_1_2y",
+    "devs_2y_plus", "one_time_devs", "part_time_devs", "full_time_devs",
+)
+
+# Column types of a .parquet bundle, taken from the source tables. Inferring them
+# from each bundle's JSON would type empty lists and all-NULL fields differently
+# per ecosystem, and drop struct fields that are NULL (e.g. overview.latest_mads).
+PARQUET_COLUMNS = {
+    "ecosystem_id": "INTEGER",
+    "overview": (
+        "STRUCT(id INTEGER, name VARCHAR, launch_date DATE, derived_launch_date DATE, "
+        "is_crypto UTINYINT, is_category UTINYINT, is_chain UTINYINT, is_multichain UTINYINT, "
+        f"latest_mads {_LATEST_MADS_TYPE})"
+    ),
+    "hierarchy": (
+        "STRUCT(parent_id INTEGER, parents STRUCT(parent_id INTEGER, parent_name VARCHAR)[], "
+        "children STRUCT(child_id INTEGER, child_name VARCHAR)[])"
+    ),
+    "top_repos": "STRUCT(id INTEGER, name VARCHAR, link VARCHAR, num_stars INTEGER, num_forks INTEGER)[]",
+    "mads": "STRUCT(day DATE, " + ", ".join(f"{c} UBIGINT" for c in _MADS_COUNTS) + ")[]",
+    "top_developers": (
+        "STRUCT(canonical_developer_id INTEGER, day DATE, points UTINYINT, points_28d UTINYINT, "
+        "points_56d UTINYINT, contribution_rank VARCHAR, login VARCHAR, name VARCHAR, company VARCHAR, "
+        "location VARCHAR, url VARCHAR, email VARCHAR)[]"
+    ),
+}
+_COLUMNS_SQL = "{" + ", ".join(f"'{name}': '{type_}'" for name, type_ in PARQUET_COLUMNS.items()) + "}"
+
+# Connection of the current worker process, opened by _init_worker.
+_worker_conn = None
+
+
+def report_path(output_dir: str, ecosystem_id: int, format: str = "json") -> str:
+    return os.path.join(output_dir, f"{ecosystem_id}.{format}")
+
+
+def build_report(conn, ecosystem_id: int) -> dict:
+    """Run every REPORT_SECTIONS call for one ecosystem; raises LookupError if it does not exist."""
+    bundle: dict = {"ecosystem_id": ecosystem_id}
+    for name, fn in REPORT_SECTIONS:
+        bundle[name] = fn(conn, ecosystem_id)
+        if name == "overview" and bundle[name] is None:
+            raise LookupError(f"No ecosystem {ecosystem_id}")
+    return bundle
+
+
+def write_report(conn, bundle: dict, output_dir: str, format: str = "json") -> str:
+    """Write a bundle atomically (temporary file + rename); returns the final path.
+
+    Parquet bundles always have the PARQUET_COLUMNS schema, so files of different
+    ecosystems can be read together.
+    """
+    path = report_path(output_dir, bundle["ecosystem_id"], format)
+    json_tmp = f"{path}.json.tmp"
+    with open(json_tmp, "w") as f:
+        json.dump(bundle, f, separators=(",", ":"), default=str)
+    if format == "json":
+        os.replace(json_tmp, path)
+        return path
+    tmp = f"{path}.tmp"
+    try:
+        # COPY cannot take bound file names, so the paths are quoted into the statement.
+        source = "'" + json_tmp.replace("'", "''") + "'"
+        target = "'" + tmp.replace("'", "''") + "'"
+        run_statement(
+            conn,
+            f"COPY (SELECT * FROM read_json({source}, format = 'auto', columns = {_COLUMNS_SQL})) "
+            f"TO {target} (FORMAT parquet, COMPRESSION zstd)"
+        )
+        os.replace(tmp, path)
+    except Exception:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+    finally:
+        os.remove(json_tmp)
+    return path
+
+
+def _init_worker(db_path: str, threads: int) -> None:
+    global _worker_conn
+    _worker_conn = duckdb.connect(db_path, read_only=True, config={"threads": threads})
+
+
+def _run_chunk(ecosystem_ids: list[int], output_dir: str, format: str) -> list[tuple[int, str | None]]:
+    results = []
+    for eco in ecosystem_ids:
+        try:
+            write_report(_worker_conn, build_report(_worker_conn, eco), output_dir, format)
+            results.append((eco, None))
+        except Exception as e:
+            # One broken ecosystem must not abort the run; it is retried on the next one.
+            results.append((eco, f"{type(e).__name__}: {e}"))
+    return results
+
+
+def generate_ecosystem_reports(
+    db_path: str,
+    output_dir: str,
+    *,
+    ecosystem_ids: list[int] | None = None,
+    format: str = "json",
+    workers: int | None = None,
+    chunk_size: int = 16,
+    overwrite: bool = False,
+    progress: bool = True,
+) -> dict:
+    """Write a report bundle per ecosystem (default: all) using a pool of worker processes.
+
+    Existing reports are skipped unless overwrite=True. Returns counts of
+    written / skipped reports, per-ecosystem ``errors`` and the elapsed time.
+    """
+    if format not in REPORT_FORMATS:
+        raise ValueError(f"format must be one of {', '.join(REPORT_FORMATS)}")
+    workers = workers or os.cpu_count() or 1
+    if workers < 1 or chunk_size < 1:
+        raise ValueError("workers and chunk_size must be >= 1")
+    start = time.perf_counter()
+    os.makedirs(output_dir, exist_ok=True)
+    if ecosystem_ids is None:
+        conn = duckdb.connect(db_path, read_only=True)
+        try:
+            ecosystem_ids = [r[0] for r in run_statement(conn, "SELECT id FROM ecosystems ORDER BY id")]
+        finally:
+            conn.close()
+    todo = [e for e in ecosystem_ids if overwrite or not os.path.exists(report_path(output_dir, e, format))]
+    chunks = [todo[i:i + chunk_size] for i in range(0, len(todo), chunk_size)]
+
+    bar = None
+    if progress:
+        from tqdm import tqdm
+
+        bar = tqdm(total=len(todo), desc="Ecosystem reports", unit="eco")
+    errors = []
+    threads = max(1, (os.cpu_count() or 1) // workers)
+    # spawn: forking a process with DuckDB's thread pool running is not safe.
+    with ProcessPoolExecutor(
+        max_workers=min(workers, max(1, len(chunks))),
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker,
+        initargs=(db_path, threads),
+    ) as pool:
+        futures = [pool.submit(_run_chunk, chunk, output_dir, format) for chunk in chunks]
+        for future in as_completed(futures):
+            results = future.result()
+            errors.extend({"ecosystem_id": eco, "error": err} for eco, err in results if err is not None)
+            if bar is not None:
+                bar.update(len(results))
+    if bar is not None:
+        bar.close()
+    return {
+        "written": len(todo) - len(errors),
+        "skipped": len(ecosystem_ids) - len(todo),
+        "errors": sorted(errors, key=lambda e: e["ecosystem_id"]),
+        "elapsed_ms": round((time.perf_counter() - start) * 1000, 3),
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Generate per-ecosystem report bundles in parallel.")
+    parser.add_argument("db", help="DuckDB file (opened read-only by every worker)")
+    parser.add_argument("output_dir")
+    parser.add_argument("--format", choices=REPORT_FORMATS, default="json")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--chunk-size", type=int, default=16)
+    parser.add_argument("--ecosystem", type=int, action="append", help="Only this ecosystem id (repeatable)")
+    parser.add_argument("--overwrite", action="store_true", help="Regenerate reports that already exist")
+    parser.add_argument("--quiet", action="store_true", help="No progress bar")
+    args = parser.parse_args(argv)
+
+    result = generate_ecosystem_reports(
+        args.db,
+        args.output_dir,
+        ecosystem_ids=args.ecosystem,
+        format=args.format,
+        workers=args.workers,
+        chunk_size=args.chunk_size,
+        overwrite=args.overwrite,
+        progress=not args.quiet,
+    )
+    print(
+        f"{result['written']} written, {result['skipped']} skipped, {len(result['errors'])} failed "
+        f"in {result['elapsed_ms'] / 1000:.1f}s"
+    )
+    for err in result["errors"]:
+        print(f"ecosystem {err['ecosystem_id']}: {err['error']}", file=sys.stderr)
+    return 1 if result["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,229 @@
+"""Versioned database snapshots and zero-downtime switching between them.
+
+A snapshot directory holds one DuckDB file per data version, e.g.::
+
+    snapshots/2025-01-08.duckdb
+    snapshots/2025-01-15.duckdb
+
+The version is the file name without ``.duckdb``; the newest version is the
+greatest name, so date- or timestamp-based names sort naturally.
+``publish_snapshot`` adds one from a database whose derived tables have been
+refreshed. It refuses a database missing any table of ``derived_tables()``,
+since a swapped-in snapshot without them would fail those API calls until the
+next dump. It then copies the file under a temporary name (anything not
+ending in ``.duckdb``) and renames it into place once complete.
+
+``OpenDevData.from_snapshots`` opens the newest snapshot read-only.
+``swap_to_snapshot`` (or the background ``SnapshotWatcher``) opens and warms
+the next one off the request path, then replaces the client's connection in a
+single attribute assignment. Every client call holds a lease on the connection
+it started with (``leased``), so calls already running finish on the old
+connection; ``retire`` closes it right away if none is, or else when the last
+of them returns.
+"""
+
+import logging
+import os
+import shutil
+import threading
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import contextmanager
+
+import duckdb
+
+from ._db_utils import run_statement
+
+SNAPSHOT_SUFFIX = ".duckdb"
+
+logger = logging.getLogger(__name__)
+
+
+def list_snapshots(snapshot_dir: str) -> list[str]:
+    """Versions available in snapshot_dir, oldest first."""
+    return sorted(
+        name[: -len(SNAPSHOT_SUFFIX)]
+        for name in os.listdir(snapshot_dir)
+        if name.endswith(SNAPSHOT_SUFFIX) and os.path.isfile(os.path.join(snapshot_dir, name))
+    )
+
+
+def latest_snapshot(snapshot_dir: str) -> str | None:
+    versions = list_snapshots(snapshot_dir)
+    return versions[-1] if versions else None
+
+
+def snapshot_path(snapshot_dir: str, version: str) -> str:
+    return os.path.join(snapshot_dir, version + SNAPSHOT_SUFFIX)
+
+
+def derived_tables() -> dict[str, str]:
+    """Derived table -> the refresh function that builds it, for every table the read API serves from."""
+    # Imported here: trending needs numpy, and the others import this module's siblings.
+    from . import (
+        churn,
+        developer_index,
+        ecosystem_stats,
+        geo,
+        organizations,
+        points_percentiles,
+        rank_diff,
+        rank_histograms,
+        repo_activity,
+        tenures,
+        trending,
+    )
+
+    return {
+        developer_index.INDEX_TABLE: "refresh_developer_ecosystems_index",
+        tenures.LATEST_TENURE_TABLE: "refresh_latest_tenures",
+        points_percentiles.PERCENTILE_TABLE: "refresh_points_percentiles",
+        rank_diff.RANK_DAYS_TABLE: "refresh_contribution_rank_days",
+        repo_activity.STATS_TABLE: "refresh_repo_activity_stats",
+        repo_activity.DAILY_TABLE: "refresh_repo_activity_stats",
+        repo_activity.LAST_ACTIVE_TABLE: "refresh_repo_activity_stats",
+        organizations.ECO_ORG_TABLE: "refresh_organization_stats",
+        organizations.ORG_TABLE: "refresh_organization_stats",
+        ecosystem_stats.STATS_TABLE: "refresh_ecosystem_stats",
+        rank_histograms.HISTOGRAM_TABLE: "refresh_rank_histograms",
+        geo.COUNTRIES_TABLE: "refresh_ecosystem_geo",
+        geo.REGIONS_TABLE: "refresh_ecosystem_geo",
+        geo.GRID_TABLE: "refresh_ecosystem_geo",
+        churn.ECO_TABLE: "refresh_commit_churn",
+        churn.REPO_TABLE: "refresh_commit_churn",
+        churn.DEVELOPER_TABLE: "refresh_commit_churn",
+        trending.TREND_TABLE: "refresh_trending_ecosystems",
+    }
+
+
+def publish_snapshot(
+    conn,
+    snapshot_dir: str,
+    version: str,
+    *,
+    allow_missing: Iterable[str] = (),
+) -> str:
+    """Publish the database behind conn as snapshot version; returns its path.
+
+    Raises ValueError if a table of derived_tables() (other than those in
+    allow_missing) has not been built, or if version does not sort after the
+    newest snapshot (watchers would never switch to it). The database is
+    checkpointed, copied under a temporary name and renamed into place.
+    """
+    latest = latest_snapshot(snapshot_dir)
+    if latest is not None and version <= latest:
+        raise ValueError(f"Version {version!r} must sort after the newest snapshot {latest!r}")
+    rows = run_statement(conn, "SELECT path FROM duckdb_databases() WHERE database_name = current_database()")
+    source = rows[0][0] if rows else None
+    if not source:
+        raise ValueError("Only a database file can be published as a snapshot")
+    present = {r[0] for r in run_statement(conn, "SELECT table_name FROM duckdb_tables()")}
+    skip = set(allow_missing)
+    missing = {t: b for t, b in derived_tables().items() if t not in present and t not in skip}
+    if missing:
+        raise ValueError(
+            "Derived tables missing: " + ", ".join(f"{t} (run {b}())" for t, b in sorted(missing.items()))
+        )
+    run_statement(conn, "CHECKPOINT")
+    path = snapshot_path(snapshot_dir, version)
+    tmp = path + ".tmp"
+    shutil.copyfile(source, tmp)
+    os.replace(tmp, path)
+    return path
+
+
+def open_snapshot(snapshot_dir: str, version: str) -> duckdb.DuckDBPyConnection:
+    """Open one snapshot read-only (several processes may serve the same file)."""
+    path = snapshot_path(snapshot_dir, version)
+    if not os.path.isfile(path):
+        raise FileNotFoundError(f"No snapshot {version!r} in {snapshot_dir}")
+    return duckdb.connect(path, read_only=True)
+
+
+# Open leases per connection, and retired connections to close when their last lease ends.
+_lease_lock = threading.Lock()
+_leases: dict[duckdb.DuckDBPyConnection, int] = {}
+_retired: set[duckdb.DuckDBPyConnection] = set()
+
+
+@contextmanager
+def leased(get_conn: Callable[[], duckdb.DuckDBPyConnection | None]) -> Iterator[duckdb.DuckDBPyConnection]:
+    """Yield get_conn()'s connection, kept open until the block exits even if it is retired meanwhile."""
+    with _lease_lock:
+        conn = get_conn()
+        if conn is None:
+            raise RuntimeError("Connection is closed")
+        _leases[conn] = _leases.get(conn, 0) + 1
+    try:
+        yield conn
+    finally:
+        with _lease_lock:
+            _leases[conn] -= 1
+            close = _leases[conn] == 0 and conn in _retired
+            if _leases[conn] == 0:
+                del _leases[conn]
+                _retired.discard(conn)
+        if close:
+            conn.close()
+
+
+def retire(conn: duckdb.DuckDBPyConnection) -> bool:
+    """Close conn now if no lease holds it, else when the last one ends; returns True if closed now."""
+    with _lease_lock:
+        if _leases.get(conn):
+            _retired.add(conn)
+            return False
+    conn.close()
+    return True
+
+
+def file_version(path: str) -> str:
+    """Version string for a single database file (changes when the file is replaced)."""
+    stat = os.stat(path)
+    return f"{stat.st_mtime_ns}-{stat.st_size}"
+
+
+def warm_connection(conn) -> None:
+    """Load the catalog and the small tables every page reads before serving from conn."""
+    tables = {r[0] for r in run_statement(conn, "SELECT table_name FROM duckdb_tables()")}
+    for table in ("ecosystems", "ecosystem_stats", "ecosystems_child_ecosystems"):
+        if table in tables:
+            run_statement(conn, f"SELECT * FROM {table}")
+
+
+class SnapshotWatcher(threading.Thread):
+    """Daemon thread that polls a snapshot directory and calls on_new(version) for newer versions."""
+
+    def __init__(
+        self,
+        snapshot_dir: str,
+        current: Callable[[], str | None],
+        on_new: Callable[[str], object],
+        *,
+        interval: float = 30.0,
+    ):
+        super().__init__(name="opendev-snapshot-watcher", daemon=True)
+        self.snapshot_dir = snapshot_dir
+        self.interval = interval
+        self._current = current
+        self._on_new = on_new
+        self._stop_event = threading.Event()
+
+    def check(self) -> str | None:
+        """Swap if a newer snapshot exists; returns the new version or None."""
+        latest = latest_snapshot(self.snapshot_dir)
+        current = self._current()
+        if latest is None or (current is not None and latest <= current):
+            return None
+        self._on_new(latest)
+        return latest
+
+    def run(self) -> None:
+        while not self._stop_event.wait(self.interval):
+            try:
+                self.check()
+            except Exception:
+                # A half-written or corrupt snapshot must not kill the watcher; retry next poll.
+                logger.exception("Switching to a new snapshot in %s failed", self.snapshot_dir)
+
+    def stop(self) -> None:
+        self._stop_event.set()
@@ -0,0 +1,531 @@
+"""Deterministic synthetic OpenDev data at configurable scale (for benchmarks and tests).
+
+Everything is generated inside DuckDB from ``hash(...)`` of row keys and the
+seed, so the same parameters always produce the same database regardless of
+thread count. Ecosystem sizes follow a Zipf-like distribution controlled by
+``skew`` so a few ecosystems are much larger than the rest, as in the real data.
+"""
+
+import re
+from datetime import date, timedelta
+
+SCHEMA_STATEMENTS = (
+    """
+    CREATE TABLE ecosystems (
+        id INTEGER PRIMARY KEY,
+        name VARCHAR,
+        launch_date DATE,
+        derived_launch_date DATE,
+        is_crypto UTINYINT,
+        is_category UTINYINT,
+        is_chain UTINYINT,
+        is_multichain UTINYINT
+    )
+    """,
+    """
+    CREATE TABLE ecosystems_repos (
+        id INTEGER,
+        ecosystem_id INTEGER,
+        repo_id INTEGER
+    )
+    """,
+    """
+    CREATE TABLE ecosystems_repos_recursive (
+        ecosystem_id INTEGER,
+        repo_id INTEGER,
+        created_at TIMESTAMP,
+        connected_at DATE,
+        path INTEGER[],
+        distance UBIGINT,
+        is_explicit BOOLEAN,
+        is_direct_exclusive BOOLEAN,
+        is_indirect_exclusive BOOLEAN,
+        exclusive_at_connection BOOLEAN,
+        exclusive_till DATE
+    )
+    """,
+    """
+    CREATE TABLE ecosystems_child_ecosystems (
+        id INTEGER,
+        parent_id INTEGER,
+        child_id INTEGER
+    )
+    """,
+    """
+    CREATE TABLE repos (
+        id INTEGER PRIMARY KEY,
+        name VARCHAR,
+        link VARCHAR,
+        organization_id INTEGER,
+        num_stars INTEGER,
+        num_forks INTEGER,
+        num_issues INTEGER
+    )
+    """,
+    """
+    CREATE TABLE organizations (
+        id INTEGER PRIMARY KEY,
+        name VARCHAR,
+        link VARCHAR
+    )
+    """,
+    """
+    CREATE TABLE ecosystems_organizations (
+        id INTEGER,
+        ecosystem_id INTEGER,
+        organization_id INTEGER,
+        is_first_party BOOLEAN
+    )
+    """,
+    """
+    CREATE TABLE eco_mads (
+        ecosystem_id INTEGER,
+        day DATE,
+        all_devs UBIGINT,
+        exclusive_devs UBIGINT,
+        multichain_devs UBIGINT,
+        num_commits UBIGINT,
+        devs_0_1y UBIGINT,
+        devs_1_2y UBIGINT,
+        devs_2y_plus UBIGINT,
+        one_time_devs UBIGINT,
+        part_time_devs UBIGINT,
+        full_time_devs UBIGINT
+    )
+    """,
+    """
+    CREATE TABLE eco_developer_contribution_ranks (
+        ecosystem_id INTEGER,
+        canonical_developer_id INTEGER,
+        day DATE,
+        points UTINYINT,
+        points_28d UTINYINT,
+        points_56d UTINYINT,
+        contribution_rank VARCHAR
+    )
+    """,
+    """
+    CREATE TABLE canonical_developers (
+        id INTEGER PRIMARY KEY,
+        primary_developer_email_identity_id INTEGER,
+        primary_github_user_id VARCHAR
+    )
+    """,
+    """
+    CREATE TABLE user_info (
+        canonical_developer_id INTEGER PRIMARY KEY,
+        login VARCHAR,
+        name VARCHAR,
+        company VARCHAR,
+        location VARCHAR,
+        url VARCHAR,
+        email VARCHAR,
+        primary_github_user_id VARCHAR
+    )
+    """,
+    """
+    CREATE TABLE canonical_developer_locations (
+        canonical_developer_id INTEGER,
+        country VARCHAR,
+        admin_level_1 VARCHAR,
+        locality VARCHAR,
+        lat DOUBLE,
+        lng DOUBLE,
+        formatted_address VARCHAR
+    )
+    """,
+    """
+    CREATE TABLE eco_developer_activities (
+        ecosystem_id INTEGER,
+        canonical_developer_id INTEGER,
+        day DATE,
+        num_commits UBIGINT
+    )
+    """,
+    """
+    CREATE TABLE repo_developer_activities (
+        repo_id INTEGER,
+        canonical_developer_id INTEGER,
+        day DATE,
+        num_commits UBIGINT
+    )
+    """,
+    """
+    CREATE TABLE commits (
+        repo_id INTEGER,
+        canonical_developer_id INTEGER,
+        committed_at TIMESTAMP,
+        additions UBIGINT,
+        deletions UBIGINT
+    )
+    """,
+    """
+    CREATE TABLE eco_developer_tenures (
+        ecosystem_id INTEGER,
+        canonical_developer_id INTEGER,
+        day DATE,
+        tenure_days BIGINT,
+        category UTINYINT
+    )
+    """,
+)
+
+# (country, admin_level_1, locality, lat, lng)
+_PLACES = (
+    ("US", "California", "San Francisco", 37.77, -122.42),
+    ("US", "New York", "New York City", 40.71, -74.01),
+    ("DE", "Berlin", "Berlin", 52.52, 13.40),
+    ("GB", "England", "London", 51.51, -0.13),
+    ("IN", "Karnataka", "Bengaluru", 12.97, 77.59),
+    ("CN", "Beijing", "Beijing", 39.90, 116.40),
+    ("BR", "São Paulo", "São Paulo", -23.55, -46.63),
+    ("SG", "Singapore", "Singapore", 1.35, 103.82),
+)
+
+
+def create_schema(conn) -> None:
+    """Create the OpenDev tables used by the API (empty)."""
+    for stmt in SCHEMA_STATEMENTS:
+        conn.execute(stmt)
+
+
+def _uniform(*keys: str) -> str:
+    """SQL expression for a deterministic uniform value in [0, 1) from hashed keys."""
+    return f"((hash({', '.join(keys)}, $seed) % 1000003) / 1000003.0)"
+
+
+def generate_synthetic_data(
+    conn,
+    *,
+    num_ecosystems: int = 100,
+    num_developers: int = 10_000,
+    num_days: int = 365,
+    skew: float = 1.1,
+    repos_per_ecosystem: int = 20,
+    end_day: date = date(2025, 1, 1),
+    seed: int = 0,
+    create_tables: bool = True,
+) -> dict:
+    """Populate conn with a synthetic OpenDev dataset; returns row counts per table.
+
+    Developers join 1-3 ecosystems drawn with probability proportional to
+    ``1 / rank ** skew``. Each membership has a daily activity rate (full-time,
+    part-time or occasional); contribution ranks, tenures and eco_mads are
+    derived from the generated activity the same way for every run.
+    """
+    if num_ecosystems < 1 or num_developers < 1 or num_days < 1:
+        raise ValueError("num_ecosystems, num_developers and num_days must be >= 1")
+    if create_tables:
+        create_schema(conn)
+    start_day = end_day - timedelta(days=num_days - 1)
+    p = {"seed": seed}
+
+    def run(sql: str, params: dict | None = None) -> None:
+        values = {**p, **(params or {})}
+        used = {name: values[name] for name in set(re.findall(r"\$(\w+)", sql))}
+        conn.execute(sql, used or None)
+
+    num_roots = max(1, num_ecosystems // 10)
+    run(
+        f"""
+        INSERT INTO ecosystems
+        SELECT i AS id,
+               'Ecosystem ' || i AS name,
+               CASE WHEN {_uniform("i", "'launch'")} < 0.7
+                    THEN DATE '2009-01-03' + CAST(hash(i, $seed) % 5000 AS INTEGER) END AS launch_date,
+               DATE '2009-01-03' + CAST(hash(i, $seed) % 5000 AS INTEGER) AS derived_launch_date,
+               CAST({_uniform("i", "'crypto'")} < 0.8 AS UTINYINT) AS is_crypto,
+               CAST({_uniform("i", "'category'")} < 0.1 AS UTINYINT) AS is_category,
+               CAST({_uniform("i", "'chain'")} < 0.3 AS UTINYINT) AS is_chain,
+               CAST({_uniform("i", "'multichain'")} < 0.05 AS UTINYINT) AS is_multichain
+        FROM range(1, $n + 1) t(i)
+        """,
+        {"n": num_ecosystems},
+    )
+    # Ecosystems past the roots get a parent with some probability (one level deep).
+    run(
+        f"""
+        INSERT INTO ecosystems_child_ecosystems
+        SELECT row_number() OVER (ORDER BY i) AS id, ((i - 1) % $roots) + 1 AS parent_id, i AS child_id
+        FROM range($roots + 1, $n + 1) t(i)
+        WHERE {_uniform("i", "'parent'")} < 0.3
+        """,
+        {"n": num_ecosystems, "roots": num_roots},
+    )
+
+    # Zipf weights -> cumulative ranges used to draw ecosystems for memberships and repos.
+    run(
+        """
+        CREATE TEMP TABLE _synthetic_eco_cdf AS
+        WITH w AS (
+            SELECT i AS ecosystem_id, 1.0 / pow(i, $skew) AS weight FROM range(1, $n + 1) t(i)
+        ), c AS (
+            SELECT ecosystem_id,
+                   sum(weight) OVER (ORDER BY ecosystem_id) / sum(weight) OVER () AS hi,
+                   weight / sum(weight) OVER () AS share
+            FROM w
+        )
+        SELECT ecosystem_id, hi - share AS lo, hi, share FROM c
+        """,
+        {"n": num_ecosystems, "skew": skew},
+    )
+
+    num_repos_total = num_ecosystems * repos_per_ecosystem
+    run(
+        f"""
+        INSERT INTO repos
+        SELECT i AS id,
+               'org' || (i % 997) || '/repo' || i AS name,
+               'https://github.com/org' || (i % 997) || '/repo' || i AS link,
+               i % 997 + 1 AS organization_id,
+               CAST(pow({_uniform("i", "'stars'")}, 4) * 100000 AS INTEGER) AS num_stars,
+               CAST(pow({_uniform("i", "'forks'")}, 4) * 20000 AS INTEGER) AS num_forks,
+               CAST({_uniform("i", "'issues'")} * 1000 AS INTEGER) AS num_issues
+        FROM range(1, $n + 1) t(i)
+        """,
+        {"n": num_repos_total},
+    )
+    run(
+        f"""
+        INSERT INTO ecosystems_repos
+        SELECT r.id AS id, c.ecosystem_id, r.id AS repo_id
+        FROM repos r
+        JOIN _synthetic_eco_cdf c
+          ON {_uniform("r.id", "'repo_eco'")} >= c.lo AND {_uniform("r.id", "'repo_eco'")} < c.hi
+        """
+    )
+    run(
+        """
+        INSERT INTO organizations
+        SELECT DISTINCT organization_id, 'org' || (organization_id - 1), 'https://github.com/org' || (organization_id - 1)
+        FROM repos
+        ORDER BY organization_id
+        """
+    )
+    # Each ecosystem's first-party org owns its most starred repo.
+    run(
+        """
+        INSERT INTO ecosystems_organizations
+        SELECT row_number() OVER (ORDER BY ecosystem_id), ecosystem_id, organization_id, true
+        FROM (
+            SELECT er.ecosystem_id, arg_max(r.organization_id, r.num_stars) AS organization_id
+            FROM ecosystems_repos er JOIN repos r ON r.id = er.repo_id
+            GROUP BY er.ecosystem_id
+        )
+        """
+    )
+    run(
+        """
+        INSERT INTO ecosystems_repos_recursive
+        SELECT er.ecosystem_id, er.repo_id, TIMESTAMP '2020-01-01', DATE '2020-01-01',
+               [er.ecosystem_id], 0, true, true, false, true, NULL
+        FROM ecosystems_repos er
+        UNION ALL
+        SELECT ece.parent_id, er.repo_id, TIMESTAMP '2020-01-01', DATE '2020-01-01',
+               [ece.parent_id, er.ecosystem_id], 1, false, false, true, false, NULL
+        FROM ecosystems_repos er
+        JOIN ecosystems_child_ecosystems ece ON ece.child_id = er.ecosystem_id
+        """
+    )
+
+    run(
+        """
+        INSERT INTO canonical_developers
+        SELECT i, i, 'U_' || i FROM range(1, $n + 1) t(i)
+        """,
+        {"n": num_developers},
+    )
+    run(
+        f"""
+        INSERT INTO user_info
+        SELECT i, 'dev' || i, 'Developer ' || i,
+               CASE WHEN {_uniform("i", "'company'")} < 0.4 THEN 'Company ' || (i % 500) END,
+               CASE WHEN {_uniform("i", "'location'")} < 0.6 THEN 'City ' || (i % 200) END,
+               'https://github.com/dev' || i,
+               CASE WHEN {_uniform("i", "'email'")} < 0.2 THEN 'dev' || i || '@example.com' END,
+               'U_' || i
+        FROM range(1, $n + 1) t(i)
+        """,
+        {"n": num_developers},
+    )
+    places = ", ".join(
+        f"({idx}, '{c}', '{a}', '{loc}', {lat}, {lng})" for idx, (c, a, loc, lat, lng) in enumerate(_PLACES)
+    )
+    run(
+        f"""
+        INSERT INTO canonical_developer_locations
+        SELECT i, p.country, p.admin_level_1, p.locality,
+               p.lat + ({_uniform("i", "'lat'")} - 0.5), p.lng + ({_uniform("i", "'lng'")} - 0.5),
+               p.locality || ', ' || p.country
+        FROM range(1, $n + 1) t(i)
+        JOIN (VALUES {places}) p(idx, country, admin_level_1, locality, lat, lng)
+          ON p.idx = hash(i, 'place', $seed) % {len(_PLACES)}
+        WHERE {_uniform("i", "'has_location'")} < 0.5
+        """,
+        {"n": num_developers},
+    )
+
+    # Memberships: every developer draws 1-3 ecosystems; rate is the daily activity probability.
+    run(
+        f"""
+        CREATE TEMP TABLE _synthetic_memberships AS
+        WITH draws AS (
+            SELECT d.i AS canonical_developer_id, k.j AS slot,
+                   {_uniform("d.i", "k.j", "'eco'")} AS u
+            FROM range(1, $n + 1) d(i), range(3) k(j)
+            WHERE k.j = 0 OR {_uniform("d.i", "k.j", "'extra'")} < 0.25
+        )
+        SELECT DISTINCT ON (c.ecosystem_id, d.canonical_developer_id)
+               c.ecosystem_id, d.canonical_developer_id,
+               CASE WHEN {_uniform("d.canonical_developer_id", "c.ecosystem_id", "'kind'")} < 0.1 THEN 0.6
+                    WHEN {_uniform("d.canonical_developer_id", "c.ecosystem_id", "'kind'")} < 0.4 THEN 0.15
+                    ELSE 0.02 END AS rate
+        FROM draws d
+        JOIN _synthetic_eco_cdf c ON d.u >= c.lo AND d.u < c.hi
+        """,
+        {"n": num_developers},
+    )
+    run(
+        f"""
+        INSERT INTO eco_developer_activities
+        SELECT m.ecosystem_id, m.canonical_developer_id, CAST($start AS DATE) + CAST(d.k AS INTEGER) AS day,
+               1 + hash(m.ecosystem_id, m.canonical_developer_id, d.k, 'commits', $seed) % 8 AS num_commits
+        FROM _synthetic_memberships m, range($days) d(k)
+        WHERE {_uniform("m.ecosystem_id", "m.canonical_developer_id", "d.k", "'active'")} < m.rate
+        ORDER BY m.ecosystem_id, day, m.canonical_developer_id
+        """,
+        {"start": start_day, "days": num_days},
+    )
+    # Each ecosystem activity row lands in one of the ecosystem's direct repos.
+    run(
+        """
+        INSERT INTO repo_developer_activities
+        WITH numbered AS (
+            SELECT ecosystem_id, repo_id,
+                   row_number() OVER (PARTITION BY ecosystem_id ORDER BY repo_id) - 1 AS idx,
+                   count(*) OVER (PARTITION BY ecosystem_id) AS n
+            FROM ecosystems_repos
+        )
+        SELECT nr.repo_id, a.canonical_developer_id, a.day, a.num_commits
+        FROM eco_developer_activities a
+        JOIN numbered nr
+          ON nr.ecosystem_id = a.ecosystem_id
+         AND nr.idx = hash(a.ecosystem_id, a.canonical_developer_id, 'repo', $seed) % nr.n
+        ORDER BY a.day, nr.repo_id
+        """
+    )
+    # One commits row per counted commit; line counts are log-uniform up to ~4k.
+    run(
+        f"""
+        INSERT INTO commits
+        SELECT repo_id, canonical_developer_id,
+               CAST(day AS TIMESTAMP) + to_seconds(CAST(hash(repo_id, canonical_developer_id, day, j, $seed) % 86400 AS BIGINT)),
+               CAST(pow(2, 12 * {_uniform("repo_id", "canonical_developer_id", "day", "j", "'add'")}) AS UBIGINT),
+               CAST(pow(2, 11 * {_uniform("repo_id", "canonical_developer_id", "day", "j", "'del'")}) AS UBIGINT) - 1
+        FROM (
+            SELECT repo_id, canonical_developer_id, day, unnest(range(CAST(num_commits AS BIGINT))) AS j
+            FROM repo_developer_activities
+        )
+        ORDER BY day, repo_id, canonical_developer_id, j
+        """
+    )
+    # Ranks from trailing activity: points = active days in the last 28 days.
+    run(
+        """
+        CREATE TEMP TABLE _synthetic_windows AS
+        WITH grid AS (
+            SELECT m.ecosystem_id, m.canonical_developer_id, CAST($start AS DATE) + CAST(d.k AS INTEGER) AS day
+            FROM _synthetic_memberships m, range($days) d(k)
+        ), flagged AS (
+            SELECT g.ecosystem_id, g.canonical_developer_id, g.day,
+                   CAST(a.day IS NOT NULL AS INTEGER) AS active
+            FROM grid g
+            LEFT JOIN eco_developer_activities a
+              ON a.ecosystem_id = g.ecosystem_id
+             AND a.canonical_developer_id = g.canonical_developer_id
+             AND a.day = g.day
+        )
+        SELECT ecosystem_id, canonical_developer_id, day,
+               sum(active) OVER w28 AS active_28d,
+               sum(active) OVER w56 AS active_56d,
+               min(CASE WHEN active = 1 THEN day END) OVER wall AS first_day
+        FROM flagged
+        WINDOW w28 AS (PARTITION BY ecosystem_id, canonical_developer_id ORDER BY day
+                       ROWS BETWEEN 27 PRECEDING AND CURRENT ROW),
+               w56 AS (PARTITION BY ecosystem_id, canonical_developer_id ORDER BY day
+                       ROWS BETWEEN 55 PRECEDING AND CURRENT ROW),
+               wall AS (PARTITION BY ecosystem_id, canonical_developer_id ORDER BY day
+                        ROWS BETWEEN UNBOUNDED PRECEDING AND CURRENT ROW)
+        """,
+        {"start": start_day, "days": num_days},
+    )
+    run(
+        """
+        INSERT INTO eco_developer_contribution_ranks
+        SELECT ecosystem_id, canonical_developer_id, day,
+               CAST(least(active_28d, 255) AS UTINYINT) AS points,
+               CAST(least(active_28d, 255) AS UTINYINT) AS points_28d,
+               CAST(least(active_56d, 255) AS UTINYINT) AS points_56d,
+               CASE WHEN active_28d >= 10 THEN 'full_time'
+                    WHEN active_28d >= 2 THEN 'part_time'
+                    ELSE 'one_time' END AS contribution_rank
+        FROM _synthetic_windows
+        WHERE active_56d > 0
+        ORDER BY ecosystem_id, day, canonical_developer_id
+        """
+    )
+    # Tenure counts from the first active day; the synthetic history is offset by
+    # a per-membership head start so older categories are populated too.
+    run(
+        """
+        INSERT INTO eco_developer_tenures
+        SELECT ecosystem_id, canonical_developer_id, day,
+               (day - first_day) + hash(ecosystem_id, canonical_developer_id, 'head', $seed) % 1100 AS tenure_days,
+               CASE WHEN tenure_days < 365 THEN 0 WHEN tenure_days < 730 THEN 1 ELSE 2 END AS category
+        FROM _synthetic_windows
+        WHERE active_56d > 0 AND first_day IS NOT NULL
+        ORDER BY ecosystem_id, day, canonical_developer_id
+        """
+    )
+    run(
+        """
+        INSERT INTO eco_mads
+        WITH dev_ecos AS (
+            SELECT canonical_developer_id, count(*) AS n FROM _synthetic_memberships GROUP BY 1
+        ), commits AS (
+            SELECT ecosystem_id, day, sum(num_commits) AS num_commits
+            FROM eco_developer_activities GROUP BY 1, 2
+        )
+        SELECT r.ecosystem_id, r.day,
+               count(*) AS all_devs,
+               count(*) FILTER (WHERE de.n = 1) AS exclusive_devs,
+               count(*) FILTER (WHERE de.n > 1) AS multichain_devs,
+               coalesce(any_value(c.num_commits), 0) AS num_commits,
+               count(*) FILTER (WHERE t.category = 0) AS devs_0_1y,
+               count(*) FILTER (WHERE t.category = 1) AS devs_1_2y,
+               count(*) FILTER (WHERE t.category = 2) AS devs_2y_plus,
+               count(*) FILTER (WHERE r.contribution_rank = 'one_time') AS one_time_devs,
+               count(*) FILTER (WHERE r.contribution_rank = 'part_time') AS part_time_devs,
+               count(*) FILTER (WHERE r.contribution_rank = 'full_time') AS full_time_devs
+        FROM eco_developer_contribution_ranks r
+        JOIN dev_ecos de ON de.canonical_developer_id = r.canonical_developer_id
+        LEFT JOIN eco_developer_tenures t
+          ON t.ecosystem_id = r.ecosystem_id
+         AND t.canonical_developer_id = r.canonical_developer_id
+         AND t.day = r.day
+        LEFT JOIN commits c ON c.ecosystem_id = r.ecosystem_id AND c.day = r.day
+        GROUP BY r.ecosystem_id, r.day
+        ORDER BY r.ecosystem_id, r.day
+        """
+    )
+    for tmp in ("_synthetic_windows", "_synthetic_memberships", "_synthetic_eco_cdf"):
+        conn.execute(f"DROP TABLE {tmp}")
+
+    tables = [
+        "ecosystems", "ecosystems_child_ecosystems", "repos", "organizations", "ecosystems_repos",
+        "ecosystems_organizations",
+        "ecosystems_repos_recursive", "canonical_developers", "user_info",
+        "canonical_developer_locations", "eco_developer_activities", "repo_developer_activities",
+        "commits", "eco_developer_contribution_ranks", "eco_developer_tenures", "eco_mads",
+    ]
+    return {t: conn.execute(f"SELECT count(*) FROM {t}").fetchone()[0] for t in tables}
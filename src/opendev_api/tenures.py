@@ -0,0 +1,91 @@
+"""Latest tenure per (ecosystem, developer).
+
+``eco_developer_tenures`` has one row per developer, ecosystem and day, so
+showing tenure next to every row of a developer list would mean a lookup per
+developer. ``eco_developer_latest_tenures`` keeps only the newest row of each
+(ecosystem, developer), keyed and sorted by ecosystem. ``refresh_latest_tenures``
+folds in only the source days newer than the stored watermark, and
+``developers_in_ecosystem(include_tenure=True)`` joins it for the page.
+"""
+
+from ._db_utils import (
+    derived_table_hint,
+    fetch_all_dicts,
+    get_refresh_watermark,
+    run_statement,
+    set_refresh_watermark,
+)
+
+LATEST_TENURE_TABLE = "eco_developer_latest_tenures"
+_WATERMARK = f"{LATEST_TENURE_TABLE}.tenures"
+
+
+def _create_table(conn) -> None:
+    run_statement(conn, f"""
+        CREATE TABLE IF NOT EXISTS {LATEST_TENURE_TABLE} (
+            ecosystem_id INTEGER,
+            canonical_developer_id INTEGER,
+            day DATE,
+            tenure_days BIGINT,
+            category UTINYINT,
+            PRIMARY KEY (ecosystem_id, canonical_developer_id)
+        )
+    """)
+
+
+def refresh_latest_tenures(conn) -> dict:
+    """Upsert each developer's newest tenure row from days after the watermark; returns rows folded in."""
+    _create_table(conn)
+    old = get_refresh_watermark(conn, _WATERMARK)
+    new = run_statement(conn, "SELECT max(day) FROM eco_developer_tenures")[0][0]
+    rows = 0
+    if new is None or (old is not None and new <= old):
+        return {"rows": rows, "watermark": old}
+    conn.execute("BEGIN TRANSACTION")
+    try:
+        rows = run_statement(conn, f"""
+            INSERT INTO {LATEST_TENURE_TABLE} (ecosystem_id, canonical_developer_id, day, tenure_days, category)
+            SELECT ecosystem_id, canonical_developer_id,
+                   max(day), arg_max(tenure_days, day), arg_max(category, day)
+            FROM eco_developer_tenures
+            WHERE day > coalesce(?::DATE, DATE '0001-01-01') AND day <= ?
+            GROUP BY ecosystem_id, canonical_developer_id
+            ORDER BY ecosystem_id, canonical_developer_id
+            ON CONFLICT (ecosystem_id, canonical_developer_id) DO UPDATE SET
+                day = excluded.day,
+                tenure_days = excluded.tenure_days,
+                category = excluded.category
+        """, [old, new])[0][0]
+        set_refresh_watermark(conn, _WATERMARK, new)
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+    return {"rows": rows, "watermark": new}
+
+
+def latest_tenures_in_ecosystem(
+    conn,
+    ecosystem_id: int,
+    *,
+    canonical_developer_ids: list[int] | None = None,
+) -> list[dict]:
+    """Latest tenure_days and category of the given developers (default: all) in an ecosystem.
+
+    Developers without tenure rows are omitted; results are ordered by developer id.
+    """
+    params: list = [ecosystem_id]
+    where = "ecosystem_id = ?"
+    if canonical_developer_ids is not None:
+        if not canonical_developer_ids:
+            return []
+        where += " AND canonical_developer_id IN (SELECT unnest(?::INTEGER[]))"
+        params.append(list(canonical_developer_ids))
+    query = f"""
+        SELECT canonical_developer_id, day, tenure_days, category
+        FROM {LATEST_TENURE_TABLE}
+        WHERE {where}
+        ORDER BY canonical_developer_id
+    """
+    with derived_table_hint(LATEST_TENURE_TABLE, "refresh_latest_tenures"):
+        return fetch_all_dicts(conn, query, params)
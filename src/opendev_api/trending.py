@@ -0,0 +1,196 @@
+"""Trending and anomalous ecosystems across all of ``eco_mads``.
+
+``refresh_trending_ecosystems`` loads the trailing ``history_days`` of
+``eco_mads`` once as columnar arrays, lays each metric out as a dense
+(ecosystem x day) matrix (gaps forward-filled) and computes, for every
+ecosystem in one vectorized pass per metric and window:
+
+- ``growth``: relative change of the metric over the last ``window`` days;
+- ``z_score``: how unusual that change is compared with the earlier
+  ``window``-day changes in the loaded history;
+- ``change_point_day`` / ``change_point_delta``: the day splitting the history
+  into the two segments with the most significant difference in mean, and
+  the size of that shift.
+
+The results go to ``eco_trending`` (one row per ecosystem, metric and window
+as of the latest ``eco_mads`` day), which ``trending_ecosystems`` ranks.
+"""
+
+import warnings
+from datetime import timedelta
+
+import numpy as np
+
+from ._db_utils import derived_table_hint, fetch_all_dicts, run_statement
+
+TREND_TABLE = "eco_trending"
+TREND_METRICS = ("all_devs", "full_time_devs", "exclusive_devs", "num_commits")
+DEFAULT_WINDOWS = (7, 28, 90)
+# Segments shorter than this are not considered for change points.
+MIN_SEGMENT_DAYS = 7
+
+# order_by -> ORDER BY expression; both rank the largest movement first, up or down.
+TREND_ORDERS = {
+    "z_score": "abs(t.z_score) DESC NULLS LAST",
+    "growth": "abs(t.growth) DESC NULLS LAST",
+}
+
+
+def _forward_fill(matrix: np.ndarray) -> np.ndarray:
+    """Carry each row's last observed value over missing (NaN) days."""
+    idx = np.where(~np.isnan(matrix), np.arange(matrix.shape[1]), 0)
+    np.maximum.accumulate(idx, axis=1, out=idx)
+    return matrix[np.arange(matrix.shape[0])[:, None], idx]
+
+
+def _window_stats(matrix: np.ndarray, window: int) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    current = matrix[:, -1]
+    previous = matrix[:, -1 - window]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        growth = np.where(previous > 0, (current - previous) / previous, np.nan)
+    changes = matrix[:, window:] - matrix[:, :-window]
+    # Baseline: changes over windows that end before the current one starts.
+    baseline = changes[:, :-window]
+    with warnings.catch_warnings():
+        # All-NaN rows (ecosystems younger than the history) just yield NaN.
+        warnings.simplefilter("ignore", RuntimeWarning)
+        mean = np.nanmean(baseline, axis=1)
+        std = np.nanstd(baseline, axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        z_score = np.where(std > 0, (changes[:, -1] - mean) / std, np.nan)
+    return current, previous, growth, z_score
+
+
+def _change_points(matrix: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Per row, the split index maximizing |mean after - mean before| * sqrt(n1 n2 / n), and that delta."""
+    valid = ~np.isnan(matrix)
+    sums = np.cumsum(np.where(valid, matrix, 0.0), axis=1)
+    counts = np.cumsum(valid, axis=1)
+    total_sum, total_count = sums[:, -1:], counts[:, -1:]
+    # Split k puts days [0, k) before and [k, n) after; k ranges over 1..n-1.
+    n1, s1 = counts[:, :-1], sums[:, :-1]
+    n2, s2 = total_count - n1, total_sum - s1
+    with np.errstate(divide="ignore", invalid="ignore"):
+        delta = s2 / n2 - s1 / n1
+        stat = np.abs(delta) * np.sqrt(n1 * n2 / (n1 + n2))
+    stat[(n1 < MIN_SEGMENT_DAYS) | (n2 < MIN_SEGMENT_DAYS) | np.isnan(stat)] = -1.0
+    best = np.argmax(stat, axis=1)
+    rows = np.arange(matrix.shape[0])
+    found = stat[rows, best] > 0
+    return np.where(found, best + 1, -1), np.where(found, delta[rows, best], np.nan)
+
+
+def refresh_trending_ecosystems(
+    conn,
+    *,
+    metrics: tuple[str, ...] = TREND_METRICS,
+    windows: tuple[int, ...] = DEFAULT_WINDOWS,
+    history_days: int = 365,
+) -> dict:
+    """Rebuild eco_trending from the last history_days of eco_mads; returns ecosystems, rows and as_of."""
+    unknown = set(metrics) - set(TREND_METRICS)
+    if unknown:
+        raise ValueError(f"Unknown metrics {sorted(unknown)}; expected some of {TREND_METRICS}")
+    if not windows or min(windows) < 1 or 2 * max(windows) >= history_days:
+        raise ValueError("windows must be >= 1 and shorter than half of history_days")
+    last = run_statement(conn, "SELECT max(day) FROM eco_mads")[0][0]
+    if last is None:
+        return {"ecosystems": 0, "rows": 0, "as_of": None}
+    first = last - timedelta(days=history_days - 1)
+    columns = ", ".join(metrics)
+    data = conn.execute(
+        f"SELECT ecosystem_id, CAST(day - ?::DATE AS INTEGER) AS d, {columns} FROM eco_mads WHERE day >= ?",
+        [first, first],
+    ).fetchnumpy()
+    eco_ids, row_idx = np.unique(np.asarray(data["ecosystem_id"]), return_inverse=True)
+    day_idx = np.asarray(data["d"])
+
+    parts: dict[str, list[np.ndarray]] = {
+        k: [] for k in ("ecosystem_id", "metric", "window", "current", "previous", "growth", "z_score",
+                        "change_point_offset", "change_point_delta")
+    }
+    for metric in metrics:
+        matrix = np.full((len(eco_ids), history_days), np.nan)
+        matrix[row_idx, day_idx] = np.asarray(data[metric], dtype=np.float64)
+        matrix = _forward_fill(matrix)
+        split, delta = _change_points(matrix)
+        for window in windows:
+            current, previous, growth, z_score = _window_stats(matrix, window)
+            keep = ~np.isnan(current)
+            parts["ecosystem_id"].append(eco_ids[keep])
+            parts["metric"].append(np.full(keep.sum(), metric, dtype=object))
+            parts["window"].append(np.full(keep.sum(), window, dtype=np.int32))
+            for name, values in (
+                ("current", current), ("previous", previous), ("growth", growth), ("z_score", z_score),
+                ("change_point_offset", split), ("change_point_delta", delta),
+            ):
+                parts[name].append(values[keep])
+    result = {k: np.concatenate(v) for k, v in parts.items()}
+
+    view = f"_{TREND_TABLE}_batch"
+    conn.register(view, result)
+    conn.execute("BEGIN TRANSACTION")
+    try:
+        run_statement(conn, f"""
+            CREATE OR REPLACE TABLE {TREND_TABLE} AS
+            SELECT CAST(ecosystem_id AS INTEGER) AS ecosystem_id,
+                   ?::DATE AS as_of,
+                   CAST(metric AS VARCHAR) AS metric,
+                   "window",
+                   CAST(current AS BIGINT) AS current,
+                   CAST(previous AS BIGINT) AS previous,
+                   growth, z_score,
+                   CASE WHEN change_point_offset >= 0
+                        THEN ?::DATE + CAST(change_point_offset AS INTEGER) END AS change_point_day,
+                   change_point_delta
+            FROM {view}
+            ORDER BY metric, "window", ecosystem_id
+        """, [last, first])
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+    finally:
+        conn.unregister(view)
+    return {"ecosystems": len(eco_ids), "rows": len(result["ecosystem_id"]), "as_of": last}
+
+
+def trending_ecosystems(
+    conn,
+    *,
+    window: int = 28,
+    metric: str = "all_devs",
+    limit: int = 20,
+    order_by: str = "z_score",
+    direction: str | None = None,
+    min_current: int = 0,
+) -> list[dict]:
+    """Ecosystems with the most unusual movement of metric over the last window days.
+
+    order_by is "z_score" or "growth" (largest absolute value first); direction
+    "up" / "down" keeps only growing / shrinking ecosystems. min_current drops
+    ecosystems whose current value is below it (tiny ones dominate growth).
+    """
+    if metric not in TREND_METRICS:
+        raise ValueError(f"Unknown metric {metric!r}; expected one of {TREND_METRICS}")
+    if order_by not in TREND_ORDERS:
+        raise ValueError(f"Unknown order_by {order_by!r}; expected one of {tuple(TREND_ORDERS)}")
+    where = 't.metric = ? AND t."window" = ? AND t.current >= ?'
+    if direction == "up":
+        where += " AND t.current > t.previous"
+    elif direction == "down":
+        where += " AND t.current < t.previous"
+    elif direction is not None:
+        raise ValueError("direction must be 'up', 'down' or None")
+    query = f"""
+        SELECT t.ecosystem_id, e.name, t.as_of, t.current, t.previous, t.growth, t.z_score,
+               t.change_point_day, t.change_point_delta
+        FROM {TREND_TABLE} t
+        LEFT JOIN ecosystems e ON e.id = t.ecosystem_id
+        WHERE {where}
+        ORDER BY {TREND_ORDERS[order_by]}, t.ecosystem_id
+        LIMIT ?
+    """
+    with derived_table_hint(TREND_TABLE, "refresh_trending_ecosystems"):
+        return fetch_all_dicts(conn, query, [metric, window, min_current, limit])
+
@@ -0,0 +1,139 @@
+"""Prefetch the pages of the most visited ecosystems before serving.
+
+After a restart or a snapshot swap DuckDB's buffers are cold, so the first
+requests for popular ecosystems pay for reading their data from disk.
+``warm_up`` runs the queries behind an ecosystem's dashboard pages
+(``LANDING_CALLS``) for the top-N ecosystems by latest ``eco_mads.all_devs``
+(or an explicit list) on parallel cursors and reports how long each took.
+The dashboard builds its default requests from the same tuples
+(``landing_calls``), so it can also fill its result cache with them.
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+
+from . import developers, ecosystems
+from ._db_utils import run_statement
+
+MADS_CHART_DAYS = 90
+
+# (OpenDevData method, kwargs) behind an ecosystem's dashboard pages at their
+# default settings; the ecosystem id is the only positional argument. The
+# dashboard issues these exact calls, so the kwargs (and their order) are part of
+# its cache keys. landing_calls fills in the chart window, ending on the newest
+# eco_mads day so that the keys change only when the data does.
+LANDING_CALLS = (
+    ("get_ecosystem", {"include_latest_mads": True}),
+    ("ecosystem_hierarchy", {}),
+    ("ecosystem_mads_time_series", {"start_date": None, "end_date": None, "limit": MADS_CHART_DAYS}),
+    ("repos_in_ecosystem", {"recursive": True, "sort_by": "num_stars", "limit": 100}),
+    ("developers_in_ecosystem", {
+        "contribution_rank": None,
+        "include_user_info": True,
+        "include_tenure": True,
+        "include_percentile": True,
+        "limit": 200,
+    }),
+)
+
+# Module function behind each OpenDevData method of LANDING_CALLS.
+_FUNCTIONS = {
+    "get_ecosystem": ecosystems.get_ecosystem,
+    "ecosystem_hierarchy": ecosystems.ecosystem_hierarchy,
+    "ecosystem_mads_time_series": ecosystems.ecosystem_mads_time_series,
+    "repos_in_ecosystem": ecosystems.repos_in_ecosystem,
+    "developers_in_ecosystem": developers.developers_in_ecosystem,
+}
+
+
+def landing_calls(ecosystem_id: int, last_day: date | None) -> list[tuple[str, tuple, dict]]:
+    """LANDING_CALLS as (method, args, kwargs) for ecosystem_id, with the chart window ending on last_day.
+
+    Pass latest_mads_day() of the data being served; None (no eco_mads rows) leaves the window open.
+    """
+    window = {}
+    if last_day is not None:
+        window = {"start_date": last_day - timedelta(days=MADS_CHART_DAYS), "end_date": last_day}
+    return [
+        (method, (ecosystem_id,), {k: window.get(k, v) for k, v in kwargs.items()})
+        for method, kwargs in LANDING_CALLS
+    ]
+
+
+def latest_mads_day(conn) -> date | None:
+    """Newest eco_mads day, where the landing chart window ends."""
+    return run_statement(conn, "SELECT max(day) FROM eco_mads")[0][0]
+
+
+def top_ecosystems_by_devs(conn, limit: int) -> list[int]:
+    """Ecosystem ids with the most developers on their latest eco_mads day."""
+    rows = run_statement(conn, """
+        SELECT ecosystem_id
+        FROM eco_mads
+        QUALIFY row_number() OVER (PARTITION BY ecosystem_id ORDER BY day DESC) = 1
+        ORDER BY all_devs DESC NULLS LAST, ecosystem_id
+        LIMIT ?
+    """, [limit])
+    return [r[0] for r in rows]
+
+
+def _run(conn, method: str, args: tuple, kwargs: dict) -> tuple[dict, object]:
+    cursor = conn.cursor()
+    start = time.perf_counter()
+    try:
+        result = _FUNCTIONS[method](cursor, *args, **kwargs)
+        error = None
+    except Exception as e:
+        # A missing derived table should not stop the rest of the warm-up.
+        result, error = None, f"{type(e).__name__}: {e}"
+    finally:
+        cursor.close()
+    rows = len(result) if isinstance(result, list) else int(result is not None)
+    timing = {
+        "ecosystem_id": args[0],
+        "function": method,
+        "ms": round((time.perf_counter() - start) * 1000, 3),
+        "rows": rows,
+        "error": error,
+    }
+    return timing, result
+
+
+def warm_up(
+    conn,
+    *,
+    top_n: int = 20,
+    ecosystem_ids: list[int] | None = None,
+    max_workers: int = 4,
+    keep_results: bool = False,
+) -> dict:
+    """Run the landing_calls of ecosystem_ids (default: top_n by developers) in parallel.
+
+    Returns the ecosystems warmed, total wall time and per-call timings; calls
+    that fail are reported under ``errors`` instead of raising. With
+    keep_results, ``results`` also lists (method, args, kwargs, result) for each
+    call that succeeded, so a caller can fill its own result cache from them.
+    """
+    if max_workers < 1:
+        raise ValueError("max_workers must be >= 1")
+    start = time.perf_counter()
+    if ecosystem_ids is None:
+        ecosystem_ids = top_ecosystems_by_devs(conn, top_n)
+    last_day = latest_mads_day(conn)
+    tasks = [call for eco in ecosystem_ids for call in landing_calls(eco, last_day)]
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        outcomes = list(pool.map(lambda task: _run(conn, *task), tasks))
+    timings = [timing for timing, _ in outcomes]
+    report = {
+        "ecosystem_ids": list(ecosystem_ids),
+        "calls": len(timings),
+        "elapsed_ms": round((time.perf_counter() - start) * 1000, 3),
+        "timings": [t for t in timings if t["error"] is None],
+        "errors": [t for t in timings if t["error"] is not None],
+    }
+    if keep_results:
+        report["results"] = [
+            (*task, result) for task, (timing, result) in zip(tasks, outcomes) if timing["error"] is None
+        ]
+    return report
@@ -1,10 +1,15 @@
-"""Pytest fixtures: in-memory DuckDB with minimal dashboard schema and seed data."""
+"""Pytest fixtures: in-memory DuckDB with minimal dashboard schema and seed data, or synthetic data."""
 
 from datetime import date, timedelta
 
 import duckdb
 import pytest
 
+from opendev_api import synthetic
+
+# generate_synthetic_data sizes used by synthetic_conn unless a test overrides them.
+SYNTHETIC_SIZES = {"num_ecosystems": 5, "num_developers": 300, "num_days": 90}
+
 
 def _create_schema(conn: duckdb.DuckDBPyConnection) -> None:
     conn.execute("""
@@ -53,11 +58,27 @@ def _create_schema(conn: duckdb.DuckDBPyConnection) -> None:
             id INTEGER PRIMARY KEY,
             name VARCHAR,
             link VARCHAR,
+            organization_id INTEGER,
             num_stars INTEGER,
             num_forks INTEGER,
             num_issues INTEGER
         )
     """)
+    conn.execute("""
+        CREATE TABLE organizations (
+            id INTEGER PRIMARY KEY,
+            name VARCHAR,
+            link VARCHAR
+        )
+    """)
+    conn.execute("""
+        CREATE TABLE ecosystems_organizations (
+            id INTEGER,
+            ecosystem_id INTEGER,
+            organization_id INTEGER,
+            is_first_party BOOLEAN
+        )
+    """)
     conn.execute("""
         CREATE TABLE eco_mads (
             ecosystem_id INTEGER,
@@ -85,6 +106,13 @@ def _create_schema(conn: duckdb.DuckDBPyConnection) -> None:
             contribution_rank VARCHAR
         )
     """)
+    conn.execute("""
+        CREATE TABLE canonical_developers (
+            id INTEGER PRIMARY KEY,
+            primary_developer_email_identity_id INTEGER,
+            primary_github_user_id VARCHAR
+        )
+    """)
     conn.execute("""
         CREATE TABLE user_info (
             canonical_developer_id INTEGER PRIMARY KEY,
@@ -116,6 +144,23 @@ def _create_schema(conn: duckdb.DuckDBPyConnection) -> None:
             num_commits UBIGINT
         )
     """)
+    conn.execute("""
+        CREATE TABLE repo_developer_activities (
+            repo_id INTEGER,
+            canonical_developer_id INTEGER,
+            day DATE,
+            num_commits UBIGINT
+        )
+    """)
+    conn.execute("""
+        CREATE TABLE commits (
+            repo_id INTEGER,
+            canonical_developer_id INTEGER,
+            committed_at TIMESTAMP,
+            additions UBIGINT,
+            deletions UBIGINT
+        )
+    """)
     conn.execute("""
         CREATE TABLE eco_developer_tenures (
             ecosystem_id INTEGER,
@@ -140,10 +185,18 @@ def _seed_data(conn: duckdb.DuckDBPyConnection) -> None:
         VALUES (1, 1, 2)
     """)
     conn.execute("""
-        INSERT INTO repos (id, name, link, num_stars, num_forks, num_issues)
+        INSERT INTO repos (id, name, link, organization_id, num_stars, num_forks, num_issues)
         VALUES
-            (10, 'bitcoin/bitcoin', 'https://github.com/bitcoin/bitcoin', 80000, 40000, 1000),
-            (20, 'ethereum/go-ethereum', 'https://github.com/ethereum/go-ethereum', 50000, 20000, 500)
+            (10, 'bitcoin/bitcoin', 'https://github.com/bitcoin/bitcoin', 1, 80000, 40000, 1000),
+            (20, 'ethereum/go-ethereum', 'https://github.com/ethereum/go-ethereum', 2, 50000, 20000, 500)
+    """)
+    conn.execute("""
+        INSERT INTO organizations (id, name, link)
+        VALUES (1, 'bitcoin', 'https://github.com/bitcoin'), (2, 'ethereum', 'https://github.com/ethereum')
+    """)
+    conn.execute("""
+        INSERT INTO ecosystems_organizations (id, ecosystem_id, organization_id, is_first_party)
+        VALUES (1, 1, 1, true), (2, 2, 2, true)
     """)
     conn.execute("""
         INSERT INTO ecosystems_repos (id, ecosystem_id, repo_id) VALUES (1, 1, 10), (2, 2, 20)
@@ -170,6 +223,11 @@ def _seed_data(conn: duckdb.DuckDBPyConnection) -> None:
             (1, 101, ?, 4, 4, 4, 'part_time'),
             (1, 102, ?, 1, 1, 1, 'one_time')
     """, [base, base, base])
+    # 103 exists but has no user_info profile yet.
+    conn.execute("""
+        INSERT INTO canonical_developers (id, primary_developer_email_identity_id, primary_github_user_id)
+        VALUES (100, 1, 'U_1'), (101, 2, 'U_2'), (102, 3, 'U_3'), (103, 4, 'U_4')
+    """)
     conn.execute("""
         INSERT INTO user_info (canonical_developer_id, login, name, company, location, url, email, primary_github_user_id)
         VALUES
@@ -185,6 +243,18 @@ def _seed_data(conn: duckdb.DuckDBPyConnection) -> None:
         INSERT INTO eco_developer_activities (ecosystem_id, canonical_developer_id, day, num_commits)
         VALUES (1, 100, ?, 5), (1, 100, ?, 3)
     """, [base, base - timedelta(days=1)])
+    conn.execute("""
+        INSERT INTO repo_developer_activities (repo_id, canonical_developer_id, day, num_commits)
+        VALUES (10, 100, ?, 5), (10, 100, ?, 3), (10, 101, ?, 2), (20, 102, ?, 9)
+    """, [base, base - timedelta(days=1), base - timedelta(days=60), base - timedelta(days=400)])
+    conn.execute("""
+        INSERT INTO commits (repo_id, canonical_developer_id, committed_at, additions, deletions)
+        VALUES
+            (10, 100, TIMESTAMP '2024-01-05 10:00:00', 10, 2),
+            (10, 100, TIMESTAMP '2024-01-20 12:00:00', 5, 5),
+            (10, 101, TIMESTAMP '2024-02-03 09:00:00', 100, 50),
+            (20, 102, TIMESTAMP '2024-01-15 08:00:00', 7, 1)
+    """)
     conn.execute("""
         INSERT INTO eco_developer_tenures (ecosystem_id, canonical_developer_id, day, tenure_days, category)
         VALUES (1, 100, ?, 365, 1)
@@ -199,3 +269,17 @@ def conn():
     _seed_data(c)
     yield c
     c.close()
+
+
+@pytest.fixture
+def synthetic_conn(request):
+    """In-memory DuckDB connection filled by generate_synthetic_data.
+
+    Sizes default to SYNTHETIC_SIZES; override them per test with
+    ``@pytest.mark.synthetic(num_ecosystems=..., num_developers=..., num_days=...)``.
+    """
+    marker = request.node.get_closest_marker("synthetic")
+    c = duckdb.connect(":memory:")
+    synthetic.generate_synthetic_data(c, **{**SYNTHETIC_SIZES, **(marker.kwargs if marker else {})})
+    yield c
+    c.close()
@@ -0,0 +1,93 @@
+"""Tests for the prefix-sum activity index."""
+
+import os
+import random
+from datetime import date, timedelta
+
+import duckdb
+import pytest
+
+from opendev_api import activity_index
+
+
+def _sql_top(conn, eco, start, end, limit):
+    return [
+        {"canonical_developer_id": d, "commits": c, "active_days": n}
+        for d, c, n in conn.execute("""
+            SELECT canonical_developer_id, sum(num_commits)::BIGINT AS commits, count(DISTINCT day) AS n
+            FROM eco_developer_activities
+            WHERE ecosystem_id = ? AND day BETWEEN ? AND ? AND canonical_developer_id >= 0
+            GROUP BY ALL
+            ORDER BY commits DESC, canonical_developer_id
+            LIMIT ?
+        """, [eco, start, end, limit]).fetchall()
+    ]
+
+
+def test_range_totals_match_sql(synthetic_conn, tmp_path):
+    # A tiny chunk size so the build writes many chunks.
+    meta = activity_index.build_activity_index(synthetic_conn, str(tmp_path), chunk_rows=500)
+    index = activity_index.ActivityIndex(str(tmp_path))
+    assert meta["rows"] == synthetic_conn.execute(
+        "SELECT count(*) FROM (SELECT DISTINCT ecosystem_id, canonical_developer_id, day FROM eco_developer_activities)"
+    ).fetchone()[0]
+
+    rng = random.Random(7)
+    for _ in range(10):
+        eco = rng.randint(1, 5)
+        start = index.first_day + timedelta(days=rng.randint(-5, 60))
+        end = start + timedelta(days=rng.randint(0, 40))
+        assert index.top_developers_by_commits(eco, start, end, limit=15) == _sql_top(synthetic_conn, eco, start, end, 15)
+
+    top = _sql_top(synthetic_conn, 1, index.first_day, index.last_day, 1)[0]
+    assert index.developer_commits(1, top["canonical_developer_id"]) == {"ecosystem_id": 1, **top}
+
+
+def test_edges(tmp_path):
+    c = duckdb.connect(":memory:")
+    c.execute("CREATE TABLE eco_developer_activities (ecosystem_id INTEGER, canonical_developer_id INTEGER, day DATE, num_commits UBIGINT)")
+    with pytest.raises(ValueError, match="empty"):
+        activity_index.build_activity_index(c, str(tmp_path))
+    c.execute("""
+        INSERT INTO eco_developer_activities VALUES
+            (1, 100, DATE '2025-01-01', 2), (1, 100, DATE '2025-01-03', 5), (1, 101, DATE '2025-01-03', 5),
+            (1, -1, DATE '2025-01-02', 9), (2, 100, DATE '2025-01-02', 1)
+    """)
+    activity_index.build_activity_index(c, str(tmp_path))
+    index = activity_index.ActivityIndex(str(tmp_path))
+    assert [(r["canonical_developer_id"], r["commits"]) for r in index.top_developers_by_commits(1)] == [(100, 7), (101, 5)]
+    assert index.top_developers_by_commits(1, date(2025, 1, 3), date(2025, 1, 3), limit=1)[0]["canonical_developer_id"] == 100
+    assert index.developer_commits(1, 100, date(2025, 1, 2), date(2030, 1, 1))["commits"] == 5
+    assert index.developer_commits(1, 102)["commits"] == 0
+    assert index.top_developers_by_commits(1, date(2024, 1, 1), date(2024, 12, 31)) == []
+    assert index.top_developers_by_commits(3) == []
+    with pytest.raises(ValueError, match="start"):
+        index.top_developers_by_commits(1, date(2025, 1, 3), date(2025, 1, 1))
+    with pytest.raises(FileNotFoundError):
+        activity_index.ActivityIndex(str(tmp_path / "missing"))
+
+
+def test_rebuild_swaps_in_atomically(synthetic_conn, tmp_path, monkeypatch):
+    path = str(tmp_path / "index")
+    activity_index.build_activity_index(synthetic_conn, path)
+    old = activity_index.ActivityIndex(path)
+    before = old.top_developers_by_commits(1, limit=5)
+    assert before
+
+    synthetic_conn.execute("UPDATE eco_developer_activities SET num_commits = num_commits * 2")
+    activity_index.build_activity_index(synthetic_conn, path)
+    # The reader opened before the rebuild still sees the old index, the next one the new.
+    assert old.top_developers_by_commits(1, limit=5) == before
+    doubled = [{**r, "commits": r["commits"] * 2} for r in before]
+    assert activity_index.ActivityIndex(path).top_developers_by_commits(1, limit=5) == doubled
+    assert os.listdir(tmp_path) == ["index"]
+
+    # A failing build leaves the previous index untouched and no temporary directory.
+    def fail(*args):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(activity_index, "_chunks", fail)
+    with pytest.raises(RuntimeError, match="boom"):
+        activity_index.build_activity_index(synthetic_conn, path)
+    assert activity_index.ActivityIndex(path).top_developers_by_commits(1, limit=5) == doubled
+    assert os.listdir(tmp_path) == ["index"]
@@ -0,0 +1,55 @@
+"""Tests for monthly commit churn aggregates."""
+
+from datetime import date
+
+import pytest
+
+from opendev_api import churn
+
+
+def test_refresh_and_ecosystem_series(conn):
+    result = churn.refresh_commit_churn(conn)
+    assert result == {"months": 2, "skipped": 0, "rows": 3, "through": date(2024, 2, 1)}
+    rows = churn.ecosystem_churn_time_series(conn, 1)
+    assert [(r["month"], r["commits"], r["additions"], r["deletions"], r["developers"]) for r in rows] == [
+        (date(2024, 1, 1), 2, 15, 7, 1),
+        (date(2024, 2, 1), 1, 100, 50, 1),
+    ]
+    assert churn.ecosystem_churn_time_series(conn, 1, start_month=date(2024, 2, 15))[0]["commits"] == 1
+
+
+def test_repo_breakdown_and_developer_series(conn):
+    churn.refresh_commit_churn(conn)
+    repos = churn.ecosystem_repo_churn(conn, 1)
+    assert [(r["name"], r["commits"], r["additions"]) for r in repos] == [("bitcoin/bitcoin", 3, 115)]
+    series = churn.developer_churn_time_series(conn, 100)
+    assert [(r["month"], r["commits"], r["repos"]) for r in series] == [(date(2024, 1, 1), 2, 1)]
+    assert churn.developer_churn_time_series(conn, 102, ecosystem_id=1) == []
+    assert churn.developer_churn_time_series(conn, 102, ecosystem_id=2)[0]["additions"] == 7
+
+
+def test_refresh_resumes_from_newest_month(conn):
+    churn.refresh_commit_churn(conn)
+    conn.execute("INSERT INTO commits VALUES (10, 100, TIMESTAMP '2024-02-20 10:00:00', 1, 1)")
+    result = churn.refresh_commit_churn(conn)
+    assert (result["months"], result["skipped"]) == (1, 1)
+    assert churn.ecosystem_churn_time_series(conn, 1)[-1]["developers"] == 2
+    # Late commits for an already completed month need a full rebuild.
+    conn.execute("INSERT INTO commits VALUES (10, 100, TIMESTAMP '2024-01-21 10:00:00', 1, 1)")
+    assert churn.refresh_commit_churn(conn)["skipped"] == 1
+    assert churn.ecosystem_churn_time_series(conn, 1)[0]["commits"] == 2
+    assert churn.refresh_commit_churn(conn, full=True)["months"] == 2
+    assert churn.ecosystem_churn_time_series(conn, 1)[0]["commits"] == 3
+
+
+@pytest.mark.synthetic(num_developers=200)
+def test_parallel_months_match_raw_totals(synthetic_conn):
+    churn.refresh_commit_churn(synthetic_conn, max_workers=4)
+    raw = synthetic_conn.execute("SELECT count(*), sum(additions), sum(deletions) FROM commits").fetchone()
+    rolled = synthetic_conn.execute("SELECT sum(commits), sum(additions), sum(deletions) FROM developer_monthly_churn").fetchone()
+    assert rolled == raw
+
+
+def test_requires_refresh(conn):
+    with pytest.raises(RuntimeError, match="refresh_commit_churn"):
+        churn.ecosystem_churn_time_series(conn, 1)
@@ -0,0 +1,73 @@
+"""Tests for cohort retention matrices."""
+
+from datetime import date
+
+import pytest
+
+from opendev_api import cohorts
+from opendev_api.client import OpenDevData
+
+
+@pytest.fixture
+def activity_conn(conn):
+    conn.execute("DELETE FROM eco_developer_activities")
+    conn.execute("""
+        INSERT INTO eco_developer_activities VALUES
+            (1, 1, '2024-01-03', 1), (1, 1, '2024-01-20', 1), (1, 1, '2024-02-10', 1), (1, 1, '2024-04-01', 1),
+            (1, 2, '2024-01-15', 1), (1, 2, '2024-03-15', 1),
+            (1, 3, '2024-02-01', 1), (1, 3, '2024-03-01', 1),
+            (2, 1, '2023-06-01', 1)
+    """)
+    cohorts.clear_cache()
+    return conn
+
+
+def test_retention_matrix(activity_conn):
+    result = cohorts.cohort_retention(activity_conn, 1, max_offset=3)
+    assert result["cohorts"] == [date(2024, 1, 1), date(2024, 2, 1)]
+    assert result["sizes"] == [2, 1]
+    assert result["active"] == [[2, 1, 1, 1], [1, 1, 0, -1]]
+    assert result["retention"] == [[1.0, 0.5, 0.5, 0.5], [1.0, 1.0, 0.0, None]]
+
+
+def test_month_range_and_empty(activity_conn):
+    result = cohorts.cohort_retention(activity_conn, 1, start_month=date(2024, 2, 10), end_month=date(2024, 2, 1))
+    assert result["cohorts"] == [date(2024, 2, 1)]
+    assert result["retention"] == [[1.0, 1.0, 0.0] + [None] * 22]
+    assert cohorts.cohort_retention(activity_conn, 99)["cohorts"] == []
+    with pytest.raises(ValueError):
+        cohorts.cohort_retention(activity_conn, 1, max_offset=-1)
+
+
+@pytest.mark.synthetic(num_ecosystems=3, num_days=200)
+def test_matches_per_cohort_sql(synthetic_conn):
+    result = cohorts.cohort_retention(synthetic_conn, 1, max_offset=4)
+    expected = synthetic_conn.execute("""
+        WITH dm AS (
+            SELECT DISTINCT canonical_developer_id AS dev, date_trunc('month', day)::DATE AS m
+            FROM eco_developer_activities WHERE ecosystem_id = 1
+        ), f AS (SELECT dev, min(m) AS cohort FROM dm GROUP BY dev)
+        SELECT f.cohort, date_diff('month', f.cohort, dm.m) AS k, count(*)
+        FROM dm JOIN f USING (dev)
+        WHERE date_diff('month', f.cohort, dm.m) <= 4
+        GROUP BY ALL
+    """).fetchall()
+    for cohort, k, n in expected:
+        assert result["active"][result["cohorts"].index(cohort)][k] == n
+
+
+def test_client_caches_per_data_version(activity_conn):
+    client = OpenDevData.__new__(OpenDevData)
+    client.conn = activity_conn
+    client.data_version = "v1"
+    first = client.cohort_retention(1, max_offset=3)
+    activity_conn.execute("INSERT INTO eco_developer_activities VALUES (1, 4, '2024-01-09', 1)")
+    assert client.cohort_retention(1, max_offset=3) == first
+    # Callers get copies: changing one result leaves the cached matrix intact.
+    first["sizes"][0] = 0
+    first["active"][0][0] = 0
+    first["retention"].clear()
+    cached = client.cohort_retention(1, max_offset=3)
+    assert (cached["sizes"][0], cached["active"][0][0], len(cached["retention"])) == (2, 2, 2)
+    client.data_version = "v2"
+    assert client.cohort_retention(1, max_offset=3)["sizes"][0] == 3
@@ -0,0 +1,77 @@
+"""Tests for memory-mapped developer-set bitmaps."""
+
+from datetime import date, timedelta
+
+import duckdb
+import numpy as np
+import pytest
+
+from opendev_api import developer_bitmaps
+
+
+@pytest.fixture
+def activity_conn():
+    """Three ecosystems; ecosystem 1 is dense enough to use bitmap containers."""
+    c = duckdb.connect(":memory:")
+    c.execute("CREATE TABLE eco_developer_activities (ecosystem_id INTEGER, canonical_developer_id INTEGER, day DATE, num_commits UBIGINT)")
+    day = date(2025, 1, 1)
+    c.execute("INSERT INTO eco_developer_activities SELECT 1, range, ?, 1 FROM range(0, 10000)", [day])
+    c.execute("INSERT INTO eco_developer_activities SELECT 2, range, ?, 1 FROM range(5000, 70000, 3)", [day])
+    c.execute("INSERT INTO eco_developer_activities SELECT 3, range, ?, 1 FROM range(65000, 65100)", [day])
+    # Old activity only counts in the widest window.
+    c.execute("INSERT INTO eco_developer_activities VALUES (3, 1, ?, 1)", [day - timedelta(days=200)])
+    yield c
+    c.close()
+
+
+def _sets(conn, window):
+    rows = conn.execute("""
+        SELECT ecosystem_id, canonical_developer_id FROM eco_developer_activities
+        WHERE day > DATE '2025-01-01' - ?::INTEGER
+    """, [window]).fetchall()
+    sets: dict[int, set[int]] = {}
+    for eco, dev in rows:
+        sets.setdefault(eco, set()).add(dev)
+    return sets
+
+
+def test_build_and_decode(activity_conn, tmp_path):
+    meta = developer_bitmaps.build_developer_bitmaps(activity_conn, str(tmp_path), windows=(90, 365))
+    assert meta["as_of"] == "2025-01-01"
+    assert meta["windows"]["90"]["bitmap_containers"] >= 1
+    store = developer_bitmaps.DeveloperBitmaps(str(tmp_path), window=90)
+    expected = _sets(activity_conn, 90)
+    assert store.ecosystems() == [1, 2, 3]
+    for eco, devs in expected.items():
+        assert store.cardinality(eco) == len(devs)
+        assert np.array_equal(store.developers(eco), np.array(sorted(devs), dtype=np.uint32))
+    assert 1 in developer_bitmaps.DeveloperBitmaps(str(tmp_path), window=365).developers(3)
+
+
+def test_overlap_and_top_similar_match_sets(activity_conn, tmp_path):
+    developer_bitmaps.build_developer_bitmaps(activity_conn, str(tmp_path), windows=(90,))
+    store = developer_bitmaps.DeveloperBitmaps(str(tmp_path), window=90)
+    sets = _sets(activity_conn, 90)
+    for a in sets:
+        for b in sets:
+            shared = len(sets[a] & sets[b])
+            result = store.overlap(a, b)
+            assert result["shared_developers"] == shared
+            assert result["jaccard"] == pytest.approx(shared / len(sets[a] | sets[b]))
+        similar = store.top_similar(a, k=5)
+        expected = sorted(
+            (b for b in sets if b != a and sets[a] & sets[b]),
+            key=lambda b: (-len(sets[a] & sets[b]) / len(sets[a] | sets[b]), b),
+        )
+        assert [r["ecosystem_id"] for r in similar] == expected
+        for r in similar:
+            assert r["shared_developers"] == len(sets[a] & sets[r["ecosystem_id"]])
+
+
+def test_missing_window_and_ecosystem(activity_conn, tmp_path):
+    developer_bitmaps.build_developer_bitmaps(activity_conn, str(tmp_path), windows=(28,))
+    with pytest.raises(ValueError, match="Window 90 not built"):
+        developer_bitmaps.DeveloperBitmaps(str(tmp_path), window=90)
+    store = developer_bitmaps.DeveloperBitmaps(str(tmp_path), window=28)
+    assert store.top_similar(999) == []
+    assert store.overlap(1, 999)["jaccard"] == 0.0
@@ -0,0 +1,76 @@
+"""Tests for the developer -> ecosystems index."""
+
+from datetime import date, timedelta
+
+import pytest
+
+from opendev_api import OpenDevData, developer_index, developers
+
+
+def test_developer_ecosystems_requires_index(conn):
+    with pytest.raises(RuntimeError, match="refresh_developer_ecosystems_index"):
+        developer_index.developer_ecosystems(conn, 100)
+
+
+def test_refresh_and_lookup(conn):
+    result = developer_index.refresh_developer_ecosystems_index(conn)
+    assert result["activity_rows"] == 1
+    assert result["rank_rows"] == 3
+    rows = developer_index.developer_ecosystems(conn, 100)
+    assert len(rows) == 1
+    row = rows[0]
+    assert row["ecosystem_id"] == 1
+    assert row["ecosystem_name"] == "Bitcoin"
+    assert row["total_commits"] == 8
+    assert row["active_days"] == 2
+    assert row["first_active_day"] == date.today() - timedelta(days=1)
+    assert row["contribution_rank"] == "full_time"
+
+
+def test_refresh_is_incremental(conn):
+    developer_index.refresh_developer_ecosystems_index(conn)
+    assert developer_index.refresh_developer_ecosystems_index(conn)["activity_rows"] == 0
+
+    tomorrow = date.today() + timedelta(days=1)
+    conn.execute(
+        "INSERT INTO eco_developer_activities VALUES (1, 100, ?, 4), (2, 100, ?, 1)", [tomorrow, tomorrow]
+    )
+    conn.execute(
+        "INSERT INTO eco_developer_contribution_ranks VALUES (1, 100, ?, 2, 2, 2, 'part_time')", [tomorrow]
+    )
+    result = developer_index.refresh_developer_ecosystems_index(conn)
+    assert result["activity_rows"] == 2
+    assert result["rank_rows"] == 1
+
+    rows = {r["ecosystem_id"]: r for r in developer_index.developer_ecosystems(conn, 100)}
+    assert rows[1]["total_commits"] == 12
+    assert rows[1]["active_days"] == 3
+    assert rows[1]["last_active_day"] == tomorrow
+    assert rows[1]["contribution_rank"] == "part_time"
+    assert rows[2]["total_commits"] == 1
+    assert rows[2]["contribution_rank"] is None
+
+
+def test_client_developer_ecosystems(conn):
+    client = OpenDevData.__new__(OpenDevData)
+    client.conn = conn
+    client.refresh_developer_ecosystems_index()
+    assert client.developer_ecosystems(101)[0]["contribution_rank"] == "part_time"
+
+
+def test_refresh_clears_dropped_ranks(conn):
+    developer_index.refresh_developer_ecosystems_index(conn)
+    tomorrow = date.today() + timedelta(days=1)
+    # Only alice is ranked on the new day; bob and carol drop out.
+    conn.execute(
+        "INSERT INTO eco_developer_contribution_ranks VALUES (1, 100, ?, 3, 3, 3, 'full_time')", [tomorrow]
+    )
+    result = developer_index.refresh_developer_ecosystems_index(conn)
+    assert (result["rank_rows"], result["cleared_rank_rows"]) == (1, 2)
+    assert developer_index.developer_ecosystems(conn, 100)[0]["rank_day"] == tomorrow
+    # bob is still listed for the ecosystem, without a current rank.
+    bob = developer_index.developer_ecosystems(conn, 101)
+    assert [(r["ecosystem_id"], r["contribution_rank"], r["rank_day"], r["points"]) for r in bob] == [(1, None, None, None)]
+    assert developers.developer_profile_bundle(conn, 101, 1)["current_rank"] is None
+    conn.execute(f"DROP TABLE {developer_index.INDEX_TABLE}")
+    assert developers.developer_profile_bundle(conn, 101, 1)["current_rank"] is None
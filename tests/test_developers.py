@@ -4,7 +4,7 @@ from datetime import date
 
 import pytest
 
-from opendev_api import developers
+from opendev_api import developer_index, developers, instrumentation, tenures
 
 
 def test_developers_in_ecosystem(conn):
@@ -50,6 +50,76 @@ def test_get_developer_profile_with_location(conn):
     assert row["locations"][0]["country"] == "US"
 
 
+def test_get_developer_profiles_in_input_order(conn):
+    rows = developers.get_developer_profiles(conn, ids=[102, 99999, 100, 102, 103])
+    assert [(r["input"], r["found"], r["has_profile"], r["login"]) for r in rows] == [
+        (102, True, True, "carol"),
+        (99999, False, False, None),
+        (100, True, True, "alice"),
+        (102, True, True, "carol"),
+        (103, True, False, None),
+    ]
+    # Node ids resolve through canonical_developers, with or without a profile.
+    rows = developers.get_developer_profiles(conn, github_node_ids=["U_4", "U_9"])
+    assert [(r["found"], r["has_profile"], r["canonical_developer_id"]) for r in rows] == [
+        (True, False, 103), (False, False, None),
+    ]
+    rows = developers.get_developer_profiles(conn, logins=["BOB", "nobody"], include_location=True)
+    assert [(r["canonical_developer_id"], r["locations"]) for r in rows] == [(101, []), (None, None)]
+    rows = developers.get_developer_profiles(conn, github_node_ids=["U_1"], include_location=True)
+    assert rows[0]["locations"][0]["country"] == "US"
+    assert developers.get_developer_profiles(conn, ids=[]) == []
+    with pytest.raises(ValueError):
+        developers.get_developer_profiles(conn, ids=[100], logins=["alice"])
+
+
+def test_developer_profile_bundle(conn):
+    row = developers.developer_profile_bundle(conn, 100, 1)
+    assert row["login"] == "alice"
+    assert row["locations"][0]["country"] == "US"
+    assert row["activity"]["days_active"] == 2
+    assert row["activity"]["num_commits"] == 8
+    assert [r["num_commits"] for r in row["activity"]["recent"]] == [5, 3]
+    assert row["latest_tenure"]["tenure_days"] == 365
+    assert row["current_rank"]["contribution_rank"] == "full_time"
+
+
+def test_developer_profile_bundle_without_ecosystem(conn):
+    row = developers.developer_profile_bundle(conn, 101)
+    assert row["login"] == "bob"
+    assert row["locations"] == []
+    assert "activity" not in row
+
+
+def test_developer_profile_bundle_missing_parts(conn):
+    row = developers.developer_profile_bundle(conn, 101, 1)
+    assert row["activity"]["days_active"] == 0
+    assert row["activity"]["recent"] == []
+    assert row["latest_tenure"] is None
+    assert row["current_rank"]["contribution_rank"] == "part_time"
+    assert developers.developer_profile_bundle(conn, 99999, 1) is None
+
+
+def test_developer_profile_bundle_reads_derived_tables(conn):
+    base = {dev: developers.developer_profile_bundle(conn, dev, 1) for dev in (100, 101, 102)}
+    developer_index.refresh_developer_ecosystems_index(conn)
+    tenures.refresh_latest_tenures(conn)
+    for dev, expected in base.items():
+        assert developers.developer_profile_bundle(conn, dev, 1) == expected
+
+
+def test_developer_profile_bundle_is_one_query(conn):
+    developer_index.refresh_developer_ecosystems_index(conn)
+    tenures.refresh_latest_tenures(conn)
+    instrumentation.reset_query_stats()
+    row = developers.developer_profile_bundle(conn, 100, 1, activity_limit=1)
+    assert instrumentation.query_stats()["developers.developer_profile_bundle"]["count"] == 1
+    assert len(instrumentation.query_stats()) == 1
+    # Totals cover every day, recent only the newest activity_limit of the same rows.
+    assert (row["activity"]["num_commits"], row["activity"]["last_day"]) == (8, row["activity"]["recent"][0]["day"])
+    assert len(row["activity"]["recent"]) == 1
+
+
 def test_developer_activity_in_ecosystem(conn):
     rows = developers.developer_activity_in_ecosystem(
         conn, 1, 100, limit=10
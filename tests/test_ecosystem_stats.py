@@ -0,0 +1,67 @@
+"""Tests for the materialized ecosystem_stats table and list_ecosystems on top of it."""
+
+import pytest
+
+from opendev_api import OpenDevData, ecosystem_stats, ecosystems
+
+
+def test_refresh_ecosystem_stats(conn):
+    assert ecosystem_stats.refresh_ecosystem_stats(conn) == {"ecosystems": 3}
+    rows = {r[0]: r[1:] for r in conn.execute(
+        "SELECT ecosystem_id, direct_repo_count, recursive_repo_count, child_count, all_devs FROM ecosystem_stats"
+    ).fetchall()}
+    assert rows[1] == (1, 1, 1, 2500)
+    assert rows[2] == (1, 1, 0, None)
+    assert rows[3] == (0, 0, 0, None)
+
+
+def test_list_ecosystems_reads_stats(conn):
+    ecosystem_stats.refresh_ecosystem_stats(conn)
+    # The stats table, not ecosystems_repos, is the source once materialized.
+    conn.execute("UPDATE ecosystem_stats SET direct_repo_count = 42 WHERE ecosystem_id = 3")
+    rows = {r["id"]: r for r in ecosystems.list_ecosystems(conn, include_repo_count=True)}
+    assert rows[3]["repo_count"] == 42
+
+
+def test_ecosystem_stats_freshness(conn):
+    with pytest.raises(RuntimeError, match="refresh_ecosystem_stats"):
+        ecosystem_stats.ecosystem_stats_freshness(conn)
+    ecosystem_stats.refresh_ecosystem_stats(conn)
+    fresh = ecosystem_stats.ecosystem_stats_freshness(conn)
+    assert fresh["refreshed_at"] is not None
+    assert fresh["mads_day"] == fresh["latest_mads_day"]
+    assert not fresh["mads_behind"]
+    conn.execute("""
+        INSERT INTO eco_mads (ecosystem_id, day, all_devs)
+        SELECT ecosystem_id, day + INTERVAL 1 DAY, all_devs FROM eco_mads ORDER BY day DESC LIMIT 1
+    """)
+    assert ecosystem_stats.ecosystem_stats_freshness(conn)["mads_behind"]
+    ecosystem_stats.refresh_ecosystem_stats(conn)
+    assert not ecosystem_stats.ecosystem_stats_freshness(conn)["mads_behind"]
+
+
+def test_list_ecosystems_sort_by_stats_column(conn):
+    ecosystem_stats.refresh_ecosystem_stats(conn)
+    rows = ecosystems.list_ecosystems(conn, include_stats=True, sort_by="all_devs")
+    assert rows[0]["name"] == "Bitcoin"
+    assert rows[0]["all_devs"] == 2500
+    assert rows[0]["child_count"] == 1
+    assert "recursive_repo_count" in rows[0]
+
+
+def test_list_ecosystems_sort_requires_stats(conn):
+    with pytest.raises(RuntimeError, match="refresh_ecosystem_stats"):
+        ecosystems.list_ecosystems(conn, sort_by="all_devs")
+
+
+def test_list_ecosystems_invalid_sort(conn):
+    with pytest.raises(ValueError):
+        ecosystems.list_ecosystems(conn, sort_by="name; DROP TABLE ecosystems")
+
+
+def test_client_list_ecosystems_with_stats(conn):
+    client = OpenDevData.__new__(OpenDevData)
+    client.conn = conn
+    client.refresh_ecosystem_stats()
+    rows = client.list_ecosystems(include_stats=True, sort_by="direct_repo_count", limit=2)
+    assert [r["direct_repo_count"] for r in rows] == [1, 1]
@@ -121,3 +121,8 @@ def test_top_repos_in_ecosystem(conn):
     rows = ecosystems.top_repos_in_ecosystem(conn, 1, limit=5)
     assert len(rows) >= 1
     assert rows[0]["num_stars"] >= (rows[-1]["num_stars"] or 0)
+
+
+def test_repos_in_ecosystem_sort_by_activity_requires_stats(conn):
+    with pytest.raises(RuntimeError, match="refresh_repo_activity_stats"):
+        ecosystems.repos_in_ecosystem(conn, 1, sort_by="activity")
@@ -0,0 +1,52 @@
+"""Tests for streaming developer exports."""
+
+import csv
+import io
+import json
+
+import pytest
+
+from opendev_api import developers, export
+
+
+def test_iterator_matches_paginated_list(conn):
+    batches = list(developers.iter_developers_in_ecosystem(conn, 1, batch_size=2))
+    assert [len(b) for b in batches] == [2, 1]
+    streamed = [r for b in batches for r in b]
+    assert streamed == developers.developers_in_ecosystem(conn, 1, limit=100)
+    assert streamed[0]["login"] == "alice"
+
+
+def test_iterator_leaves_connection_usable(conn):
+    it = developers.iter_developers_in_ecosystem(conn, 1, batch_size=1, include_user_info=False)
+    first = next(it)
+    assert "login" not in first[0]
+    assert developers.get_developer_profile(conn, 100)["login"] == "alice"
+    assert sum(len(b) for b in it) == 2
+
+
+@pytest.mark.parametrize("ext", ["csv", "ndjson", "parquet"])
+def test_export_formats(conn, tmp_path, ext):
+    path = str(tmp_path / f"devs.{ext}")
+    result = export.export_developers_in_ecosystem(conn, 1, path, contribution_rank="full_time")
+    assert result == {"path": path, "format": ext, "rows": 1}
+    reader = {"csv": "read_csv", "ndjson": "read_json", "parquet": "read_parquet"}[ext]
+    assert conn.execute(f"SELECT canonical_developer_id, login FROM {reader}(?)", [path]).fetchall() == [(100, "alice")]
+
+
+def test_export_rejects_unknown_format(conn, tmp_path):
+    with pytest.raises(ValueError, match="Cannot infer"):
+        export.export_developers_in_ecosystem(conn, 1, str(tmp_path / "devs.xlsx"))
+
+
+@pytest.mark.synthetic(num_ecosystems=3, num_days=30)
+def test_batch_sinks(synthetic_conn):
+    eco = synthetic_conn.execute("SELECT ecosystem_id FROM eco_developer_contribution_ranks GROUP BY 1 ORDER BY count(*) DESC LIMIT 1").fetchone()[0]
+    expected = sum(len(b) for b in developers.iter_developers_in_ecosystem(synthetic_conn, eco))
+    out = io.StringIO()
+    assert export.write_csv_batches(developers.iter_developers_in_ecosystem(synthetic_conn, eco, batch_size=7), out) == expected
+    assert len(list(csv.DictReader(io.StringIO(out.getvalue())))) == expected
+    out = io.StringIO()
+    assert export.write_ndjson_batches(developers.iter_developers_in_ecosystem(synthetic_conn, eco, batch_size=7), out) == expected
+    first = json.loads(out.getvalue().splitlines()[0])
+    assert isinstance(first["day"], str)
@@ -0,0 +1,43 @@
+"""Tests for precomputed ecosystem developer geography."""
+
+from datetime import date, timedelta
+
+import pytest
+
+from opendev_api import geo
+
+
+def test_countries_and_regions(conn):
+    counts = geo.refresh_ecosystem_geo(conn)
+    assert counts == {
+        "eco_developer_geo_countries": 2,
+        "eco_developer_geo_regions": 1,
+        "eco_developer_geo_grid": 1,
+    }
+    countries = geo.ecosystem_developer_countries(conn, 1)
+    assert [(r["country"], r["developers"]) for r in countries] == [(None, 2), ("US", 1)]
+    assert countries[1]["full_time_devs"] == 1
+    assert countries[0]["part_time_devs"] == countries[0]["one_time_devs"] == 1
+    regions = geo.ecosystem_developer_regions(conn, 1, country="US")
+    assert [(r["admin_level_1"], r["developers"]) for r in regions] == [("New York", 1)]
+    assert geo.ecosystem_developer_regions(conn, 1, country="DE") == []
+
+
+def test_grid_and_current_day_only(conn):
+    # A developer ranked on an older day is no longer a current developer.
+    conn.execute(
+        "INSERT INTO eco_developer_contribution_ranks VALUES (1, 103, ?, 1, 1, 1, 'one_time')",
+        [date.today() - timedelta(days=7)],
+    )
+    conn.execute("INSERT INTO canonical_developer_locations VALUES (103, 'DE', 'Berlin', 'Berlin', 52.5, 13.4, 'Berlin, DE')")
+    geo.refresh_ecosystem_geo(conn, cell_degrees=10)
+    grid = geo.ecosystem_developer_grid(conn, 1)
+    assert grid == [{"lat": 45.0, "lng": -75.0, "developers": 1, "cell_degrees": 10.0, "day": date.today()}]
+    assert "DE" not in {r["country"] for r in geo.ecosystem_developer_countries(conn, 1)}
+
+
+def test_requires_refresh(conn):
+    with pytest.raises(RuntimeError, match="refresh_ecosystem_geo"):
+        geo.ecosystem_developer_countries(conn, 1)
+    with pytest.raises(ValueError):
+        geo.refresh_ecosystem_geo(conn, cell_degrees=0)
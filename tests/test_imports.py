@@ -0,0 +1,34 @@
+"""The read path must not import ingestion or numeric dependencies."""
+
+import json
+import os
+import subprocess
+import sys
+
+SRC = os.path.join(os.path.dirname(__file__), "..", "src")
+
+
+def _modules_after(statement: str) -> set[str]:
+    code = f"import json, sys\n{statement}\nprint(json.dumps(sorted(sys.modules)))"
+    env = dict(os.environ, PYTHONPATH=SRC)
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True, env=env)
+    return set(json.loads(out.stdout))
+
+
+def test_import_does_not_load_ingestion_dependencies():
+    loaded = _modules_after("import opendev_api")
+    assert not loaded & {"requests", "tqdm", "pandas", "numpy"}
+
+
+def test_read_path_does_not_load_ingestion_dependencies():
+    # duckdb itself imports numpy/pandas (when installed) to convert bound parameters,
+    # so only the ingestion-only modules are checked here.
+    loaded = _modules_after(
+        "import duckdb\n"
+        "from opendev_api import OpenDevData\n"
+        "client = OpenDevData.__new__(OpenDevData)\n"
+        "client.conn = duckdb.connect()\n"
+        "client.conn.execute('CREATE TABLE ecosystems (id INTEGER, name VARCHAR, is_crypto UTINYINT, is_chain UTINYINT)')\n"
+        "client.search_ecosystems('x')"
+    )
+    assert not loaded & {"requests", "tqdm", "opendev_api.get_user_info"}
@@ -0,0 +1,126 @@
+"""Tests for query instrumentation in _db_utils."""
+
+import logging
+
+import pytest
+
+from opendev_api import OpenDevData, developers, ecosystems, instrumentation, tenures
+
+
+@pytest.fixture(autouse=True)
+def _reset_instrumentation():
+    instrumentation.reset_query_stats()
+    yield
+    instrumentation.set_slow_query_threshold(None)
+    instrumentation.reset_query_stats()
+
+
+def test_callback_sink_receives_events(conn):
+    events = []
+    instrumentation.add_query_sink(events.append)
+    try:
+        ecosystems.list_ecosystems(conn, limit=10)
+    finally:
+        instrumentation.remove_query_sink(events.append)
+    assert len(events) == 1
+    assert events[0].caller == "ecosystems.list_ecosystems"
+    assert events[0].rows == 3
+    assert events[0].elapsed_ms >= 0
+    assert not events[0].slow
+
+
+def test_histogram_snapshot_by_caller(conn):
+    developers.get_developer_profile(conn, 100, include_location=True)
+    stats = instrumentation.query_stats()
+    assert stats["developers.get_developer_profile"]["count"] == 2
+    assert stats["developers.get_developer_profile"]["rows"] == 2
+    assert sum(stats["developers.get_developer_profile"]["buckets_ms"].values()) == 2
+
+
+def test_slow_query_captures_explain_analyze(conn, caplog):
+    instrumentation.set_slow_query_threshold(0, explain_sample_rate=1.0)
+    sink = instrumentation.LoggingSink()
+    instrumentation.add_query_sink(sink)
+    try:
+        with caplog.at_level(logging.WARNING, logger="opendev_api"):
+            ecosystems.get_ecosystem(conn, 1)
+    finally:
+        instrumentation.remove_query_sink(sink)
+    assert "ecosystems.get_ecosystem" in caplog.text
+    assert "(slow)" in caplog.text
+    assert "Total Time" in caplog.text or "QUERY" in caplog.text.upper()
+    assert instrumentation.query_stats()["ecosystems.get_ecosystem"]["slow_count"] == 1
+
+
+def test_slow_query_explain_sample_rate(conn, monkeypatch):
+    events = []
+    instrumentation.add_query_sink(events.append)
+    try:
+        instrumentation.set_slow_query_threshold(0)
+        ecosystems.get_ecosystem(conn, 1)
+        instrumentation.set_slow_query_threshold(0, explain_sample_rate=0.5)
+        monkeypatch.setattr(instrumentation.random, "random", lambda: 0.7)
+        ecosystems.get_ecosystem(conn, 1)
+        monkeypatch.setattr(instrumentation.random, "random", lambda: 0.2)
+        ecosystems.get_ecosystem(conn, 1)
+        instrumentation.set_slow_query_threshold(0, explain_sample_rate=0)
+        ecosystems.get_ecosystem(conn, 1)
+    finally:
+        instrumentation.remove_query_sink(events.append)
+    assert [(e.slow, e.explain is not None) for e in events] == [
+        (True, True), (True, False), (True, True), (True, False),
+    ]
+    with pytest.raises(ValueError):
+        instrumentation.set_slow_query_threshold(0, explain_sample_rate=2)
+
+
+def test_refresh_statements_are_recorded_and_not_rerun(conn):
+    events = []
+    instrumentation.add_query_sink(events.append)
+    try:
+        instrumentation.set_slow_query_threshold(0)
+        result = tenures.refresh_latest_tenures(conn)
+    finally:
+        instrumentation.remove_query_sink(events.append)
+    assert "tenures.refresh_latest_tenures" in instrumentation.query_stats()
+    inserts = [e for e in events if "INSERT" in e.query and tenures.LATEST_TENURE_TABLE in e.query]
+    assert inserts and all(e.explain and "EXPLAIN ANALYZE" not in e.explain for e in inserts)
+    # A plain EXPLAIN does not run the insert a second time.
+    assert conn.execute(f"SELECT count(*) FROM {tenures.LATEST_TENURE_TABLE}").fetchone()[0] == result["rows"]
+
+
+def test_no_sinks_skips_caller_lookup(conn, monkeypatch):
+    def fail():
+        raise AssertionError("_caller called without sinks")
+
+    monkeypatch.setattr(instrumentation, "_caller", fail)
+    instrumentation.remove_query_sink(instrumentation.default_histogram)
+    try:
+        assert ecosystems.get_ecosystem(conn, 1)["name"] == "Bitcoin"
+    finally:
+        instrumentation.add_query_sink(instrumentation.default_histogram)
+
+
+def test_failing_sink_does_not_break_queries(conn):
+    def broken(event):
+        raise RuntimeError("boom")
+
+    instrumentation.add_query_sink(broken)
+    try:
+        assert ecosystems.get_ecosystem(conn, 1)["name"] == "Bitcoin"
+    finally:
+        instrumentation.remove_query_sink(broken)
+
+
+def test_negative_threshold_rejected():
+    with pytest.raises(ValueError):
+        instrumentation.set_slow_query_threshold(-1)
+
+
+def test_client_query_stats(conn):
+    client = OpenDevData.__new__(OpenDevData)
+    client.conn = conn
+    client.get_ecosystem(1)
+    assert client.query_stats()["ecosystems.get_ecosystem"]["count"] == 1
+    client.reset_query_stats()
+    assert client.query_stats() == {}
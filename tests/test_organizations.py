@@ -0,0 +1,67 @@
+"""Tests for organization rollups."""
+
+from datetime import date
+
+import pytest
+
+from opendev_api import organizations, repo_activity
+from opendev_api.client import OpenDevData
+
+
+@pytest.fixture
+def org_conn(conn):
+    repo_activity.refresh_repo_activity_stats(conn)
+    # Org 2 is linked to ecosystem 1 without having any repos in it.
+    conn.execute("INSERT INTO ecosystems_organizations VALUES (3, 1, 2, false)")
+    organizations.refresh_organization_stats(conn)
+    return conn
+
+
+def test_ecosystem_leaderboard(org_conn):
+    rows = organizations.ecosystem_organizations(org_conn, 1)
+    assert [(r["name"], r["is_first_party"], r["repos"], r["stars"]) for r in rows] == [
+        ("bitcoin", True, 1, 80000),
+        ("ethereum", False, 0, 0),
+    ]
+    assert (rows[0]["active_devs_28d"], rows[0]["active_devs_90d"]) == (1, 2)
+    assert [r["name"] for r in organizations.ecosystem_organizations(org_conn, 1, first_party_only=True)] == ["bitcoin"]
+    with pytest.raises(ValueError, match="sort_by"):
+        organizations.ecosystem_organizations(org_conn, 1, sort_by="name")
+
+
+def test_footprint_and_totals(org_conn):
+    assert [(r["ecosystem_id"], r["repos"]) for r in organizations.organization_ecosystems(org_conn, 2)] == [
+        (2, 1),
+        (1, 0),
+    ]
+    org = organizations.get_organization(org_conn, 2)
+    assert (org["name"], org["repos"], org["stars"], org["ecosystems"], org["first_party_ecosystems"]) == (
+        "ethereum", 1, 50000, 1, 1
+    )
+    assert org["active_devs_365d"] == 0
+    assert organizations.get_organization(org_conn, 99) is None
+    assert [r["name"] for r in organizations.top_organizations(org_conn, sort_by="stars")] == ["bitcoin", "ethereum"]
+
+
+@pytest.mark.synthetic(num_ecosystems=10, num_developers=500, num_days=120)
+def test_matches_raw_join_on_synthetic_data(synthetic_conn):
+    repo_activity.refresh_repo_activity_stats(synthetic_conn)
+    organizations.refresh_organization_stats(synthetic_conn)
+    raw = synthetic_conn.execute("""
+        SELECT r.organization_id, count(DISTINCT a.canonical_developer_id)
+        FROM repo_developer_activities a JOIN repos r ON r.id = a.repo_id
+        WHERE a.day > DATE '2025-01-01' - 90
+        GROUP BY 1
+    """).fetchall()
+    rolled = dict(synthetic_conn.execute("SELECT organization_id, active_devs_90d FROM organization_stats").fetchall())
+    assert raw and all(rolled[org] == n for org, n in raw)
+    assert organizations.get_organization(synthetic_conn, raw[0][0])["as_of_day"] == date(2025, 1, 1)
+
+
+def test_requires_refresh(conn):
+    client = OpenDevData.__new__(OpenDevData)
+    client.conn = conn
+    with pytest.raises(RuntimeError, match="refresh_repo_activity_stats"):
+        client.refresh_organization_stats()
+    with pytest.raises(RuntimeError, match="refresh_organization_stats"):
+        client.ecosystem_organizations(1)
@@ -0,0 +1,127 @@
+"""Tests for partitioned Parquet export and the Parquet-backed client."""
+
+import os
+from datetime import date
+
+import duckdb
+import pytest
+
+from opendev_api import OpenDevData, cohorts, developers, ecosystems, partitioned
+
+
+def test_export_writes_partitions_and_manifest(conn, tmp_path):
+    manifest = partitioned.export_partitioned_parquet(conn, str(tmp_path), num_buckets=4)
+    assert manifest["num_buckets"] == 4
+    assert set(manifest["partitioned_tables"]) == set(partitioned.PARTITIONED_TABLES)
+    assert "ecosystems" in manifest["tables"]
+    # Ecosystem 1 lands in bucket 1 % 4
+    assert os.path.isdir(tmp_path / "eco_mads" / "ecosystem_bucket=1")
+    assert os.path.isfile(tmp_path / "ecosystems.parquet")
+    assert os.path.isfile(tmp_path / partitioned.MANIFEST_FILENAME)
+
+
+def test_export_unknown_table(conn, tmp_path):
+    with pytest.raises(ValueError, match="Tables not found"):
+        partitioned.export_partitioned_parquet(conn, str(tmp_path), tables=("nope",))
+
+
+def test_parquet_views_match_tables(conn, tmp_path):
+    partitioned.export_partitioned_parquet(conn, str(tmp_path), num_buckets=2)
+    pq = duckdb.connect(":memory:")
+    try:
+        created = partitioned.attach_parquet_views(pq, str(tmp_path))
+        assert "eco_developer_contribution_ranks" in created
+        cols = [d[0] for d in pq.execute("SELECT * FROM eco_mads LIMIT 0").description]
+        assert "ecosystem_bucket" not in cols
+        assert ecosystems.ecosystem_mads_time_series(pq, 1) == ecosystems.ecosystem_mads_time_series(conn, 1)
+        assert developers.developers_in_ecosystem(pq, 1) == developers.developers_in_ecosystem(conn, 1)
+    finally:
+        pq.close()
+
+
+def test_client_from_parquet(conn, tmp_path):
+    partitioned.export_partitioned_parquet(conn, str(tmp_path))
+    client = OpenDevData.from_parquet(str(tmp_path))
+    try:
+        row = client.get_ecosystem(1, include_latest_mads=True)
+        assert row["name"] == "Bitcoin"
+        assert row["latest_mads"]["all_devs"] == 2500
+    finally:
+        client.close()
+
+
+def test_client_from_parquet_missing_manifest(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        OpenDevData.from_parquet(str(tmp_path))
+
+
+def test_ecosystem_macro_reads_one_bucket(conn, tmp_path):
+    # Ecosystems 2 and 3 fill other buckets; 5 shares ecosystem 1's bucket.
+    conn.execute("""
+        INSERT INTO eco_mads (ecosystem_id, day, all_devs)
+        SELECT v.id, m.day, m.all_devs FROM eco_mads m, (VALUES (2), (3), (5)) v(id)
+    """)
+    partitioned.export_partitioned_parquet(conn, str(tmp_path), num_buckets=4)
+    expected = conn.execute("SELECT * FROM eco_mads WHERE ecosystem_id = 1 ORDER BY day").fetchall()
+    # Corrupt every file outside ecosystem 1's bucket: the macro must not open them.
+    for bucket in os.listdir(tmp_path / "eco_mads"):
+        if bucket != "ecosystem_bucket=1":
+            for name in os.listdir(tmp_path / "eco_mads" / bucket):
+                (tmp_path / "eco_mads" / bucket / name).write_bytes(b"not parquet")
+    pq = duckdb.connect(":memory:")
+    try:
+        partitioned.attach_parquet_views(pq, str(tmp_path))
+        assert pq.execute("SELECT * FROM eco_mads_for_ecosystem(?) ORDER BY day", [1]).fetchall() == expected
+        with pytest.raises(duckdb.Error):
+            pq.execute("SELECT count(*) FROM eco_mads").fetchall()
+    finally:
+        pq.close()
+
+
+def _fill_other_buckets(conn):
+    # Ecosystems 2 and 3 fill other buckets (of 4); 5 shares ecosystem 1's bucket.
+    for table in partitioned.PARTITIONED_TABLES:
+        conn.execute(f"""
+            INSERT INTO {table}
+            SELECT t.* REPLACE (v.id AS ecosystem_id) FROM {table} t, (VALUES (2), (3), (5)) v(id)
+            WHERE t.ecosystem_id = 1
+        """)
+
+
+def _corrupt_other_buckets(parquet_dir, ecosystem_id, num_buckets):
+    for table in partitioned.PARTITIONED_TABLES:
+        for bucket in os.listdir(parquet_dir / table):
+            if bucket != f"{partitioned.PARTITION_COLUMN}={ecosystem_id % num_buckets}":
+                for name in os.listdir(parquet_dir / table / bucket):
+                    (parquet_dir / table / bucket / name).write_bytes(b"not parquet")
+
+
+def test_api_reads_only_the_ecosystem_bucket(conn, tmp_path):
+    _fill_other_buckets(conn)
+    partitioned.export_partitioned_parquet(conn, str(tmp_path), num_buckets=4)
+    calls = [
+        lambda c: ecosystems.get_ecosystem(c, 1, include_latest_mads=True),
+        lambda c: ecosystems.ecosystem_mads_time_series(c, 1, start_date=date(2024, 1, 1)),
+        lambda c: developers.developers_in_ecosystem(c, 1),
+        lambda c: developers.developers_in_ecosystem(c, 1, day=date.today(), contribution_rank="full_time"),
+        lambda c: [r for batch in developers.iter_developers_in_ecosystem(c, 1) for r in batch],
+        lambda c: developers.developer_activity_in_ecosystem(c, 1, 100),
+        lambda c: developers.developer_tenure_in_ecosystem(c, 1, 100),
+        lambda c: developers.search_developers_in_ecosystem(c, 1, "ali"),
+        lambda c: developers.developer_profile_bundle(c, 100, 1),
+        lambda c: cohorts.cohort_retention(c, 1),
+    ]
+    expected = [call(conn) for call in calls]
+    client = OpenDevData.from_parquet(str(tmp_path))
+    try:
+        _corrupt_other_buckets(tmp_path, 1, 4)
+        assert [call(client.conn) for call in calls] == expected
+        # The plain views still glob every bucket.
+        with pytest.raises(duckdb.Error):
+            client.conn.execute("SELECT count(*) FROM eco_developer_activities WHERE ecosystem_id = 1").fetchall()
+    finally:
+        client.close()
+
+
+def test_ecosystem_rows_without_parquet_views(conn):
+    assert partitioned.ecosystem_rows(conn, "eco_mads") == "(SELECT * FROM eco_mads WHERE ecosystem_id = ?)"
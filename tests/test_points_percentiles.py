@@ -0,0 +1,60 @@
+"""Tests for per-(ecosystem, day) points percentiles."""
+
+from datetime import date, timedelta
+
+import pytest
+
+from opendev_api import developers, points_percentiles
+
+
+def test_refresh_and_lookups(conn):
+    base = date.today()
+    assert points_percentiles.refresh_points_percentiles(conn) == {"rows": 1, "watermark": base}
+    curve = points_percentiles.points_percentile_curve(conn, 1)
+    assert (curve["day"], curve["developers"], curve["points"]) == (base, 3, [1, 4])
+    assert curve["percentiles"] == pytest.approx([100 / 3, 100.0])
+    assert points_percentiles.points_percentile(conn, 1, 0) == 0.0
+    assert points_percentiles.points_percentile(conn, 1, 3) == pytest.approx(100 / 3)
+    assert points_percentiles.points_percentile_curve(conn, 1, day=base - timedelta(days=1)) is None
+
+    assert points_percentiles.refresh_points_percentiles(conn)["rows"] == 0
+    conn.execute(
+        "INSERT INTO eco_developer_contribution_ranks VALUES (1, 100, ?, 2, 2, 2, 'part_time'), (1, 101, ?, NULL, 0, 0, NULL)",
+        [base + timedelta(days=1)] * 2,
+    )
+    assert points_percentiles.refresh_points_percentiles(conn)["rows"] == 1
+    assert points_percentiles.points_percentile_curve(conn, 1)["developers"] == 1
+
+
+def test_developer_fields(conn):
+    points_percentiles.refresh_points_percentiles(conn)
+    rows = developers.developers_in_ecosystem(conn, 1, include_percentile=True)
+    assert [(r["login"], r["points_percentile"]) for r in rows] == [
+        ("alice", 100.0), ("bob", 100.0), ("carol", pytest.approx(100 / 3)),
+    ]
+    rows = developers.developers_in_ecosystem(conn, 1, day=date.today(), include_user_info=False, include_percentile=True)
+    assert rows[-1]["points_percentile"] == pytest.approx(100 / 3)
+    profile = developers.get_developer_profile(conn, 102, ecosystem_id=1)
+    assert profile["points_percentile"]["points"] == 1
+    assert profile["points_percentile"]["percentile"] == pytest.approx(100 / 3)
+    assert developers.get_developer_profile(conn, 102, ecosystem_id=2)["points_percentile"] is None
+    assert "points_percentile" not in developers.get_developer_profile(conn, 102)
+
+
+@pytest.mark.synthetic(num_ecosystems=3, num_developers=200, num_days=40)
+def test_matches_sorted_ranks(synthetic_conn):
+    points_percentiles.refresh_points_percentiles(synthetic_conn)
+    rows = developers.developers_in_ecosystem(synthetic_conn, 2, include_user_info=False, include_percentile=True, limit=1000)
+    expected = dict(synthetic_conn.execute("""
+        SELECT canonical_developer_id, 100.0 * cume_dist() OVER (ORDER BY points)
+        FROM eco_developer_contribution_ranks
+        WHERE ecosystem_id = 2 AND day = (SELECT max(day) FROM eco_developer_contribution_ranks WHERE ecosystem_id = 2)
+    """).fetchall())
+    assert rows and {r["canonical_developer_id"]: r["points_percentile"] for r in rows} == pytest.approx(expected)
+
+
+def test_requires_refresh(conn):
+    with pytest.raises(RuntimeError, match="refresh_points_percentiles"):
+        developers.developers_in_ecosystem(conn, 1, include_percentile=True)
+    with pytest.raises(RuntimeError, match="refresh_points_percentiles"):
+        points_percentiles.points_percentile_curve(conn, 1)
@@ -0,0 +1,83 @@
+"""Tests for day-over-day contribution rank diffs."""
+
+from datetime import date, timedelta
+
+import pytest
+
+from opendev_api import OpenDevData, partitioned, rank_diff
+
+
+@pytest.fixture
+def diff_conn(conn):
+    """Ecosystem 1 the next day: alice demoted, bob promoted, carol left, dave (103) joined."""
+    day_b = date.today() + timedelta(days=1)
+    conn.execute("""
+        INSERT INTO eco_developer_contribution_ranks VALUES
+            (1, 100, ?, 2, 2, 2, 'part_time'),
+            (1, 101, ?, 9, 9, 9, 'full_time'),
+            (1, 103, ?, 1, 1, 1, 'one_time')
+    """, [day_b] * 3)
+    rank_diff.refresh_contribution_rank_days(conn)
+    return conn
+
+
+def test_requires_rank_days(conn):
+    with pytest.raises(RuntimeError, match="refresh_contribution_rank_days"):
+        rank_diff.contribution_rank_diff(conn, 1, date.today(), date.today())
+    with pytest.raises(RuntimeError, match="refresh_contribution_rank_days"):
+        list(rank_diff.iter_contribution_rank_diff(conn, 1, date.today(), date.today()))
+
+
+def test_refresh_appends_new_days_in_order(conn):
+    assert rank_diff.refresh_contribution_rank_days(conn) == {"rows": 3, "watermark": date.today()}
+    assert rank_diff.refresh_contribution_rank_days(conn)["rows"] == 0
+    day_b = date.today() + timedelta(days=1)
+    conn.execute("""
+        INSERT INTO eco_developer_contribution_ranks VALUES
+            (2, 100, ?, 1, 1, 1, 'one_time'),
+            (1, 101, ?, 9, 9, 9, 'full_time')
+    """, [day_b] * 2)
+    assert rank_diff.refresh_contribution_rank_days(conn)["rows"] == 2
+    rows = conn.execute(f"SELECT ecosystem_id, day FROM {rank_diff.RANK_DAYS_TABLE} WHERE day = ?", [day_b]).fetchall()
+    assert rows == [(1, day_b), (2, day_b)]
+
+
+def test_counts_and_changes(diff_conn):
+    day_a, day_b = date.today(), date.today() + timedelta(days=1)
+    diff = rank_diff.contribution_rank_diff(diff_conn, 1, day_a, day_b)
+    assert diff["counts"] == {"joined": 1, "left": 1, "promoted": 1, "demoted": 1, "unchanged": 0}
+    assert [(r["canonical_developer_id"], r["change"], r["points_delta"]) for r in diff["changes"]] == [
+        (103, "joined", 1), (102, "left", -1), (101, "promoted", 5), (100, "demoted", -2),
+    ]
+    assert diff["changes"][0]["rank_a"] is None and diff["changes"][0]["login"] is None
+    assert diff["changes"][2]["login"] == "bob"
+
+    same = rank_diff.contribution_rank_diff(diff_conn, 1, day_a, day_a, categories=["unchanged"], include_user_info=False)
+    assert same["counts"]["unchanged"] == 3 and len(same["changes"]) == 3
+    assert rank_diff.contribution_rank_diff(diff_conn, 1, day_a, day_b, limit=1)["changes"][0]["change"] == "joined"
+    with pytest.raises(ValueError, match="Unknown categories"):
+        rank_diff.contribution_rank_diff(diff_conn, 1, day_a, day_b, categories=["moved"])
+
+
+def test_iter_streams_in_batches(diff_conn):
+    day_a, day_b = date.today(), date.today() + timedelta(days=1)
+    batches = list(rank_diff.iter_contribution_rank_diff(diff_conn, 1, day_a, day_b, batch_size=3))
+    assert [len(b) for b in batches] == [3, 1]
+    streamed = [r for b in batches for r in b]
+    assert streamed == rank_diff.contribution_rank_diff(diff_conn, 1, day_a, day_b)["changes"]
+    assert list(rank_diff.iter_contribution_rank_diff(diff_conn, 2, day_a, day_b)) == []
+
+
+def test_parquet_client_reads_bucketed_source(diff_conn, tmp_path):
+    day_a, day_b = date.today(), date.today() + timedelta(days=1)
+    expected = rank_diff.contribution_rank_diff(diff_conn, 1, day_a, day_b)
+    diff_conn.execute(f"DROP TABLE {rank_diff.RANK_DAYS_TABLE}")
+    partitioned.export_partitioned_parquet(diff_conn, str(tmp_path), num_buckets=4)
+    client = OpenDevData.from_parquet(str(tmp_path))
+    try:
+        # No copy is built; the diff reads eco_developer_contribution_ranks' bucket.
+        assert client.refresh_contribution_rank_days() == {"rows": 0, "watermark": None}
+        assert client.contribution_rank_diff(1, day_a, day_b) == expected
+        assert [r for b in client.iter_contribution_rank_diff(1, day_a, day_b) for r in b] == expected["changes"]
+    finally:
+        client.close()
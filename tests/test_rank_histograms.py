@@ -0,0 +1,49 @@
+"""Tests for daily contribution-rank histograms."""
+
+from datetime import date, timedelta
+
+import pytest
+
+from opendev_api import ecosystems, rank_histograms
+
+
+def test_refresh_and_time_series(conn):
+    result = rank_histograms.refresh_rank_histograms(conn)
+    assert result == {"rows": 1, "watermark": date.today()}
+    rows = ecosystems.ecosystem_rank_distribution_time_series(conn, 1)
+    assert len(rows) == 1
+    row = rows[0]
+    assert (row["ranked_devs"], row["full_time_devs"], row["part_time_devs"], row["one_time_devs"]) == (3, 1, 1, 1)
+    assert row["points_sum"] == 9
+    assert row["points_1"] == 1
+    assert row["points_4_7"] == 2
+
+
+def test_refresh_appends_new_days(conn):
+    rank_histograms.refresh_rank_histograms(conn)
+    assert rank_histograms.refresh_rank_histograms(conn)["rows"] == 0
+    tomorrow = date.today() + timedelta(days=1)
+    conn.execute(
+        "INSERT INTO eco_developer_contribution_ranks VALUES (1, 100, ?, 40, 40, 40, 'full_time')", [tomorrow]
+    )
+    assert rank_histograms.refresh_rank_histograms(conn)["rows"] == 1
+    rows = ecosystems.ecosystem_rank_distribution_time_series(conn, 1, start_date=tomorrow)
+    assert rows[0]["day"] == tomorrow
+    assert rows[0]["points_32_63"] == 1
+
+
+@pytest.mark.synthetic(num_developers=200, num_days=40)
+def test_parallel_chunks_match_single_pass(synthetic_conn):
+    rank_histograms.refresh_rank_histograms(synthetic_conn, chunk_days=3, max_workers=4)
+    expected = synthetic_conn.execute(
+        "SELECT ecosystem_id, day, count(*) FROM eco_developer_contribution_ranks GROUP BY ALL ORDER BY ALL"
+    ).fetchall()
+    actual = synthetic_conn.execute(
+        "SELECT ecosystem_id, day, ranked_devs FROM eco_rank_histograms ORDER BY ALL"
+    ).fetchall()
+    assert actual == expected
+
+
+def test_time_series_requires_refresh(conn):
+    with pytest.raises(RuntimeError, match="refresh_rank_histograms"):
+        ecosystems.ecosystem_rank_distribution_time_series(conn, 1)
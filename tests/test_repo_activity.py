@@ -0,0 +1,47 @@
+"""Tests for precomputed repo activity aggregates and activity-ranked repos."""
+
+from datetime import date, timedelta
+
+from opendev_api import ecosystems, repo_activity
+
+
+def test_refresh_repo_activity_stats(conn):
+    result = repo_activity.refresh_repo_activity_stats(conn)
+    assert result["as_of_day"] == date.today()
+    stats = {r[0]: r for r in conn.execute(
+        "SELECT repo_id, commits_28d, active_devs_28d, commits_90d, active_devs_90d, commits_365d "
+        "FROM repo_activity_stats"
+    ).fetchall()}
+    # Repo 10: dev 100 (5 + 3 commits in the last 2 days), dev 101 (2 commits 60 days ago)
+    assert stats[10] == (10, 8, 1, 10, 2, 10)
+    # Repo 20 was last active 400 days ago: outside every window
+    assert 20 not in stats
+
+
+def test_refresh_is_incremental(conn):
+    repo_activity.refresh_repo_activity_stats(conn)
+    assert repo_activity.refresh_repo_activity_stats(conn)["repo_days"] == 0
+    tomorrow = date.today() + timedelta(days=1)
+    conn.execute("INSERT INTO repo_developer_activities VALUES (20, 102, ?, 4)", [tomorrow])
+    result = repo_activity.refresh_repo_activity_stats(conn)
+    assert result["repo_days"] == 1
+    assert result["as_of_day"] == tomorrow
+    row = conn.execute(
+        "SELECT commits_28d, active_devs_28d FROM repo_activity_stats WHERE repo_id = 20"
+    ).fetchone()
+    assert row == (4, 1)
+
+
+def test_repos_sorted_by_activity(conn):
+    conn.execute("INSERT INTO ecosystems_repos_recursive (ecosystem_id, repo_id) VALUES (1, 20)")
+    repo_activity.refresh_repo_activity_stats(conn)
+    by_stars = ecosystems.repos_in_ecosystem(conn, 1)
+    assert [r["id"] for r in by_stars] == [10, 20]
+    conn.execute("INSERT INTO repo_developer_activities VALUES (20, 102, ?, 50)", [date.today() + timedelta(days=1)])
+    repo_activity.refresh_repo_activity_stats(conn)
+    by_activity = ecosystems.repos_in_ecosystem(conn, 1, sort_by="activity")
+    assert [r["id"] for r in by_activity] == [20, 10]
+    assert by_activity[0]["commits_28d"] == 50
+    assert "active_devs_365d" in by_activity[0]
+    top = ecosystems.top_repos_in_ecosystem(conn, 1, sort_by="activity_365d", limit=1)
+    assert top[0]["id"] == 20
@@ -0,0 +1,101 @@
+"""Tests for the parallel ecosystem report generator."""
+
+import json
+import os
+
+import duckdb
+import pytest
+
+from opendev_api import ecosystems, reports
+
+
+pytestmark = pytest.mark.synthetic(num_ecosystems=6, num_developers=200, num_days=60)
+
+
+@pytest.fixture
+def db_path(synthetic_conn, tmp_path):
+    # Workers open the database by path, so the synthetic data is copied to a file.
+    path = str(tmp_path / "opendev.duckdb")
+    synthetic_conn.execute(f"ATTACH '{path}' AS report_db")
+    synthetic_conn.execute("COPY FROM DATABASE memory TO report_db")
+    synthetic_conn.execute("DETACH report_db")
+    return path
+
+
+def test_generate_json_and_resume(db_path, tmp_path):
+    out = str(tmp_path / "reports")
+    result = reports.generate_ecosystem_reports(db_path, out, workers=2, chunk_size=2, progress=False)
+    assert (result["written"], result["skipped"], result["errors"]) == (6, 0, [])
+    assert sorted(os.listdir(out)) == sorted(f"{i}.json" for i in range(1, 7))
+    with open(reports.report_path(out, 1)) as f:
+        bundle = json.load(f)
+    assert set(bundle) == {"ecosystem_id"} | {name for name, _ in reports.REPORT_SECTIONS}
+    conn = duckdb.connect(db_path, read_only=True)
+    try:
+        assert bundle["overview"]["name"] == ecosystems.get_ecosystem(conn, 1)["name"]
+        assert len(bundle["mads"]) == len(ecosystems.ecosystem_mads_time_series(conn, 1))
+    finally:
+        conn.close()
+
+    os.remove(reports.report_path(out, 3))
+    result = reports.generate_ecosystem_reports(
+        db_path, out, ecosystem_ids=[1, 2, 3, 99], workers=1, progress=False
+    )
+    assert (result["written"], result["skipped"]) == (1, 2)
+    assert result["errors"] == [{"ecosystem_id": 99, "error": "LookupError: No ecosystem 99"}]
+
+
+def test_parquet_bundle(db_path, tmp_path):
+    out = str(tmp_path)
+    conn = duckdb.connect(db_path, read_only=True)
+    try:
+        bundle = reports.build_report(conn, 2)
+        path = reports.write_report(conn, bundle, out, "parquet")
+        row = conn.execute("SELECT ecosystem_id, overview.id, len(top_developers) FROM read_parquet(?)", [path]).fetchone()
+        assert row == (2, 2, len(bundle["top_developers"]))
+    finally:
+        conn.close()
+    assert sorted(os.listdir(out)) == ["2.parquet", "opendev.duckdb"]
+
+
+def test_parquet_schema_is_fixed(db_path, tmp_path):
+    conn = duckdb.connect(db_path)
+    try:
+        # An ecosystem without mads, repos, developers or hierarchy.
+        conn.execute("INSERT INTO ecosystems (id, name) VALUES (99, 'Empty')")
+        paths = [reports.write_report(conn, reports.build_report(conn, eco), str(tmp_path), "parquet") for eco in (1, 99)]
+        schemas = [conn.execute("DESCRIBE SELECT * FROM read_parquet(?)", [p]).fetchall() for p in paths]
+        assert schemas[0] == schemas[1]
+        # DESCRIBE quotes reserved field names such as "name" and "day".
+        assert [(r[0], r[1].replace('"', "")) for r in schemas[0]] == list(reports.PARQUET_COLUMNS.items())
+        rows = conn.execute(
+            "SELECT ecosystem_id, overview.latest_mads IS NULL, len(mads) FROM read_parquet(?) ORDER BY 1", [paths]
+        ).fetchall()
+        assert rows[0][1:] == (False, len(reports.build_report(conn, 1)["mads"]))
+        assert rows[1] == (99, True, 0)
+
+        # Every field the API returns has a column, so none is dropped silently.
+        bundle = reports.build_report(conn, 1)
+        written = conn.execute("SELECT * FROM read_parquet(?)", [paths[0]]).fetchone()
+        for (name, _), value in zip(reports.PARQUET_COLUMNS.items(), written):
+            expected = bundle[name][0] if isinstance(bundle[name], list) else bundle[name]
+            actual = value[0] if isinstance(value, list) else value
+            if isinstance(expected, dict):
+                assert set(actual) == set(expected), name
+
+        # A bundle COPY rejects leaves no temporary files behind.
+        before = set(os.listdir(tmp_path))
+        with pytest.raises(duckdb.Error):
+            reports.write_report(conn, {**bundle, "ecosystem_id": 7, "overview": {"id": "x"}}, str(tmp_path), "parquet")
+        assert set(os.listdir(tmp_path)) == before
+    finally:
+        conn.close()
+
+
+def test_cli(db_path, tmp_path, capsys):
+    out = str(tmp_path / "reports")
+    assert reports.main([db_path, out, "--ecosystem", "1", "--workers", "1", "--quiet", "--format", "parquet"]) == 0
+    assert "1 written, 0 skipped, 0 failed" in capsys.readouterr().out
+    assert reports.main([db_path, out, "--ecosystem", "42", "--workers", "1", "--quiet"]) == 1
+    with pytest.raises(ValueError):
+        reports.generate_ecosystem_reports(db_path, out, format="csv")
@@ -0,0 +1,120 @@
+"""Tests for snapshot directories and hot swapping the client connection."""
+
+import os
+
+import duckdb
+import pytest
+
+from opendev_api import OpenDevData, snapshots
+
+
+def _write_snapshot(directory, version, names):
+    conn = duckdb.connect(os.path.join(directory, version + snapshots.SNAPSHOT_SUFFIX))
+    conn.execute("""
+        CREATE TABLE ecosystems (
+            id INTEGER PRIMARY KEY, name VARCHAR, launch_date DATE, derived_launch_date DATE,
+            is_crypto UTINYINT, is_category UTINYINT, is_chain UTINYINT, is_multichain UTINYINT
+        )
+    """)
+    for i, name in enumerate(names, 1):
+        conn.execute("INSERT INTO ecosystems (id, name) VALUES (?, ?)", [i, name])
+    conn.close()
+
+
+def test_list_and_latest(tmp_path):
+    _write_snapshot(str(tmp_path), "2025-01-08", ["A"])
+    _write_snapshot(str(tmp_path), "2025-01-15", ["A", "B"])
+    (tmp_path / "2025-01-22.duckdb.tmp").write_text("in progress")
+    assert snapshots.list_snapshots(str(tmp_path)) == ["2025-01-08", "2025-01-15"]
+    assert snapshots.latest_snapshot(str(tmp_path)) == "2025-01-15"
+
+
+def test_swap_keeps_in_flight_connection(tmp_path):
+    _write_snapshot(str(tmp_path), "v1", ["Old"])
+    client = OpenDevData.from_snapshots(str(tmp_path))
+    seen = []
+    client.on_data_version_change(lambda old, new: seen.append((old, new)))
+    _write_snapshot(str(tmp_path), "v2", ["New", "Other"])
+
+    with client._lease() as in_flight:
+        assert client.swap_to_snapshot() is True
+        assert client.data_version == "v2"
+        assert seen == [("v1", "v2")]
+        assert [r["name"] for r in client.list_ecosystems()] == ["New", "Other"]
+        # The call that started before the swap still completes on the old snapshot.
+        assert in_flight.execute("SELECT name FROM ecosystems").fetchall() == [("Old",)]
+    # Closed as soon as its last call finished, not whenever it is garbage collected.
+    with pytest.raises(duckdb.ConnectionException):
+        in_flight.execute("SELECT 1")
+    assert client.swap_to_snapshot() is False
+
+    # With no call in flight the old connection is closed by the swap itself.
+    idle = client.conn
+    _write_snapshot(str(tmp_path), "v3", ["Newest"])
+    assert client.swap_to_snapshot() is True
+    with pytest.raises(duckdb.ConnectionException):
+        idle.execute("SELECT 1")
+    client.close()
+
+
+def test_watcher_switches_and_failed_warm_keeps_current(tmp_path):
+    _write_snapshot(str(tmp_path), "v1", ["Old"])
+    client = OpenDevData.from_snapshots(str(tmp_path))
+    watcher = snapshots.SnapshotWatcher(
+        str(tmp_path), lambda: client.data_version, client.swap_to_snapshot, interval=3600
+    )
+    assert watcher.check() is None
+    _write_snapshot(str(tmp_path), "v2", ["New"])
+
+    def broken_warm(conn):
+        raise RuntimeError("warm failed")
+
+    with pytest.raises(RuntimeError, match="warm failed"):
+        client.swap_to_snapshot(warm=broken_warm)
+    assert client.data_version == "v1"
+    assert watcher.check() == "v2"
+    assert client.get_ecosystem(1)["name"] == "New"
+    client.close()
+
+
+def test_swap_requires_snapshot_client(conn):
+    client = OpenDevData.__new__(OpenDevData)
+    client.conn = conn
+    with pytest.raises(RuntimeError, match="from_snapshots"):
+        client.swap_to_snapshot()
+
+
+def test_publish_requires_derived_tables(tmp_path):
+    source = str(tmp_path / "source.duckdb")
+    snapshot_dir = tmp_path / "snapshots"
+    snapshot_dir.mkdir()
+    conn = duckdb.connect(source)
+    conn.execute("CREATE TABLE ecosystems (id INTEGER, name VARCHAR)")
+    conn.execute("INSERT INTO ecosystems VALUES (1, 'A')")
+    with pytest.raises(ValueError, match=r"ecosystem_stats \(run refresh_ecosystem_stats\(\)\)"):
+        snapshots.publish_snapshot(conn, str(snapshot_dir), "v1")
+    assert snapshots.list_snapshots(str(snapshot_dir)) == []
+
+    tables = list(snapshots.derived_tables())
+    path = snapshots.publish_snapshot(conn, str(snapshot_dir), "v1", allow_missing=tables)
+    assert sorted(os.listdir(snapshot_dir)) == ["v1.duckdb"]
+    published = duckdb.connect(path, read_only=True)
+    assert published.execute("SELECT name FROM ecosystems").fetchall() == [("A",)]
+    published.close()
+    with pytest.raises(ValueError, match="sort after"):
+        snapshots.publish_snapshot(conn, str(snapshot_dir), "v0", allow_missing=tables)
+    conn.close()
+    with pytest.raises(ValueError, match="database file"):
+        snapshots.publish_snapshot(duckdb.connect(), str(snapshot_dir), "v2", allow_missing=tables)
+
+
+def test_refresh_bumps_data_version(conn):
+    client = OpenDevData.__new__(OpenDevData)
+    client.conn = conn
+    client.data_version = "123-456"
+    seen = []
+    client.on_data_version_change(lambda old, new: seen.append((old, new)))
+    client.refresh_latest_tenures()
+    client.refresh_ecosystem_stats()
+    assert client.data_version == "123-456+refresh2"
+    assert seen == [("123-456", "123-456+refresh1"), ("123-456+refresh1", "123-456+refresh2")]
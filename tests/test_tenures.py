@@ -0,0 +1,49 @@
+"""Tests for the latest-tenure table and include_tenure on developer lists."""
+
+from datetime import date, timedelta
+
+import pytest
+
+from opendev_api import developers, tenures
+
+
+def test_refresh_keeps_latest_row_incrementally(conn):
+    base = date.today()
+    conn.execute(
+        "INSERT INTO eco_developer_tenures VALUES (1, 100, ?, 300, 0), (1, 101, ?, 10, 0)",
+        [base - timedelta(days=65), base - timedelta(days=2)],
+    )
+    assert tenures.refresh_latest_tenures(conn) == {"rows": 2, "watermark": base}
+    rows = tenures.latest_tenures_in_ecosystem(conn, 1)
+    assert [(r["canonical_developer_id"], r["tenure_days"], r["category"]) for r in rows] == [(100, 365, 1), (101, 10, 0)]
+
+    assert tenures.refresh_latest_tenures(conn)["rows"] == 0
+    conn.execute("INSERT INTO eco_developer_tenures VALUES (1, 101, ?, 11, 0)", [base + timedelta(days=1)])
+    assert tenures.refresh_latest_tenures(conn)["rows"] == 1
+    assert tenures.latest_tenures_in_ecosystem(conn, 1, canonical_developer_ids=[101, 999]) == [
+        {"canonical_developer_id": 101, "day": base + timedelta(days=1), "tenure_days": 11, "category": 0}
+    ]
+    assert tenures.latest_tenures_in_ecosystem(conn, 1, canonical_developer_ids=[]) == []
+
+
+def test_developers_in_ecosystem_include_tenure(conn):
+    tenures.refresh_latest_tenures(conn)
+    rows = developers.developers_in_ecosystem(conn, 1, include_tenure=True)
+    assert [(r["canonical_developer_id"], r["login"], r["tenure_days"], r["tenure_category"]) for r in rows] == [
+        (100, "alice", 365, 1),
+        (101, "bob", None, None),
+        (102, "carol", None, None),
+    ]
+    rows = developers.developers_in_ecosystem(conn, 1, include_user_info=False, include_tenure=True, limit=1)
+    assert (rows[0]["canonical_developer_id"], rows[0]["tenure_days"]) == (100, 365)
+    # The table only has the latest tenure, which would be wrong for an earlier day.
+    with pytest.raises(ValueError, match="day"):
+        developers.developers_in_ecosystem(conn, 1, day=date.today(), include_tenure=True)
+
+
+def test_requires_refresh(conn):
+    assert "tenure_days" not in developers.developers_in_ecosystem(conn, 1)[0]
+    with pytest.raises(RuntimeError, match="refresh_latest_tenures"):
+        developers.developers_in_ecosystem(conn, 1, include_tenure=True)
+    with pytest.raises(RuntimeError, match="refresh_latest_tenures"):
+        tenures.latest_tenures_in_ecosystem(conn, 1)
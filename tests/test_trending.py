@@ -0,0 +1,60 @@
+"""Tests for the eco_mads trending batch job."""
+
+from datetime import date, timedelta
+
+import pytest
+
+from opendev_api import trending
+from opendev_api.client import OpenDevData
+
+
+@pytest.fixture
+def trend_conn(conn):
+    # 60 days with small noise: eco 1 jumps from ~100 to ~200 developers 10 days
+    # before the end, eco 2 stays flat, eco 3 only appears in the last 5 days.
+    conn.execute("DELETE FROM eco_mads")
+    start = date(2024, 1, 1)
+    rows = []
+    for d in range(60):
+        day = start + timedelta(days=d)
+        rows.append((1, day, (100 if d < 50 else 200) + d % 3))
+        rows.append((2, day, 50 + d % 2))
+        if d >= 55:
+            rows.append((3, day, 10))
+    conn.executemany(
+        "INSERT INTO eco_mads (ecosystem_id, day, all_devs, num_commits) VALUES (?, ?, ?, 0)", rows
+    )
+    return conn
+
+
+def test_refresh_scores_jump(trend_conn):
+    result = trending.refresh_trending_ecosystems(trend_conn, metrics=("all_devs",), windows=(14,), history_days=60)
+    assert result == {"ecosystems": 3, "rows": 3, "as_of": date(2024, 2, 29)}
+    top = trending.trending_ecosystems(trend_conn, window=14, limit=3)
+    assert top[0]["ecosystem_id"] == 1
+    assert (top[0]["current"], top[0]["previous"], top[0]["growth"]) == (202, 100, 1.02)
+    assert top[0]["z_score"] > 10
+    assert top[0]["change_point_day"] == date(2024, 2, 20)
+    assert round(top[0]["change_point_delta"]) == 100
+    new = next(r for r in top if r["ecosystem_id"] == 3)
+    assert new["growth"] is None and new["z_score"] is None
+
+
+def test_filters_and_validation(trend_conn):
+    trending.refresh_trending_ecosystems(trend_conn, metrics=("all_devs",), windows=(14,), history_days=60)
+    assert trending.trending_ecosystems(trend_conn, window=14, direction="down") == []
+    assert [r["ecosystem_id"] for r in trending.trending_ecosystems(trend_conn, window=14, min_current=60)] == [1]
+    assert trending.trending_ecosystems(trend_conn, window=7) == []
+    with pytest.raises(ValueError):
+        trending.trending_ecosystems(trend_conn, metric="stars")
+    with pytest.raises(ValueError):
+        trending.refresh_trending_ecosystems(trend_conn, windows=(90,), history_days=60)
+
+
+def test_requires_refresh_and_client(trend_conn):
+    client = OpenDevData.__new__(OpenDevData)
+    client.conn = trend_conn
+    with pytest.raises(RuntimeError, match="refresh_trending_ecosystems"):
+        client.trending_ecosystems()
+    client.refresh_trending_ecosystems(history_days=60, windows=(7, 28))
+    assert client.trending_ecosystems(metric="num_commits", window=28)[0]["current"] == 0
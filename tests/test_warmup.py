@@ -0,0 +1,78 @@
+"""Tests for startup warm-up of hot ecosystems."""
+
+from datetime import date, timedelta
+
+import pytest
+
+from opendev_api import OpenDevData, points_percentiles, tenures, warmup
+
+
+def test_warm_up_explicit_ids(conn):
+    tenures.refresh_latest_tenures(conn)
+    points_percentiles.refresh_points_percentiles(conn)
+    result = warmup.warm_up(conn, ecosystem_ids=[1, 2], max_workers=2)
+    assert result["ecosystem_ids"] == [1, 2]
+    assert result["calls"] == 2 * len(warmup.LANDING_CALLS)
+    assert result["errors"] == []
+    assert {(t["ecosystem_id"], t["function"]) for t in result["timings"]} == {
+        (eco, name) for eco in (1, 2) for name, _ in warmup.LANDING_CALLS
+    }
+    developers = next(t for t in result["timings"] if t["ecosystem_id"] == 1 and t["function"] == "developers_in_ecosystem")
+    assert developers["rows"] == 3
+    assert result["elapsed_ms"] >= 0
+
+
+def test_failed_call_is_reported(conn):
+    conn.execute("DROP TABLE user_info")
+    result = warmup.warm_up(conn, ecosystem_ids=[1])
+    assert [e["function"] for e in result["errors"]] == ["developers_in_ecosystem"]
+    assert "user_info" in result["errors"][0]["error"]
+    assert len(result["timings"]) == len(warmup.LANDING_CALLS) - 1
+
+
+def test_keep_results_match_direct_calls(conn):
+    result = warmup.warm_up(conn, ecosystem_ids=[1], keep_results=True)
+    assert len(result["results"]) == len(result["timings"])
+    client = OpenDevData.__new__(OpenDevData)
+    client.conn = conn
+    for method, args, kwargs, rows in result["results"]:
+        assert getattr(client, method)(*args, **kwargs) == rows
+    assert "results" not in warmup.warm_up(conn, ecosystem_ids=[1])
+
+
+def test_landing_calls_match_client_methods(conn):
+    last_day = date(2024, 5, 1)
+    calls = warmup.landing_calls(7, last_day)
+    assert [m for m, _, _ in calls] == [m for m, _ in warmup.LANDING_CALLS]
+    assert all(args == (7,) for _, args, _ in calls)
+    mads = dict((m, kw) for m, _, kw in calls)["ecosystem_mads_time_series"]
+    assert mads == {"start_date": last_day - timedelta(days=warmup.MADS_CHART_DAYS), "end_date": last_day, "limit": 90}
+    # The window follows the data, not the clock; without MADs it is left open.
+    assert warmup.latest_mads_day(conn) == conn.execute("SELECT max(day) FROM eco_mads").fetchone()[0]
+    assert dict((m, kw) for m, _, kw in warmup.landing_calls(7, None))["ecosystem_mads_time_series"] == {
+        "start_date": None, "end_date": None, "limit": 90,
+    }
+    # Every call is an OpenDevData method taking these kwargs, as the dashboard issues them.
+    client = OpenDevData.__new__(OpenDevData)
+    client.conn = conn
+    for method, args, kwargs in warmup.landing_calls(1, client.latest_mads_day()):
+        if method == "developers_in_ecosystem":
+            kwargs = {**kwargs, "include_tenure": False, "include_percentile": False}
+        getattr(client, method)(*args, **kwargs)
+
+
+@pytest.mark.synthetic(num_ecosystems=8, num_days=20)
+def test_top_n_by_latest_all_devs(synthetic_conn):
+    expected = [r[0] for r in synthetic_conn.execute("""
+        SELECT ecosystem_id FROM eco_mads WHERE day = (SELECT max(day) FROM eco_mads)
+        ORDER BY all_devs DESC, ecosystem_id LIMIT 3
+    """).fetchall()]
+    assert warmup.top_ecosystems_by_devs(synthetic_conn, 3) == expected
+    client = OpenDevData.__new__(OpenDevData)
+    client.conn = synthetic_conn
+    assert client.warm_up(top_n=3)["ecosystem_ids"] == expected
+
+
+def test_rejects_bad_workers(conn):
+    with pytest.raises(ValueError):
+        warmup.warm_up(conn, ecosystem_ids=[1], max_workers=0)